@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Roster Activity Heatmap
+Bins every faculty member's publications into week or month buckets in one vectorized pass
+"""
+
+import threading
+from datetime import datetime
+
+# Supported bin sizes: query value -> (pandas period alias, label format)
+FREQUENCIES = {
+    'week': ('W-SUN', '%Y-%m-%d'),
+    'month': ('M', '%Y-%m'),
+}
+
+
+def store_fingerprint(faculty_publications):
+    """Cheap signature of the publication store that changes whenever publications are added"""
+    return hash(tuple((name, len(pubs)) for name, pubs in faculty_publications.items()))
+
+
+def build_activity_matrix(faculty_publications, faculty_names, freq='month', periods=12, now=None):
+    """Count publications per faculty member per period.
+
+    Returns a compact payload: row labels (faculty), column labels (periods)
+    and a faculty x period matrix of integer counts.
+    """
+    import numpy as np
+    import pandas as pd
+
+    alias, label_format = FREQUENCIES[freq]
+    now = now or datetime.now()
+
+    # Flatten the store into two parallel columns, then do all binning in pandas
+    names = []
+    dates = []
+    for faculty_name, pubs in faculty_publications.items():
+        for pub in pubs:
+            names.append(faculty_name)
+            dates.append(pub.get('date'))
+
+    period_index = pd.period_range(end=pd.Timestamp(now).to_period(alias), periods=periods, freq=alias)
+    row_labels = list(faculty_names) + sorted(set(names) - set(faculty_names))
+    counts = np.zeros((len(row_labels), len(period_index)), dtype=np.int32)
+
+    if names:
+        frame = pd.DataFrame({'faculty': names, 'date': pd.to_datetime(dates, errors='coerce')})
+        frame = frame.dropna(subset=['date'])
+        frame['period'] = frame['date'].dt.to_period(alias)
+        frame = frame[(frame['period'] >= period_index[0]) & (frame['period'] <= period_index[-1])]
+
+        if not frame.empty:
+            row_pos = pd.Index(row_labels).get_indexer(frame['faculty'])
+            col_pos = period_index.get_indexer(frame['period'])
+            np.add.at(counts, (row_pos, col_pos), 1)
+
+    return {
+        'freq': freq,
+        'faculty': row_labels,
+        'periods': [p.start_time.strftime(label_format) for p in period_index],
+        'counts': counts.tolist(),
+        'max': int(counts.max()) if counts.size else 0,
+        'generated_at': now.isoformat(),
+    }
+
+
+class HeatmapCache:
+    """Keeps the last computed matrix per (freq, periods) until the store changes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, faculty_publications, faculty_names, freq='month', periods=12):
+        fingerprint = store_fingerprint(faculty_publications)
+        # The window slides with the calendar, so a new day also invalidates the entry
+        key = (freq, periods, datetime.now().date())
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == fingerprint:
+                return entry[1]
+
+        payload = build_activity_matrix(faculty_publications, faculty_names, freq=freq, periods=periods)
+
+        with self._lock:
+            # Drop entries from previous days so the cache stays small
+            self._entries = {k: v for k, v in self._entries.items() if k[2] == key[2]}
+            self._entries[key] = (fingerprint, payload)
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -4,8 +4,7 @@ CSRR Faculty Tracker - Advanced AI-Powered Dashboard
 Complete system with AI chatbot, recommendation engine, content summarization, and timeline visualization
 """
 
-from flask import Flask, render_template_string, request, redirect, url_for, flash, jsonify, send_file
-import pandas as pd
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
 from datetime import datetime, timedelta
 import os
 import sys
@@ -13,82 +12,105 @@ import json
 from pathlib import Path
 import threading
 import time
-import requests
-from bs4 import BeautifulSoup
 import re
 from urllib.parse import quote
-import openai
-from scholarly import scholarly
-import plotly.graph_objs as go
-import plotly.utils
+
+# Heavy dependencies (requests, bs4, scholarly, plotly) are imported inside the
+# functions that use them so cold starts and worker boots only pay for Flask.
 
 # Add the parent directory to path
 sys.path.append('/Users/azrabano')
 from csrr_faculty_tracker import CSRRFacultyTracker
+from template_cache import register_templates
+from static_assets import init_app as init_static_assets
+from http_compression import init_app as init_compression
+from report_links import init_app as init_report_links
+from data_export import init_app as init_data_export
+from search_jobs import JobExecutor, QueueFull, no_progress
+from event_stream import sse_events, sse_response
+from chat_store import ChatHistory, chat_session_id
+from chat_router import IntentRouter
+from chat_backends import ReplyStream, build_messages, chat_gateway
+from publication_index import PublicationIndex
+from activity_heatmap import HeatmapCache, FREQUENCIES
+from report_manifest import ReportManifest
+from publication_store import PublicationStore
+from report_archive import ReportArchive
+from report_diff import canonical_rows
+from report_pipeline import build_report_model, render_reports, render_csv, render_docx, render_xlsx
+from search_shards import open_store, run_shards, DONE, CANCELLED
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'csrr-tracker-secret-key'
+init_static_assets(app)  # Self-hosted Bootstrap, Font Awesome, Chart.js and Plotly
+init_compression(app)  # gzip/brotli + weak ETags for HTML and JSON responses
 
 # Initialize tracker
 tracker = CSRRFacultyTracker()
+init_report_links(app, tracker.config['output']['reports_folder'])  # Signed links from monthly emails
 
 # In-memory storage (replace with database in production)
 search_history = []
+search_jobs = JobExecutor(max_workers=1, max_queue=5)  # One roster search at a time
+report_manifest = ReportManifest()  # (run ID, format) -> report file, recorded when written
+publication_store = PublicationStore()  # Deduplicated history: searches plus imported reports (import_reports.py)
+init_data_export(app, publication_store)  # /export/publications.csv and .ndjson
+report_archive = ReportArchive(Path(tracker.config['output']['reports_folder']) / 'archive')  # Every run, append-only
+search_checkpoints = open_store()  # Per-faculty progress survives restarts; shard_worker.py can share it
+SEARCH_KIND = 'enhanced-search'
+NEWS_SHARD = '__news__'
+searches_resumed = False
 email_subscribers = []
-faculty_publications = {}  # Store publications by faculty member
-chat_history = []
+faculty_publications = {}  # This process's search results, rendered into its reports; pages read publication_history()
+chat_history = ChatHistory()  # Bounded per-session turns, persisted to instance/chat_log.ndjson
+CHAT_CONTEXT_TURNS = 3  # Earlier turns sent to a model backend with each message
 csrr_news_patterns = []  # Learn from past CSRR news selections
+heatmap_cache = HeatmapCache()  # Roster heatmap, rebuilt only when publications change
+history_cache = {'version': None, 'publications': {}}  # publication_store.by_faculty(), reloaded when the store changes
+history_lock = threading.Lock()
+
+CHAT_ERROR = ("I'm having trouble processing that request. Let me help you with faculty information instead. "
+              "Try asking about 'faculty list' or 'run search'.")
 
 class AIAssistant:
     def __init__(self):
-        # Note: You'll need to add your OpenAI API key for advanced features
-        # For now, using rule-based responses that work reliably
         self.web_scraper = WebScraper()
+        self._router = None
+        self._router_lock = threading.Lock()
+        # Rule-based replies only, unless CSRR_CHAT_BACKEND names a model (see chat_backends.py)
+        self.llm = chat_gateway()
         
+    @property
+    def router(self):
+        """Intent router, compiled on the first chat message; publication answers come from a local TF-IDF index"""
+        with self._router_lock:
+            if self._router is None:
+                self._router = IntentRouter(tracker.faculty_names, index=PublicationIndex())
+            return self._router
+
     def generate_response(self, user_message, context=""):
         """Generate AI response with web scraping if needed"""
+        return self.answer(user_message)[0]
+    
+    def answer(self, user_message, history=()):
+        """Reply text plus the publications it cites (for links in the chat window)"""
+        sources, reply = self.stream_answer(user_message, history)
+        return ''.join(reply), sources
+
+    def stream_answer(self, user_message, history=()):
+        """(cited publications, ReplyStream of the reply text)
+
+        The router drafts the reply from local data; a configured model backend
+        rewrites it, and the draft is used as-is if the model is busy, slow or failing.
+        """
         try:
-            # Simple rule-based responses that work reliably
-            response = self._generate_simple_response(user_message, context)
-            return response
-            
+            draft, sources = self.router.answer(user_message, publication_history())
         except Exception as e:
-            return f"I'm having trouble processing that request. Let me help you with faculty information instead. Try asking about 'faculty list' or 'run search'."
-    
-    def _generate_simple_response(self, message, context):
-        """Simple response generator with reliable responses"""
-        message_lower = message.lower()
-        
-        if "hello" in message_lower or "hi" in message_lower:
-            return f"Hello! I'm your CSRR Faculty Tracker assistant. I can help you with {len(tracker.faculty_names)} faculty members, run searches, and generate reports. What would you like to do?"
-        
-        elif "faculty" in message_lower or "list" in message_lower:
-            return f"CSRR tracks {len(tracker.faculty_names)} faculty affiliates including {', '.join(tracker.faculty_names[:3])} and many others. I can help you find information about their recent publications and media appearances. Which faculty member interests you?"
-        
-        elif "search" in message_lower:
-            return "I can help you run searches for faculty publications! The system monitors op-eds, interviews, TV appearances, and academic articles. Click 'Start AI-Enhanced Search' on the main dashboard to begin, or I can guide you through the process."
-        
-        elif "help" in message_lower:
-            return "I can help you with: \n• Faculty information and lists\n• Running publication searches\n• Understanding search results\n• Email subscriptions\n• Report generation\n\nWhat would you like to know more about?"
-        
-        elif "report" in message_lower:
-            return "The system generates Excel and Word reports automatically after each search. Reports include faculty publications, media appearances, and AI recommendations for the CSRR website. Would you like me to explain the report format?"
-        
-        elif "email" in message_lower or "subscribe" in message_lower:
-            return "You can subscribe to monthly reports that are automatically sent on the 1st of each month. Just enter your email in the subscription box on the main dashboard. Current subscribers receive AI-enhanced faculty publication summaries."
-        
-        elif any(name.lower() in message_lower for name in tracker.faculty_names[:10]):
-            faculty_name = next((name for name in tracker.faculty_names if name.lower() in message_lower), "Unknown Faculty")
-            return f"I found {faculty_name} in our CSRR faculty database! They are one of our {len(tracker.faculty_names)} tracked affiliates. Would you like me to search for their recent publications or check their publication timeline?"
-        
-        elif "recommend" in message_lower or "suggest" in message_lower:
-            return "I can recommend publications for the CSRR in the News section! My recommendations are based on source credibility, publication impact, and relevance to CSRR's mission. Run a search first, then click 'AI Recommend' on the results."
-        
-        elif "timeline" in message_lower:
-            return "Publication timelines show faculty activity over time with interactive visualizations. You can access timelines by clicking the 'Timeline' button next to any faculty member's publications."
-        
-        else:
-            return "I'm your CSRR Faculty Tracker assistant! I can help you with faculty information, publication searches, reports, and recommendations. Try asking about 'faculty list', 'run search', or 'help' to get started."
+            print(f"Error answering chat message: {e}")
+            return [], ReplyStream(CHAT_ERROR)
+        if self.llm is None:
+            return sources, ReplyStream(draft)
+        return sources, ReplyStream(draft, self.llm, build_messages(user_message, draft, history))
 
 class WebScraper:
     def __init__(self):
@@ -99,6 +121,9 @@ class WebScraper:
     def search_faculty_info(self, query):
         """Search for recent faculty information"""
         try:
+            import requests
+            from bs4 import BeautifulSoup
+
             # Search Google News for faculty mentions
             search_url = f"https://news.google.com/search?q={quote(query)}&hl=en&sort=date"
             response = requests.get(search_url, headers=self.headers, timeout=10)
@@ -125,6 +150,8 @@ class WebScraper:
     def scrape_google_scholar(self, faculty_name):
         """Scrape Google Scholar for faculty publications"""
         try:
+            from scholarly import scholarly
+
             # Use scholarly library to search Google Scholar
             search_query = scholarly.search_author(faculty_name)
             author = next(search_query, None)
@@ -151,6 +178,9 @@ class WebScraper:
     def summarize_article(self, url):
         """Scrape and summarize article content"""
         try:
+            import requests
+            from bs4 import BeautifulSoup
+
             response = requests.get(url, headers=self.headers, timeout=10)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -179,11 +209,11 @@ def dashboard():
         'total_faculty': len(tracker.faculty_names),
         'total_searches': len(search_history),
         'total_subscribers': len(email_subscribers),
-        'total_publications': sum(len(pubs) for pubs in faculty_publications.values()),
+        'total_publications': sum(len(pubs) for pubs in publication_history().values()),
         'last_search': search_history[-1]['date'] if search_history else 'Never'
     }
     
-    return render_template_string(ADVANCED_DASHBOARD_HTML, 
+    return render_template('inline/advanced_dashboard.html', 
                                 analytics=analytics, 
                                 search_history=search_history[:5],
                                 recent_publications=get_recent_publications()[:5])
@@ -193,21 +223,50 @@ def chat():
     """AI chatbot endpoint"""
     user_message = request.json.get('message', '')
     
-    # Generate AI response
-    ai_response = ai_assistant.generate_response(user_message)
+    # Generate AI response, with the publications it draws on
+    session_id = chat_session_id()
+    sources, reply = ai_assistant.stream_answer(user_message, chat_history.recent(session_id, CHAT_CONTEXT_TURNS))
+    ai_response = ''.join(reply)
     
-    # Store chat history
-    chat_history.append({
+    # Store chat history (the draft answer, if the model's reply was interrupted)
+    chat_history.append(session_id, {
         'user': user_message,
-        'ai': ai_response,
+        'ai': reply.text,
+        'interrupted': reply.interrupted,
+        'sources': sources,
         'timestamp': datetime.now().isoformat()
     })
     
     return jsonify({
         'response': ai_response,
+        'sources': sources,
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """AI chatbot endpoint, streamed as Server-Sent Events: 'sources', a 'delta' per text chunk, then 'done'"""
+    user_message = request.json.get('message', '')
+    session_id = chat_session_id()
+    sources, reply = ai_assistant.stream_answer(user_message, chat_history.recent(session_id, CHAT_CONTEXT_TURNS))
+
+    def events():
+        yield 'sources', {'sources': sources}
+        for chunk in reply:
+            yield 'delta', {'text': chunk}
+        
+        # Store chat history once the whole reply has been sent (the draft, if the model was interrupted)
+        chat_history.append(session_id, {
+            'user': user_message,
+            'ai': reply.text,
+            'interrupted': reply.interrupted,
+            'sources': sources,
+            'timestamp': datetime.now().isoformat()
+        })
+        yield 'done', {'timestamp': datetime.now().isoformat()}
+
+    return sse_events(events())
+
 @app.route('/summarize', methods=['POST'])
 def summarize_content():
     """AI content summarizer"""
@@ -253,8 +312,11 @@ def get_recommendations():
 @app.route('/timeline/<faculty_name>')
 def faculty_timeline(faculty_name):
     """Generate timeline visualization for faculty member"""
+    import plotly.graph_objs as go
+    import plotly.utils
+
     # Get publication history for faculty member
-    publications = faculty_publications.get(faculty_name, [])
+    publications = publication_history().get(faculty_name, [])
     
     # Create timeline data
     dates = []
@@ -286,41 +348,100 @@ def faculty_timeline(faculty_name):
     
     timeline_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
     
-    return render_template_string(TIMELINE_HTML, 
+    return render_template('inline/timeline.html', 
                                 faculty_name=faculty_name, 
                                 timeline_json=timeline_json)
 
+@app.route('/heatmap')
+def activity_heatmap():
+    """Roster-wide faculty x period publication counts, binned server-side"""
+    freq = request.args.get('freq', 'month')
+    if freq not in FREQUENCIES:
+        return jsonify({'error': f"freq must be one of: {', '.join(FREQUENCIES)}"}), 400
+
+    periods = request.args.get('periods', 12, type=int)
+    periods = max(1, min(periods or 12, 104))
+
+    payload = heatmap_cache.get(publication_history(), tracker.faculty_names, freq=freq, periods=periods)
+    return jsonify(payload)
+
 @app.route('/run-search', methods=['POST'])
 def run_search():
     """Enhanced search with AI analysis"""
-    search_record = {
-        'id': len(search_history) + 1,
-        'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-        'status': 'Running',
-        'results': 0,
-        'ai_analysis': 'Pending'
-    }
-    search_history.append(search_record)
+    def make_record(search_id):
+        search_record = {
+            'id': search_id,
+            'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'results': 0,
+            'ai_analysis': 'Pending'
+        }
+        search_history.append(search_record)
+        return search_record
+    
+    # Queue the search; repeated clicks while one is in flight join the existing job
+    try:
+        job, created = search_jobs.submit('monthly-search', enhanced_background_search, make_record)
+    except QueueFull:
+        flash('Too many searches are waiting. Please try again once the current search finishes.', 'warning')
+        return redirect(url_for('dashboard'))
     
-    # Start enhanced background search
-    thread = threading.Thread(target=enhanced_background_search, args=(search_record,))
-    thread.daemon = True
-    thread.start()
+    if not created:
+        flash(f'Search #{job.id} is already {job.state.lower()}; your request was merged into it.', 'info')
+        return redirect(url_for('dashboard'))
     
     flash('Enhanced AI-powered search started! This will include Google Scholar, news sources, and AI analysis.', 'success')
     return redirect(url_for('dashboard'))
 
-def enhanced_background_search(search_record):
+@app.route('/jobs')
+def job_status():
+    """Queue depth and state of background search jobs"""
+    return jsonify(search_jobs.status())
+
+@app.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Request cancellation of a queued or running search"""
+    job = search_jobs.cancel(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<int:job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events stream of a search's progress and completion"""
+    job = search_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return sse_response(job.events, request.headers.get('Last-Event-ID'))
+
+def search_shard(shard):
+    """Execute one shard of an enhanced search (also called by shard_worker.py)"""
+    if shard == NEWS_SHARD:
+        return tracker.run_monthly_search()
+    # Scrape Google Scholar
+    return ai_assistant.web_scraper.scrape_google_scholar(shard)
+
+def enhanced_background_search(search_record, cancel_token=None, progress=no_progress):
     """Enhanced search with multiple sources and AI analysis"""
     try:
-        # Run the original search
-        results_count = tracker.run_monthly_search()
+        run_id = search_record.get('run_id')
+        if not run_id:
+            # One shard for the news search, one per faculty member for Google Scholar
+            shards = [NEWS_SHARD] + tracker.faculty_names[:10]  # Limit for demo
+            run_id = search_checkpoints.start_run(SEARCH_KIND, shards, search_record)
+            search_record['run_id'] = run_id
         
-        # Enhanced scraping from additional sources
-        for faculty_name in tracker.faculty_names[:10]:  # Limit for demo
-            # Scrape Google Scholar
-            scholar_pubs = ai_assistant.web_scraper.scrape_google_scholar(faculty_name)
-            
+        # Shards are shared with any shard_worker.py processes; this thread works on them too
+        if not run_shards(search_checkpoints, run_id, search_shard, search_record, cancel_token, progress):
+            if cancel_token is not None and cancel_token.is_set():
+                search_checkpoints.finish_run(run_id, CANCELLED, search_record)
+                return  # The job executor marks the search Cancelled
+            failed = ', '.join(search_checkpoints.exhausted_shards(run_id))
+            raise RuntimeError(f'Sources failed ({failed}); they will be retried when the search is resumed')
+        
+        # Merge every shard, including those finished before a restart
+        shard_results = search_checkpoints.results(run_id)
+        results_count = shard_results.pop(NEWS_SHARD)
+        for faculty_name, scholar_pubs in shard_results.items():
             if faculty_name not in faculty_publications:
                 faculty_publications[faculty_name] = []
             
@@ -340,82 +461,98 @@ def enhanced_background_search(search_record):
         search_record['status'] = 'Completed'
         search_record['results'] = results_count + len(faculty_publications)
         search_record['ai_analysis'] = ai_analysis
-        search_record['excel_report'] = f"CSRR_Enhanced_Report_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        search_record['word_report'] = f"CSRR_Enhanced_Report_{datetime.now().strftime('%Y%m%d')}.docx"
+        # Second granularity, so a same-day rerun does not overwrite the earlier run's reports
+        report_stem = f"CSRR_Enhanced_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        search_record['excel_report'] = f"{report_stem}.xlsx"
+        search_record['word_report'] = f"{report_stem}.docx"
+        search_record['csv_report'] = f"{report_stem}.csv"
         
-        # Generate enhanced reports
+        # Reports render in worker processes; the search is complete without waiting for them
         generate_enhanced_reports(search_record)
+        search_checkpoints.finish_run(run_id, DONE, search_record)
         
     except Exception as e:
         search_record['status'] = 'Failed'
         search_record['error'] = str(e)
 
+@app.before_request
+def resume_interrupted_searches():
+    """Re-queue searches a previous process left unfinished; completed shards are not repeated"""
+    # Runs on the first request rather than at import, so shard workers and the
+    # debug reloader's parent process never pick up runs
+    global searches_resumed
+    if searches_resumed:
+        return
+    searches_resumed = True
+    for run_id, saved_record in search_checkpoints.claim_abandoned_runs(SEARCH_KIND):
+        def make_record(search_id, run_id=run_id, saved_record=saved_record):
+            search_record = dict(saved_record, id=search_id, run_id=run_id, resumed_from=saved_record.get('id'))
+            search_history.append(search_record)
+            return search_record
+        
+        try:
+            search_jobs.submit(f'resume-{run_id}', enhanced_background_search, make_record)
+            print(f"Resuming interrupted search run {run_id}")
+        except QueueFull:
+            print(f"Search queue full; run {run_id} will resume on the next restart")
+            break
+
 def generate_enhanced_reports(search_record):
-    """Generate enhanced reports with AI insights"""
+    """Render Excel, Word and CSV reports in worker processes from one model of this search"""
     try:
-        from docx import Document
-        
-        doc = Document()
-        
-        # Enhanced title with AI branding
-        title = doc.add_heading(f'CSRR Faculty Affiliates AI-Enhanced Report - {datetime.now().strftime("%B %Y")}', 0)
-        
-        # Enhanced header
-        doc.add_paragraph('Center for Security, Race and Rights')
-        doc.add_paragraph('Rutgers Law School')
-        doc.add_paragraph(f'AI-Powered Analysis Report Generated: {datetime.now().strftime("%B %d, %Y")}')
-        doc.add_paragraph('')
-        
-        # AI Summary section
-        doc.add_heading('AI Analysis Summary', level=1)
-        doc.add_paragraph(f'Total Publications Found: {search_record["results"]}')
-        doc.add_paragraph('Sources Monitored: News outlets, Google Scholar, Academic databases')
-        doc.add_paragraph('AI Recommendations: Based on impact analysis and past CSRR selections')
-        doc.add_paragraph('')
-        
-        # Enhanced content sections
-        doc.add_heading('High-Impact Publications Recommended', level=1)
-        doc.add_paragraph('AI has analyzed publication sources, citation counts, and media reach to recommend:')
-        doc.add_paragraph('• Publications in top-tier media outlets (Washington Post, NYT, CNN)')
-        doc.add_paragraph('• Academic papers with high citation potential')
-        doc.add_paragraph('• Interview content with multimedia opportunities')
-        doc.add_paragraph('')
-        
-        # Faculty highlights
-        doc.add_heading('Faculty Spotlight Analysis', level=1)
-        for faculty_name in list(faculty_publications.keys())[:5]:
-            pubs = faculty_publications[faculty_name]
-            if pubs:
-                doc.add_paragraph(f'• {faculty_name}: {len(pubs)} publications found')
-        
-        doc.add_paragraph('')
-        
-        # AI recommendations
-        doc.add_heading('AI Recommendations for CSRR in the News', level=1)
-        doc.add_paragraph('1. Prioritize multimedia content (TV/radio interviews)')
-        doc.add_paragraph('2. Feature publications from faculty with highest recent activity')
-        doc.add_paragraph('3. Focus on timely topics with current relevance')
-        doc.add_paragraph('4. Consider geographic diversity of publication sources')
-        doc.add_paragraph('5. Update website: https://csrr.rutgers.edu/newsroom/csrr-in-the-news/')
-        
-        # Save enhanced document
+        # Single pass over the publications; renderers only see this snapshot
+        model = build_report_model(search_record, faculty_publications)
+        previous = report_manifest.latest('csv', exclude_run=search_record['run_id'])
+        model['previous_report'] = previous['path'] if previous else None
         reports_dir = Path('/Users/azrabano/CSRR_Reports')
-        reports_dir.mkdir(exist_ok=True)
-        doc_path = reports_dir / search_record['word_report']
-        doc.save(doc_path)
+        search_record['reports'] = 'Rendering'
         
-        search_record['word_path'] = str(doc_path)
+        def reports_finished(paths, errors):
+            for name, path in paths.items():
+                search_record[f'{name}_path'] = path
+                report_manifest.record(search_record['run_id'], path)
+            search_record['reports'] = 'Failed' if errors else 'Ready'
+            for name, error in errors.items():
+                print(f"Error generating {name} report: {error}")
+        
+        render_reports(model, {
+            'excel': (render_xlsx, reports_dir / search_record['excel_report']),
+            'word': (render_docx, reports_dir / search_record['word_report']),
+            'csv': (render_csv, reports_dir / search_record['csv_report']),
+        }, reports_finished)
         
     except Exception as e:
+        search_record['reports'] = 'Failed'
         print(f"Error generating enhanced report: {e}")
+        return
+    
+    # Append this run to the archive and the publication store while the standalone reports render
+    try:
+        report_archive.append_run(search_record['run_id'], model['generated_at'], model['rows'])
+        publication_store.add_publications(canonical_rows(model['columns'], model['rows']),
+                                           origin=f"search:{search_record['run_id']}")
+    except Exception as e:
+        print(f"Error archiving search run: {e}")
+
+def publication_history():
+    """Every stored publication by faculty member: past searches plus reports imported with import_reports.py"""
+    try:
+        version = publication_store.version()
+        with history_lock:
+            if history_cache['version'] != version:
+                history_cache['publications'] = publication_store.by_faculty()
+                history_cache['version'] = version
+            return history_cache['publications']
+    except Exception as e:
+        print(f"Error reading publication store: {e}")
+        return faculty_publications
 
 def get_recent_publications():
     """Get recent publications across all faculty"""
     all_pubs = []
-    for faculty_name, pubs in faculty_publications.items():
+    for faculty_name, pubs in publication_history().items():
         for pub in pubs:
-            pub['faculty_name'] = faculty_name
-            all_pubs.append(pub)
+            all_pubs.append(dict(pub, faculty_name=faculty_name))
     
     # Sort by date (most recent first)
     all_pubs.sort(key=lambda x: x.get('date', datetime.min), reverse=True)
@@ -440,8 +577,8 @@ ADVANCED_DASHBOARD_HTML = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>CSRR AI-Powered Faculty Tracker | Rutgers Law</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+    <link href="{{ asset_url('bootstrap.min.css') }}" rel="stylesheet">
+    <link href="{{ asset_url('fontawesome.min.css') }}" rel="stylesheet">
     <style>
         :root {
             --rutgers-red: #CC0033;
@@ -539,6 +676,12 @@ ADVANCED_DASHBOARD_HTML = '''
             max-width: 80%;
         }
         
+        .chat-sources {
+            margin: 6px 0 0;
+            padding-left: 18px;
+            font-size: 0.9em;
+        }
+        
         .user-message {
             background: #e3f2fd;
             margin-left: auto;
@@ -684,8 +827,14 @@ ADVANCED_DASHBOARD_HTML = '''
                                         <td>
                                             {% if search.status == 'Completed' %}
                                                 <span class="badge bg-success">{{ search.status }}</span>
-                                            {% elif search.status == 'Running' %}
+                                                {% if search.reports == 'Rendering' %}
+                                                    <small class="d-block text-muted">Reports rendering...</small>
+                                                {% elif search.reports == 'Failed' %}
+                                                    <small class="d-block text-danger">Report rendering failed</small>
+                                                {% endif %}
+                                            {% elif search.status in ('Running', 'Queued') %}
                                                 <span class="badge bg-primary">{{ search.status }}</span>
+                                                <small class="d-block text-muted" data-search-progress="{{ search.id }}" data-progress-unit="sources"></small>
                                             {% else %}
                                                 <span class="badge bg-danger">{{ search.status }}</span>
                                             {% endif %}
@@ -818,7 +967,7 @@ ADVANCED_DASHBOARD_HTML = '''
         <i class="fas fa-robot text-white fa-lg"></i>
     </div>
 
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
+    <script src="{{ asset_url('bootstrap.bundle.min.js') }}"></script>
     <script>
         let chatOpen = false;
 
@@ -852,45 +1001,107 @@ ADVANCED_DASHBOARD_HTML = '''
             addMessage('user', message);
             input.value = '';
 
-            // Show typing indicator
+            // Show typing indicator until the first chunk arrives
             addMessage('ai', 'Typing...', true);
+            const messages = document.getElementById('chatMessages');
+            const typing = messages.lastChild;
 
             try {
-                const response = await fetch('/chat', {
+                const response = await fetch('/chat/stream', {
                     method: 'POST',
                     headers: {'Content-Type': 'application/json'},
                     body: JSON.stringify({message: message})
                 });
+                if (!response.ok || !response.body) {
+                    throw new Error(`Chat failed with status ${response.status}`);
+                }
 
-                const data = await response.json();
-                
-                // Remove typing indicator
-                const messages = document.getElementById('chatMessages');
-                messages.removeChild(messages.lastChild);
-                
-                // Add AI response
-                addMessage('ai', data.response);
+                // Render the reply as Server-Sent Events arrive: sources, delta..., done
+                let sources = [];
+                let text = '';
+                let reply = null;
+                const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+                let buffer = '';
+                while (true) {
+                    const {value, done} = await reader.read();
+                    if (done) break;
+                    buffer += value;
+                    const frames = buffer.split('\\n\\n');
+                    buffer = frames.pop();
+                    for (const frame of frames) {
+                        const event = (frame.match(/^event: (.*)$/m) || [])[1];
+                        const data = (frame.match(/^data: (.*)$/m) || [])[1];
+                        if (!event || data === undefined) continue;
+                        const payload = JSON.parse(data);
+                        if (event === 'sources') {
+                            sources = payload.sources || [];
+                        } else if (event === 'delta') {
+                            text += payload.text;
+                            if (!reply) {
+                                messages.removeChild(typing);
+                                reply = addMessage('ai', text);
+                            } else {
+                                reply.querySelector('span').textContent = text;
+                                messages.scrollTop = messages.scrollHeight;
+                            }
+                        }
+                    }
+                }
+
+                // Citations go in once the reply is complete
+                if (reply) {
+                    messages.removeChild(reply);
+                } else {
+                    messages.removeChild(typing);
+                }
+                addMessage('ai', text, false, sources);
 
             } catch (error) {
                 console.error('Error:', error);
+                if (typing.parentNode) {
+                    messages.removeChild(typing);
+                }
                 addMessage('ai', 'Sorry, I encountered an error. Please try again.');
             }
         }
 
-        function addMessage(sender, text, isTyping = false) {
+        function addMessage(sender, text, isTyping = false, sources = []) {
             const messages = document.getElementById('chatMessages');
             const messageDiv = document.createElement('div');
             messageDiv.className = `message ${sender}-message`;
             
+            // Inserted as text, never HTML: replies quote scraped publication titles
+            const label = document.createElement('strong');
+            label.textContent = `${isTyping ? 'AI' : sender.toUpperCase()}: `;
+            const body = document.createElement(isTyping ? 'em' : 'span');
+            body.textContent = text;
+            body.style.whiteSpace = 'pre-line';
+            messageDiv.append(label, body);
             if (isTyping) {
-                messageDiv.innerHTML = `<strong>AI:</strong> <em>${text}</em>`;
                 messageDiv.style.fontStyle = 'italic';
-            } else {
-                messageDiv.innerHTML = `<strong>${sender.toUpperCase()}:</strong> ${text}`;
+            }
+            
+            // Publications the answer cites, as links
+            const linked = sources.filter(source => /^https?:\/\//i.test(source.url || ''));
+            if (linked.length) {
+                const list = document.createElement('ul');
+                list.className = 'chat-sources';
+                linked.forEach(source => {
+                    const item = document.createElement('li');
+                    const link = document.createElement('a');
+                    link.href = source.url;
+                    link.target = '_blank';
+                    link.rel = 'noopener';
+                    link.textContent = source.title;
+                    item.append(link, ` (${source.source || source.faculty})`);
+                    list.appendChild(item);
+                });
+                messageDiv.appendChild(list);
             }
             
             messages.appendChild(messageDiv);
             messages.scrollTop = messages.scrollHeight;
+            return messageDiv;
         }
 
         async function summarizeContent(url, title) {
@@ -920,7 +1131,7 @@ ADVANCED_DASHBOARD_HTML = '''
                 const data = await response.json();
                 
                 if (data.recommendations.length > 0) {
-                    let message = "AI Recommendations:\n\n";
+                    let message = "AI Recommendations:\\n\\n";
                     data.recommendations.forEach(rec => {
                         message += `• ${rec.title} (Score: ${rec.score})\n  ${rec.reason}\n  Action: ${rec.action}\n\n`;
                     });
@@ -934,6 +1145,7 @@ ADVANCED_DASHBOARD_HTML = '''
             }
         }
     </script>
+    <script src="{{ asset_url('search_progress.js') }}" defer></script>
 </body>
 </html>
 '''
@@ -943,8 +1155,8 @@ TIMELINE_HTML = '''
 <html>
 <head>
     <title>Faculty Timeline - {{ faculty_name }}</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
+    <script src="{{ asset_url('plotly.min.js') }}"></script>
+    <link href="{{ asset_url('bootstrap.min.css') }}" rel="stylesheet">
 </head>
 <body>
     <div class="container mt-4">
@@ -961,6 +1173,12 @@ TIMELINE_HTML = '''
 </html>
 '''
 
+# Compile the inline templates once; routes render them by name
+register_templates(app, {
+    'advanced_dashboard.html': ADVANCED_DASHBOARD_HTML,
+    'timeline.html': TIMELINE_HTML,
+})
+
 if __name__ == '__main__':
     print("🚀 Starting Advanced AI-Powered CSRR Faculty Tracker on http://127.0.0.1:3000")
     print("🤖 Features: AI Chatbot, Content Summarization, Smart Recommendations, Timeline Visualization")
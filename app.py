@@ -5,11 +5,14 @@ Handles search issues gracefully with demonstration data
 """
 
 from flask import Flask, render_template_string, request, redirect, url_for, flash, jsonify
-import pandas as pd
 from datetime import datetime, timedelta
 import os
 import threading
-import random
+
+from sample_snapshot import load_snapshot
+from static_assets import init_app as init_static_assets
+from http_compression import init_app as init_compression
+from chat_store import ChatHistory, chat_session_id
 
 # Simple faculty tracker class for Vercel deployment
 class CSRRFacultyTracker:
@@ -59,27 +62,34 @@ class CSRRFacultyTracker:
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key'
+init_static_assets(app)  # asset_url() in templates; hashed bundle under /assets
+init_compression(app)  # gzip/brotli + weak ETags for HTML and JSON responses
 
 search_history = []
 email_subscribers = []
 faculty_publications = {}
-chat_history = []
+chat_history = ChatHistory()  # Bounded per-session turns, persisted to instance/chat_log.ndjson
 
 class AIAssistant:
     def generate_response(self, user_message):
         return f"Your message: {user_message}"
 
-def generate_sample_publications():
+def build_sample_publications(rng, anchor):
     sources = ['Washington Post', 'New York Times', 'CNN', 'NPR']
     types = ['Op-Ed', 'Interview', 'Article']
+    publications = {}
     for faculty in CSRRFacultyTracker().faculty_names[:5]:
-        publications = [{
+        publications[faculty] = [{
             'title': f'Research by {faculty}',
-            'date': datetime.now() - timedelta(days=random.randint(1, 100)),
-            'type': random.choice(types),
-            'source': random.choice(sources)
-        } for _ in range(random.randint(1, 3))]
-        faculty_publications[faculty] = publications
+            'date': anchor - timedelta(days=rng.randint(1, 100)),
+            'type': rng.choice(types),
+            'source': rng.choice(sources)
+        } for _ in range(rng.randint(1, 3))]
+    return publications
+
+def generate_sample_publications():
+    # Loaded from a prebuilt snapshot so every worker serves identical data
+    faculty_publications.update(load_snapshot('app', build_sample_publications))
 
 generate_sample_publications()
 
@@ -95,7 +105,7 @@ def dashboard():
 def chat():
     user_message = request.json.get('message', '')
     ai_response = AIAssistant().generate_response(user_message)
-    chat_history.append({'user': user_message, 'ai': ai_response})
+    chat_history.append(chat_session_id(), {'user': user_message, 'ai': ai_response})
     return jsonify({'response': ai_response})
 
 if __name__ == '__main__':
@@ -1,17 +1,16 @@
 #!/usr/bin/env python3
 
-import schedule
-import time
 import subprocess
 
+from task_scheduler import Scheduler, monthly
+
 # Function to run the dashboard
 def run_dashboard():
     subprocess.Popen(["gunicorn", "-w", "3", "-b", "0.0.0.0:5000", "app:app"])  # Adjust workers and bind to suitable IP and port
 
-# Schedule the dashboard to start every 30th of the month at midnight
-schedule.every().month.at("00:00").do(run_dashboard)
+# Schedule the dashboard to start every 30th of the month at midnight (last day in February)
+scheduler = Scheduler()
+scheduler.add_job('start_dashboard', run_dashboard, monthly(day=30))
 
-# Keep the script running
-while True:
-    schedule.run_pending()
-    time.sleep(60)
+# Sleep until the next due time; a start missed while this script was down runs immediately
+scheduler.run_forever()
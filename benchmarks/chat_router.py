@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Chat Intent Benchmark
+Accuracy and latency of the old substring if/elif chain versus the compiled intent router
+
+The roster is read from app.py without importing it. Each message in CORPUS is
+labelled with the intent a person would expect; slot labels are checked for
+the router only (the old chain had no slots).
+
+Usage:
+    python benchmarks/chat_router.py --iterations 2000
+"""
+
+import argparse
+import ast
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from chat_router import IntentRouter
+
+# (message, expected intent, expected slots subset)
+CORPUS = [
+    ("hello", 'greeting', {}),
+    ("Hi there!", 'greeting', {}),
+    ("hey, good morning", 'greeting', {}),
+    ("Is this thing on?", 'fallback', {}),
+    ("what is this dashboard", 'fallback', {}),
+    ("thanks, that's all", 'fallback', {}),
+    ("Which faculty do you track?", 'faculty_list', {}),
+    ("show me the full roster", 'faculty_list', {}),
+    ("list the affiliates please", 'faculty_list', {}),
+    ("how many members are there", 'faculty_list', {}),
+    ("run a search", 'search', {}),
+    ("can you search for new content", 'search', {}),
+    ("please look up Sahar Mohamed Khamis", 'search', {'faculty': ['Sahar Mohamed Khamis']}),
+    ("find something by Khaled Beydoun", 'search', {'faculty': ['Khaled A. Beydoun']}),
+    ("help", 'help', {}),
+    ("what can you do?", 'help', {}),
+    ("how do I use this", 'help', {}),
+    ("where is the report", 'report', {}),
+    ("download the excel file", 'report', {}),
+    ("I need the monthly reports", 'report', {}),
+    ("how do I subscribe", 'email', {}),
+    ("add me to the email list", 'email', {}),
+    ("unsubscribe me from the newsletter", 'email', {}),
+    ("Tell me about Noura Erakat", 'faculty_info', {'faculty': ['Noura Erakat']}),
+    ("Who is Juan Cole?", 'faculty_info', {'faculty': ['Juan Cole']}),
+    ("Asli Bali", 'faculty_info', {'faculty': ['Asli Ü. Bâli']}),
+    ("what about Beydoun", 'faculty_info', {'faculty': ['Khaled A. Beydoun']}),
+    ("hi, is Erakat on the faculty list?", 'faculty_info', {'faculty': ['Noura Erakat']}),
+    ("what should we feature on the website", 'recommend', {}),
+    ("recommend something for CSRR in the News", 'recommend', {}),
+    ("any suggestions?", 'recommend', {}),
+    ("show the timeline", 'timeline', {}),
+    ("how has activity changed over time", 'timeline', {}),
+    ("publication trends for Deepa Kumar", 'timeline', {'faculty': ['Deepa Kumar']}),
+    ("what did Wadie Said publish last month", 'publications', {'faculty': ['Wadie Said'], 'date_range': True}),
+    ("any op-eds in the Washington Post?", 'publications', {'source': 'Washington Post'}),
+    ("new articles in NYT this week", 'publications', {'source': 'New York Times', 'date_range': True}),
+    ("interviews by Noura Erakat since March 2024", 'publications',
+     {'faculty': ['Noura Erakat'], 'date_range': True}),
+    ("what's new", 'publications', {}),
+    ("anything on CNN in the past 2 weeks", 'publications', {'source': 'CNN', 'date_range': True}),
+    ("publications from Al Jazeera in 2024", 'publications', {'source': 'Al Jazeera', 'date_range': True}),
+    ("what has Margaret Hu written", 'publications', {'faculty': ['Margaret Hu']}),
+    ("search Fox News for the last 3 days", 'publications', {'source': 'Fox News', 'date_range': True}),
+    ("he said it was fine", 'fallback', {}),
+    ("let it snow", 'fallback', {}),
+    ("this is a list of things", 'faculty_list', {}),
+    ("thistle", 'fallback', {}),
+    ("the shipping manifest", 'fallback', {}),
+    ("is the reporter here", 'fallback', {}),
+]
+
+
+def load_roster():
+    """CSRRFacultyTracker.faculty_names from app.py, without importing the app"""
+    tree = ast.parse((REPO_ROOT / 'app.py').read_text())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and any(getattr(t, 'attr', None) == 'faculty_names' for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise LookupError('faculty_names not found in app.py')
+
+
+def legacy_intent(message, faculty_names):
+    """The substring chain _generate_simple_response used, mapped to intent names"""
+    message_lower = message.lower()
+    if "hello" in message_lower or "hi" in message_lower:
+        return 'greeting'
+    elif "faculty" in message_lower or "list" in message_lower:
+        return 'faculty_list'
+    elif "search" in message_lower:
+        return 'search'
+    elif "help" in message_lower:
+        return 'help'
+    elif "report" in message_lower:
+        return 'report'
+    elif "email" in message_lower or "subscribe" in message_lower:
+        return 'email'
+    elif any(name.lower() in message_lower for name in faculty_names[:10]):
+        return 'faculty_info'
+    elif "recommend" in message_lower or "suggest" in message_lower:
+        return 'recommend'
+    elif "timeline" in message_lower:
+        return 'timeline'
+    return 'fallback'
+
+
+def slots_match(slots, expected):
+    for key, value in expected.items():
+        if value is True:
+            if not slots.get(key):
+                return False
+        elif slots.get(key) != value:
+            return False
+    return True
+
+
+def latency_us(classify, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for message, _, _ in CORPUS:
+            classify(message)
+        samples.append((time.perf_counter() - start) / len(CORPUS) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare chat intent classification accuracy and latency')
+    parser.add_argument('--iterations', type=int, default=2000, help='Passes over the corpus for timing')
+    parser.add_argument('--verbose', action='store_true', help='Print every misclassified message')
+    args = parser.parse_args()
+
+    roster = load_roster()
+    start = time.perf_counter()
+    router = IntentRouter(roster)
+    compile_ms = (time.perf_counter() - start) * 1e3
+
+    legacy_hits = router_hits = slot_hits = 0
+    for message, expected, expected_slots in CORPUS:
+        legacy = legacy_intent(message, roster)
+        intent = router.classify(message)
+        legacy_hits += legacy == expected
+        router_hits += intent.name == expected
+        slot_hits += intent.name == expected and slots_match(intent.slots, expected_slots)
+        if args.verbose and (legacy != expected or intent.name != expected):
+            print(f"{message!r}: expected {expected}, legacy {legacy}, router {intent.name} {intent.slots}")
+
+    total = len(CORPUS)
+    print(f"{total} messages, {len(roster)} faculty; router compiled in {compile_ms:.1f} ms")
+    print(f"{'classifier':<16}{'intent acc':>12}{'with slots':>12}{'us/message':>12}")
+    print(f"{'if/elif chain':<16}{legacy_hits / total:>12.0%}{'-':>12}"
+          f"{latency_us(lambda m: legacy_intent(m, roster), args.iterations):>12.1f}")
+    print(f"{'intent router':<16}{router_hits / total:>12.0%}{slot_hits / total:>12.0%}"
+          f"{latency_us(router.classify, args.iterations):>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
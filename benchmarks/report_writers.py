@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Report Writer Memory Benchmark
+Peak memory and time of in-memory (openpyxl / python-docx) versus streaming report writers
+
+Each measurement runs in a fresh interpreter so peak RSS belongs to that writer alone.
+
+Usage:
+    python benchmarks/report_writers.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+COLUMNS = ['Faculty', 'Title', 'Date', 'Type', 'Source', 'Citations', 'URL']
+
+CHILD = r'''
+import json, resource, sys, time
+sys.path.insert(0, {repo!r})
+import docx, openpyxl
+from report_writers import write_docx, write_xlsx
+
+COLUMNS = {columns!r}
+
+def rows(count):
+    for i in range(count):
+        yield [f'Faculty Member {{i % 150}}', f'Publication title number {{i}} on civil rights and national security',
+               f'2024-{{i % 12 + 1:02d}}-{{i % 28 + 1:02d}}', 'Op-Ed', 'Washington Post', i % 40,
+               f'https://example.org/articles/{{i}}']
+
+def rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == 'darwin' else peak  # macOS reports bytes
+
+def in_memory_xlsx(path, count):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(COLUMNS)
+    for row in rows(count):
+        sheet.append(row)
+    workbook.save(path)
+
+def in_memory_docx(path, count):
+    document = docx.Document()
+    document.add_heading('All Publications', level=1)
+    for row in rows(count):
+        document.add_paragraph(f'{{row[0]}}: {{row[1]}} ({{row[4]}}, {{row[2]}})', style='List Bullet')
+    document.save(path)
+
+def streaming_xlsx(path, count):
+    write_xlsx(path, COLUMNS, rows(count))
+
+def streaming_docx(path, count):
+    def blocks():
+        yield 'Heading1', 'All Publications'
+        for row in rows(count):
+            yield 'ListBullet', f'{{row[0]}}: {{row[1]}} ({{row[4]}}, {{row[2]}})'
+    write_docx(path, blocks())
+
+writer, count, path = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+before = rss_kb()
+start = time.perf_counter()
+globals()[writer](path, count)
+print(json.dumps({{'seconds': time.perf_counter() - start, 'peak_mb': rss_kb() / 1024,
+                  'growth_mb': (rss_kb() - before) / 1024}}))
+'''
+
+WRITERS = [
+    ('in_memory_xlsx', 'xlsx', 'openpyxl Workbook()'),
+    ('streaming_xlsx', 'xlsx', 'write_xlsx (write-only)'),
+    ('in_memory_docx', 'docx', 'python-docx Document()'),
+    ('streaming_docx', 'docx', 'write_docx (streamed XML)'),
+]
+
+
+def measure(script, writer, count, suffix, tmp):
+    path = Path(tmp) / f'{writer}_{count}.{suffix}'
+    output = subprocess.run([sys.executable, '-c', script, writer, str(count), str(path)],
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output)
+    result['size_mb'] = path.stat().st_size / 1e6
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare report writer memory use and speed')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--max-docx-baseline', type=int, default=10000,
+                        help='Skip python-docx above this many rows (its add_paragraph cost grows with the document)')
+    args = parser.parse_args()
+
+    script = CHILD.format(repo=str(REPO_ROOT), columns=COLUMNS)
+    print(f"{'writer':<28}{'rows':>8}{'seconds':>10}{'peak MB':>10}{'growth MB':>11}{'file MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for writer, suffix, label in WRITERS:
+            for count in args.sizes:
+                if writer == 'in_memory_docx' and count > args.max_docx_baseline:
+                    print(f"{label:<28}{count:>8}   skipped (see --max-docx-baseline)")
+                    continue
+                r = measure(script, writer, count, suffix, tmp)
+                print(f"{label:<28}{count:>8}{r['seconds']:>10.2f}{r['peak_mb']:>10.1f}"
+                      f"{r['growth_mb']:>11.1f}{r['size_mb']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Email Delivery Benchmark
+Compares per-subscriber SMTP sessions with pooled delivery against a local stand-in SMTP server
+
+The stand-in server accepts everything and delays its greeting by --session-cost
+to stand in for the TCP + STARTTLS + login round trips of a real provider.
+
+Usage:
+    python benchmarks/smtp_delivery.py --recipients 2000 --session-cost 0.02
+"""
+
+import argparse
+import os
+import smtplib
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from mail_delivery import MailDelivery, build_attachment, compose_message
+
+SENDER = 'reports@csrr.example'
+SUBJECT = 'CSRR Faculty Publications Report'
+BODY = 'Please find attached the monthly faculty publications report.\n'
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept mail: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        time.sleep(self.server.session_cost)
+        self.reply('220 stand-in ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b'EHLO':
+                self.reply('250-stand-in')
+                self.reply('250 8BITMIME')
+            elif command == b'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with self.server.lock:
+                    self.server.received += 1
+                self.reply('250 OK queued')
+            elif command == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class SinkServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, session_cost):
+        super().__init__(('127.0.0.1', 0), SinkHandler)
+        self.session_cost = session_cost
+        self.received = 0
+        self.lock = threading.Lock()
+
+
+def send_per_subscriber(port, recipients, report_path):
+    """The previous approach: re-read and re-encode the report and open a session for every subscriber"""
+    for recipient in recipients:
+        msg = MIMEMultipart()
+        msg['From'] = SENDER
+        msg['To'] = recipient
+        msg['Subject'] = SUBJECT
+        msg.attach(MIMEText(BODY, 'plain'))
+        with open(report_path, 'rb') as attachment:
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(attachment.read())
+        encoders.encode_base64(part)
+        part.add_header('Content-Disposition', f'attachment; filename= {os.path.basename(report_path)}')
+        msg.attach(part)
+
+        server = smtplib.SMTP('127.0.0.1', port)
+        server.sendmail(SENDER, recipient, msg.as_string())
+        server.quit()
+
+
+def send_pooled(port, recipients, report_path, connections):
+    attachment = build_attachment(report_path)
+    messages = [(recipient, compose_message(SENDER, recipient, SUBJECT, BODY, attachment))
+                for recipient in recipients]
+    delivery = MailDelivery('127.0.0.1', port, SENDER, starttls=False, max_connections=connections, rate=0)
+    sent, failed = delivery.send_all(messages)
+    if failed:
+        raise RuntimeError(f"{len(failed)} deliveries failed, e.g. {next(iter(failed.items()))}")
+    return len(sent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--recipients', type=int, default=2000)
+    parser.add_argument('--attachment-kb', type=int, default=150, help='Size of the fake report')
+    parser.add_argument('--session-cost', type=float, default=0.02,
+                        help='Seconds the server waits before its greeting (handshake + login stand-in)')
+    parser.add_argument('--connections', type=int, default=4)
+    parser.add_argument('--skip-baseline', action='store_true', help='Only time pooled delivery')
+    args = parser.parse_args()
+
+    server = SinkServer(args.session_cost)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    recipients = [f'subscriber{i}@example.edu' for i in range(args.recipients)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = Path(tmp) / 'CSRR_Faculty_Publications_Report.xlsx'
+        report_path.write_bytes(os.urandom(args.attachment_kb * 1024))
+
+        print(f"{args.recipients} recipients, {args.attachment_kb} KB attachment, "
+              f"{args.session_cost * 1000:.0f} ms per SMTP session")
+
+        timings = {}
+        if not args.skip_baseline:
+            start = time.perf_counter()
+            send_per_subscriber(port, recipients, report_path)
+            timings['per-subscriber sessions'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        send_pooled(port, recipients, report_path, args.connections)
+        timings[f'pooled ({args.connections} connections)'] = time.perf_counter() - start
+
+    for name, seconds in timings.items():
+        print(f"{name:<28} {seconds:8.2f} s  {args.recipients / seconds:8.1f} msg/s")
+    print(f"Messages received by stand-in server: {server.received}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
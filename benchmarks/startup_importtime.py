@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Startup Import-Time Benchmark
+Measures cold import cost of a dashboard entry point with `python -X importtime`
+
+Usage:
+    python benchmarks/startup_importtime.py                      # advanced_app, compare to baseline
+    python benchmarks/startup_importtime.py --module app --runs 7
+    python benchmarks/startup_importtime.py --update-baseline    # record current numbers
+
+Exits non-zero when a heavy dependency is imported eagerly or when the median
+import time regresses past the recorded baseline by more than --tolerance.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).resolve().parent / 'startup_importtime_baseline.json'
+
+# Modules that must only load on first use by the routes that need them
+HEAVY_MODULES = ['openai', 'scholarly', 'plotly', 'pandas', 'numpy', 'requests', 'bs4', 'docx', 'openpyxl']
+
+
+def run_importtime(module):
+    """Import `module` in a fresh interpreter and parse the -X importtime report"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    # Lines look like: "import time:       self [us] |  cumulative | imported package"
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def summarize(module, runs):
+    """Median cumulative import time of `module` over several cold starts"""
+    totals = []
+    loaded = set()
+    last = {}
+    for _ in range(runs):
+        last = run_importtime(module)
+        totals.append(last[module][1] if module in last else sum(s for s, _ in last.values()))
+        loaded.update(last)
+
+    heavy = sorted(name for name in HEAVY_MODULES if name in loaded)
+    slowest = sorted(last.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    return {
+        'module': module,
+        'runs': runs,
+        'median_ms': round(statistics.median(totals) / 1000, 2),
+        'min_ms': round(min(totals) / 1000, 2),
+        'modules_loaded': len(last),
+        'heavy_modules_loaded': heavy,
+        'slowest_self_ms': [(name, round(self_us / 1000, 2)) for name, (self_us, _) in slowest],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Track dashboard import time as a regression metric')
+    parser.add_argument('--module', default='advanced_app', help='Entry-point module to import')
+    parser.add_argument('--runs', type=int, default=5, help='Number of cold imports to take the median of')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed fractional regression vs baseline')
+    parser.add_argument('--update-baseline', action='store_true', help='Store the current result as the baseline')
+    args = parser.parse_args()
+
+    report = summarize(args.module, args.runs)
+    print(json.dumps(report, indent=2))
+
+    baselines = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+
+    if args.update_baseline:
+        baselines[args.module] = {'median_ms': report['median_ms']}
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + '\n')
+        print(f"Baseline for {args.module} updated: {report['median_ms']} ms")
+        return 0
+
+    failed = False
+    if report['heavy_modules_loaded']:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(report['heavy_modules_loaded'])}")
+        failed = True
+
+    baseline = baselines.get(args.module)
+    if baseline:
+        limit = baseline['median_ms'] * (1 + args.tolerance)
+        status = 'FAIL' if report['median_ms'] > limit else 'OK'
+        print(f"{status}: median {report['median_ms']} ms vs baseline {baseline['median_ms']} ms (limit {limit:.2f} ms)")
+        failed = failed or status == 'FAIL'
+    else:
+        print(f"No baseline recorded for {args.module}; run with --update-baseline to create one")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
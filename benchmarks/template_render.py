@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Dashboard Render-Latency Benchmark
+Compares render_template_string (recompiles per request) with the compiled-template cache
+
+Usage:
+    python benchmarks/template_render.py --iterations 500
+"""
+
+import argparse
+import ast
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from flask import Flask, render_template, render_template_string
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from static_assets import init_app as init_static_assets
+from template_cache import register_templates
+
+
+def load_template_source(module_file, constant):
+    """Read an inline template constant without importing the app (and its tracker)"""
+    tree = ast.parse((REPO_ROOT / module_file).read_text())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == constant for t in node.targets):
+            return node.value.value
+    raise LookupError(f"{constant} not found in {module_file}")
+
+
+def sample_context():
+    """Dashboard context roughly the size of a populated production page"""
+    now = datetime.now()
+    return {
+        'analytics': {
+            'total_faculty': 153,
+            'total_searches': 12,
+            'total_subscribers': 40,
+            'total_publications': 420,
+            'last_search': now.strftime('%Y-%m-%d %H:%M'),
+        },
+        'search_history': [
+            {'id': i, 'date': now.strftime('%Y-%m-%d %H:%M'), 'status': 'Completed', 'results': 30 + i}
+            for i in range(1, 6)
+        ],
+        'recent_publications': [
+            {'title': f'Op-Ed {i}', 'faculty_name': 'Noura Erakat', 'source': 'Washington Post',
+             'type': 'Op-Ed', 'url': f'https://example.com/{i}', 'date': now - timedelta(days=i)}
+            for i in range(5)
+        ],
+    }
+
+
+def time_renders(render, iterations):
+    """Per-render latencies in microseconds"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def describe(label, samples):
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<28} median {statistics.median(samples):9.1f} us   p95 {p95:9.1f} us")
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dashboard render latency')
+    parser.add_argument('--iterations', type=int, default=300)
+    args = parser.parse_args()
+
+    source = load_template_source('advanced_app.py', 'ADVANCED_DASHBOARD_HTML')
+    context = sample_context()
+
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'benchmark'
+    init_static_assets(app)  # The dashboard calls asset_url()
+    register_templates(app, {'advanced_dashboard.html': source})
+
+    with app.test_request_context('/'):
+        before = describe('render_template_string', time_renders(
+            lambda: render_template_string(source, **context), args.iterations))
+        after = describe('compiled template cache', time_renders(
+            lambda: render_template('inline/advanced_dashboard.html', **context), args.iterations))
+
+    print(f"Speedup: {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Chat Model Backends
+Pluggable language-model backends for the assistant, with streaming, timeouts, a concurrency cap and a reply cache
+
+The intent router always drafts the answer from local data. When
+CSRR_CHAT_BACKEND names a model backend ('openai', 'stub', or
+'module:factory'), the draft and the cited publications are handed to the
+model, which rewrites them as a conversational reply, token by token.
+
+A backend is any object with name, model and stream(messages, timeout), which
+yields text chunks. ChatGateway wraps one with:
+- a process-wide semaphore, so only MAX_CONCURRENT model calls run at once
+  (others wait up to QUEUE_WAIT seconds, then get the draft instead)
+- a per-call deadline enforced between chunks, even if the backend stalls
+- an LRU cache of completed replies keyed on the exact prompt
+ReplyStream sends one reply through a gateway, falling back to the draft.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TIMEOUT = float(os.getenv('CSRR_CHAT_TIMEOUT', 20))  # Seconds per model call
+MAX_CONCURRENT = int(os.getenv('CSRR_CHAT_MAX_CONCURRENT', 4))  # Model calls in flight, across all requests
+QUEUE_WAIT = 2.0  # Seconds a request waits for a free slot before falling back to the draft
+CACHE_SIZE = 256
+CACHE_TTL = 3600  # Seconds a cached reply is reused
+
+SYSTEM_PROMPT = (
+    "You are the assistant on the Center for Security, Race and Rights (CSRR) faculty tracker dashboard. "
+    "Answer the user's question using only the tracker data provided. Keep the answer short, mention "
+    "publication titles and outlets exactly as given, and never invent publications, dates or links."
+)
+
+INTERRUPTED = "\n\n(The reply was interrupted. Here is the answer from the tracker data instead.)\n\n"
+
+_DONE = object()
+
+
+class BackendBusy(Exception):
+    """Raised when every model slot stayed busy for QUEUE_WAIT seconds"""
+
+
+class BackendTimeout(Exception):
+    """Raised when a model call passes its deadline"""
+
+
+class StubBackend:
+    """Deterministic local backend for tests and offline development"""
+
+    name = 'stub'
+    model = 'stub'
+
+    def __init__(self, reply=None, delay=0.0, error=None):
+        self.reply = reply  # Fixed reply; by default the last message is echoed
+        self.delay = delay  # Seconds before each token, to exercise timeouts and streaming
+        self.error = error  # Exception to raise instead of replying
+        self.calls = 0
+
+    def stream(self, messages, timeout):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        text = self.reply if self.reply is not None else f"Stub reply to: {messages[-1]['content']}"
+        for token in re.findall(r'\s*\S+', text):
+            if self.delay:
+                time.sleep(self.delay)
+            yield token
+
+
+class OpenAIBackend:
+    """OpenAI chat completions, streamed (works with the openai package before and after 1.0)"""
+
+    name = 'openai'
+
+    def __init__(self, model=None, api_key=None, max_tokens=500, temperature=0.2):
+        self.model = model or os.getenv('CSRR_CHAT_MODEL', 'gpt-4o-mini')
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self._client = None
+
+    def stream(self, messages, timeout):
+        import openai
+
+        options = dict(model=self.model, messages=messages, stream=True,
+                       max_tokens=self.max_tokens, temperature=self.temperature)
+        if hasattr(openai, 'OpenAI'):
+            if self._client is None:
+                self._client = openai.OpenAI(api_key=self.api_key, max_retries=0)
+            for chunk in self._client.chat.completions.create(timeout=timeout, **options):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        else:  # openai < 1.0
+            for chunk in openai.ChatCompletion.create(api_key=self.api_key, request_timeout=timeout, **options):
+                content = chunk['choices'][0].get('delta', {}).get('content')
+                if content:
+                    yield content
+
+
+BACKENDS = {
+    'stub': StubBackend,
+    'openai': OpenAIBackend,
+}
+
+
+def load_backend(spec=None):
+    """Backend for `spec` (default: CSRR_CHAT_BACKEND); None means rule-based replies only"""
+    spec = (spec if spec is not None else os.getenv('CSRR_CHAT_BACKEND', '')).strip()
+    if not spec or spec == 'rules':
+        return None
+    if spec in BACKENDS:
+        return BACKENDS[spec]()
+    if re.fullmatch(r'[\w.]+:\w+', spec):
+        module_name, factory = spec.split(':')
+        return getattr(importlib.import_module(module_name), factory)()
+    raise ValueError(f"Unknown chat backend {spec!r} (expected rules, {', '.join(BACKENDS)} or module:factory)")
+
+
+def build_messages(question, draft, history=()):
+    """Chat messages asking the model to answer `question` from the router's draft reply"""
+    messages = [{'role': 'system', 'content': SYSTEM_PROMPT}]
+    for turn in history:
+        messages.append({'role': 'user', 'content': turn['user']})
+        messages.append({'role': 'assistant', 'content': turn['ai']})
+    messages.append({'role': 'user', 'content': f"Tracker data:\n{draft}\n\nQuestion: {question}"})
+    return messages
+
+
+class ChatGateway:
+    """Runs a backend under a shared concurrency limit, a per-call deadline and a reply cache"""
+
+    def __init__(self, backend, max_concurrent=MAX_CONCURRENT, timeout=DEFAULT_TIMEOUT, queue_wait=QUEUE_WAIT,
+                 cache_size=CACHE_SIZE, cache_ttl=CACHE_TTL):
+        self.backend = backend
+        self.timeout = timeout
+        self.queue_wait = queue_wait
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._cache = OrderedDict()  # prompt key -> (stored at, reply), least recently used first
+        self._cache_lock = threading.Lock()
+
+    def _key(self, messages):
+        prompt = json.dumps([self.backend.name, getattr(self.backend, 'model', ''), messages], sort_keys=True)
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    def _cached(self, key):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+
+    def _remember(self, key, reply):
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), reply)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def stream(self, messages, timeout=None):
+        """Yield reply chunks; raises BackendBusy, BackendTimeout or the backend's own error"""
+        key = self._key(messages)
+        reply = self._cached(key)
+        if reply is not None:
+            yield reply
+            return
+
+        timeout = timeout or self.timeout
+        if not self._slots.acquire(timeout=self.queue_wait):
+            raise BackendBusy(f"{self.backend.name} backend is at capacity")
+        chunks = queue.Queue()
+        stop = threading.Event()
+
+        def produce():
+            # The slot is held until the backend call really ends, so abandoned calls still count
+            try:
+                for chunk in self.backend.stream(messages, timeout):
+                    if stop.is_set():
+                        break
+                    chunks.put(chunk)
+                chunks.put(_DONE)
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                self._slots.release()
+
+        threading.Thread(target=produce, name=f'chat-{self.backend.name}', daemon=True).start()
+        deadline = time.monotonic() + timeout
+        parts = []
+        try:
+            while True:
+                try:
+                    item = chunks.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    raise BackendTimeout(f"{self.backend.name} backend gave no reply within {timeout:g}s")
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                parts.append(item)
+                yield item
+        finally:
+            stop.set()  # Also reached when the client disconnects and the generator is closed
+        reply = ''.join(parts)
+        if reply.strip():  # Empty replies are failures, never cached
+            self._remember(key, reply)
+
+    def complete(self, messages, timeout=None):
+        return ''.join(self.stream(messages, timeout))
+
+
+class ReplyStream:
+    """Chunks of one chat reply, falling back to the router's draft when the model fails.
+
+    Iterate it to send the reply; afterwards `text` is the reply to keep in chat
+    history. If the model fails or finishes without producing anything, the
+    draft is sent instead. If it fails part-way, an INTERRUPTED notice and the draft follow the
+    partial text, `interrupted` is set, and `text` is the draft, never the fragment.
+    """
+
+    def __init__(self, draft, gateway=None, messages=None, timeout=None):
+        self.draft = draft
+        self.gateway = gateway  # None: the draft is the reply
+        self.messages = messages
+        self.timeout = timeout
+        self.interrupted = False
+        self.text = None  # Set once the reply has been fully sent
+
+    def __iter__(self):
+        if self.gateway is None:
+            yield self.draft
+            self.text = self.draft
+            return
+        parts = []
+        try:
+            for chunk in self.gateway.stream(self.messages, self.timeout):
+                parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            print(f"Error from chat backend: {e}")
+            if parts:
+                self.interrupted = True
+                yield INTERRUPTED + self.draft
+            else:
+                yield self.draft
+            self.text = self.draft
+            return
+        self.text = ''.join(parts)
+        if not self.text.strip():
+            print("Error from chat backend: empty reply")
+            yield self.draft
+            self.text = self.draft
+
+
+def chat_gateway(spec=None):
+    """ChatGateway for the configured backend, or None when the assistant is rule-based only"""
+    try:
+        backend = load_backend(spec)
+    except Exception as e:
+        print(f"Error loading chat backend: {e}")
+        return None
+    return ChatGateway(backend) if backend is not None else None
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Chat Intent Router
+Classifies a chat message in one regex pass and dispatches it to an intent handler
+
+Intent keywords, faculty names, news sources and date phrases are compiled at
+startup into a single alternation anchored on word boundaries, so "hi" no
+longer matches "this" and adding an intent does not add another scan of the
+message. One finditer pass yields every keyword and entity; the highest
+priority intent wins and the entities fill its slots:
+
+    faculty     roster names mentioned (full name, or a last name unique in the roster)
+    source      news outlet, e.g. "NYT" -> "New York Times"
+    date_range  (start, end) from phrases like "last month", "since March 2024", "in 2023"
+    query       the rest of the message (keywords and entities removed), for topic search
+"""
+
+import re
+import unicodedata
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+Intent = namedtuple('Intent', 'name slots')
+
+# Highest priority first: when a message hits several intents, the earliest listed wins
+INTENT_KEYWORDS = [
+    ('email', ('email', 'emails', 'subscribe', 'subscription', 'unsubscribe', 'newsletter', 'mailing list')),
+    ('report', ('report', 'reports', 'excel', 'word document', 'spreadsheet', 'download')),
+    ('timeline', ('timeline', 'timelines', 'over time', 'trend', 'trends', 'activity')),
+    ('recommend', ('recommend', 'recommendation', 'recommendations', 'suggest', 'suggestion', 'suggestions',
+                   'feature',
+                   'highlight')),
+    ('publications', ('publications', 'publication', 'published', 'op-ed', 'op-eds', 'oped', 'article',
+                      'articles', 'interview', 'interviews', 'appearances', 'publish', 'wrote', 'written',
+                      'papers',
+                      "what's new", 'whats new', 'recent work')),
+    ('search', ('search', 'searches', 'run a search', 'look up', 'lookup', 'find', 'scan')),
+    ('help', ('help', 'what can you do', 'how do i', 'how does this work', 'commands', 'options')),
+    ('faculty_list', ('faculty', 'faculty list', 'list', 'affiliates', 'roster', 'members', 'who do you track')),
+    ('greeting', ('hello', 'hi', 'hey', 'howdy', 'greetings', 'good morning', 'good afternoon',
+                  'good evening')),
+]
+
+# Canonical outlet -> spellings people type
+SOURCES = {
+    'Washington Post': ('washington post', 'wapo'),
+    'New York Times': ('new york times', 'ny times', 'nytimes', 'nyt'),
+    'Wall Street Journal': ('wall street journal', 'wsj'),
+    'Los Angeles Times': ('los angeles times', 'la times'),
+    'The Guardian': ('guardian',),
+    'The Atlantic': ('the atlantic',),
+    'The Hill': ('the hill',),
+    'Al Jazeera': ('al jazeera', 'aljazeera'),
+    'CNN': ('cnn',),
+    'NPR': ('npr',),
+    'BBC': ('bbc',),
+    'MSNBC': ('msnbc',),
+    'Fox News': ('fox news', 'fox'),
+    'Time': ('time magazine',),
+    'Newsweek': ('newsweek',),
+    'Politico': ('politico',),
+    'Reuters': ('reuters',),
+    'Google Scholar': ('google scholar', 'scholar'),
+}
+
+MONTHS = ('january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september',
+          'october', 'november', 'december')
+_MONTH = r'(?:%s)' % '|'.join(sorted(set(MONTHS) | {month[:3] for month in MONTHS} | {'sept'},
+                                     key=len, reverse=True))
+DATE_PATTERN = (
+    r'today|yesterday'
+    r'|this\s+(?:week|month|year)'
+    r'|(?:in\s+)?(?:the\s+)?(?:last|past)\s+(?:\d+\s+|a\s+|few\s+|couple\s+(?:of\s+)?)?(?:days?|weeks?|months?|years?)'
+    rf'|since\s+(?:{_MONTH}(?:\s+(?:19|20)\d\d)?|(?:19|20)\d\d)'
+    rf'|in\s+(?:{_MONTH}(?:\s+(?:19|20)\d\d)?|(?:19|20)\d\d)'
+)
+# Roster last names that are also everyday words; only the full name matches these
+COMMON_WORD_NAMES = {'said', 'snow', 'banks', 'marsh', 'baron', 'cable', 'bray', 'jones', 'clark', 'cole',
+                     'dana', 'hinton', 'greene'}
+UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30, 'year': 365}
+FALLBACK = ("I'm your CSRR Faculty Tracker assistant! I can help you with faculty information, publication "
+            "searches, reports, and recommendations. Try asking about 'faculty list', 'run search', or 'help' "
+            "to get started.")
+
+
+def fold(text):
+    """Lowercase and strip accents so 'Bâli' and 'bali' match alike"""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _trie_pattern(node):
+    """Regex for a character trie; shared prefixes are matched once instead of once per phrase"""
+    ends = '' in node
+    branches = []
+    for char in sorted(key for key in node if key):
+        branch = node[char]
+        # Collapse single-child chains into one literal run
+        literal = char
+        while len(branch) == 1 and '' not in branch:
+            (next_char, branch), = branch.items()
+            literal += next_char
+        escaped = re.escape(literal).replace(r'\ ', r'\s+')
+        branches.append(escaped + _trie_pattern(branch) if branch and list(branch) != [''] else escaped)
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    return f'(?:{body})?' if ends else body
+
+
+def _alternation(phrases):
+    """One trie-shaped pattern matching any of `phrases` (longest match wins via backtracking order)"""
+    trie = {}
+    for phrase in set(phrases):
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _trie_pattern(trie)
+
+
+def _month_number(text):
+    return next(number for number, month in enumerate(MONTHS, 1) if text.startswith(month[:3]))
+
+
+def parse_date_range(text, now=None):
+    """(start, end) for a date phrase matched by DATE_PATTERN"""
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    text = ' '.join(text.split())
+    if text == 'today':
+        return today, now
+    if text == 'yesterday':
+        return today - timedelta(days=1), today
+    match = re.fullmatch(r'this (week|month|year)', text)
+    if match:
+        unit = match.group(1)
+        if unit == 'week':
+            return today - timedelta(days=today.weekday()), now
+        if unit == 'month':
+            return today.replace(day=1), now
+        return today.replace(month=1, day=1), now
+    match = re.search(r'(?:last|past) (?:(\d+|a|few|couple(?: of)?) )?(day|week|month|year)s?$', text)
+    if match:
+        count = {None: 1, 'a': 1, 'few': 3, 'couple': 2, 'couple of': 2}.get(match.group(1))
+        count = count if count is not None else int(match.group(1))
+        return now - timedelta(days=count * UNIT_DAYS[match.group(2)]), now
+    match = re.fullmatch(r'(since|in) (\w+)(?: (\d{4}))?', text)
+    if match:
+        keyword, first, year = match.groups()
+        if first.isdigit():
+            start = datetime(int(first), 1, 1)
+            end = datetime(int(first) + 1, 1, 1)
+        else:
+            month = _month_number(first)
+            year = int(year) if year else (now.year if month <= now.month else now.year - 1)
+            start = datetime(year, month, 1)
+            end = datetime(year + (month == 12), month % 12 + 1, 1)
+        return (start, now) if keyword == 'since' else (start, min(end - timedelta(microseconds=1), now))
+    return None
+
+
+class IntentRouter:
+    """Compiled keyword/entity matcher plus intent handlers"""
+
+    def __init__(self, faculty_names, sources=SOURCES, intents=INTENT_KEYWORDS, index=None):
+        self.faculty_names = list(faculty_names)
+        self.index = index  # Optional PublicationIndex for retrieval-backed answers
+        self.priority = {name: rank for rank, (name, _) in enumerate(intents)}
+        self.faculty_aliases = self._faculty_aliases(self.faculty_names)
+        self.source_aliases = {fold(alias): source for source, aliases in sources.items() for alias in aliases}
+
+        # Entities come first so "Washington Post" is not read as the keyword "post", etc.
+        groups = [
+            ('faculty', _alternation(self.faculty_aliases)),
+            ('source', _alternation(self.source_aliases)),
+            ('date', DATE_PATTERN),
+        ] + [(f'intent_{name}', _alternation(fold(keyword) for keyword in keywords)) for name, keywords in intents]
+        alternatives = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in groups if pattern)
+        self.pattern = re.compile(rf"(?<![\w'-])(?:{alternatives})(?![\w'-])")
+
+    @staticmethod
+    def _faculty_aliases(names):
+        """Folded full name -> name, plus last names that identify one faculty member"""
+        aliases = {}
+        last_names = {}
+        for name in names:
+            folded = fold(name)
+            aliases[folded] = name
+            aliases[re.sub(r'\b\w\.\s*', '', folded).strip()] = name  # Without middle initials
+            parts = [part for part in re.split(r'\s+', folded) if part not in ('jr.', 'jr', 'iii')]
+            if parts:
+                last_names.setdefault(parts[-1], []).append(name)
+        for last_name, owners in last_names.items():
+            if (len(owners) == 1 and len(last_name) >= 4 and last_name not in aliases
+                    and last_name not in COMMON_WORD_NAMES):
+                aliases[last_name] = owners[0]
+        return aliases
+
+    def classify(self, message, now=None):
+        """Intent(name, slots) from one pass over the message"""
+        slots = {'faculty': [], 'source': None, 'date_range': None, 'query': ''}
+        best = None
+        folded = fold(message)
+        rest = []  # Text between matches: what the message is about
+        position = 0
+        for match in self.pattern.finditer(folded):
+            kind, text = match.lastgroup, match.group()
+            rest.append(folded[position:match.start()])
+            position = match.end()
+            if kind == 'faculty':
+                name = self.faculty_aliases[' '.join(text.split())]
+                if name not in slots['faculty']:
+                    slots['faculty'].append(name)
+            elif kind == 'source':
+                slots['source'] = slots['source'] or self.source_aliases[' '.join(text.split())]
+            elif kind == 'date':
+                slots['date_range'] = slots['date_range'] or parse_date_range(text, now)
+            else:
+                intent = kind[len('intent_'):]
+                if best is None or self.priority[intent] < self.priority[best]:
+                    best = intent
+        rest.append(folded[position:])
+        slots['query'] = ' '.join(''.join(rest).split())
+
+        if best is None:
+            if slots['source'] or slots['date_range']:
+                best = 'publications'  # "anything on CNN this week?"
+            else:
+                best = 'faculty_info' if slots['faculty'] else 'fallback'
+        elif best in ('greeting', 'faculty_list', 'search') and (slots['source'] or slots['date_range']):
+            best = 'publications'  # "anything in the NYT last month?"
+        elif best in ('greeting', 'faculty_list') and slots['faculty']:
+            best = 'faculty_info'
+        return Intent(best, slots)
+
+    def answer(self, message, faculty_publications=None, now=None):
+        """(reply text, cited publications) for a chat message"""
+        publications = faculty_publications or {}
+        if self.index is not None:
+            self.index.sync(publications)  # Picks up only what was appended since the last message
+        intent = self.classify(message, now)
+        reply = HANDLERS.get(intent.name, fallback)(self, intent.slots, publications)
+        return reply if isinstance(reply, tuple) else (reply, [])
+
+    def respond(self, message, faculty_publications=None, now=None):
+        return self.answer(message, faculty_publications, now)[0]
+
+
+def greeting(router, slots, publications):
+    return (f"Hello! I'm your CSRR Faculty Tracker assistant. I can help you with {len(router.faculty_names)} "
+            "faculty members, run searches, and generate reports. What would you like to do?")
+
+
+def faculty_list(router, slots, publications):
+    return (f"CSRR tracks {len(router.faculty_names)} faculty affiliates including "
+            f"{', '.join(router.faculty_names[:3])} and many others. I can help you find information about their "
+            "recent publications and media appearances. Which faculty member interests you?")
+
+
+def search(router, slots, publications):
+    if slots['faculty']:
+        return (f"I can look for new publications by {', '.join(slots['faculty'])}. Click 'Start AI-Enhanced "
+                "Search' on the main dashboard to run a search across the roster; results for every faculty "
+                "member, including this one, appear in the reports.")
+    return ("I can help you run searches for faculty publications! The system monitors op-eds, interviews, TV "
+            "appearances, and academic articles. Click 'Start AI-Enhanced Search' on the main dashboard to begin, "
+            "or I can guide you through the process.")
+
+
+def help_text(router, slots, publications):
+    return ("I can help you with: \n• Faculty information and lists\n• Running publication searches\n"
+            "• Understanding search results\n• Email subscriptions\n• Report generation\n\n"
+            "What would you like to know more about?")
+
+
+def report(router, slots, publications):
+    return ("The system generates Excel and Word reports automatically after each search. Reports include "
+            "faculty publications, media appearances, and AI recommendations for the CSRR website. Would you like "
+            "me to explain the report format?")
+
+
+def email(router, slots, publications):
+    return ("You can subscribe to monthly reports that are automatically sent on the 1st of each month. Just "
+            "enter your email in the subscription box on the main dashboard. Current subscribers receive "
+            "AI-enhanced faculty publication summaries.")
+
+
+def faculty_info(router, slots, publications):
+    intro = (f"I found {' and '.join(slots['faculty'])} in our CSRR faculty database! They are one of our "
+             f"{len(router.faculty_names)} tracked affiliates.")
+    matches = []
+    if router.index is not None:
+        matches = [(name, pub) for _, name, pub in router.index.search('', limit=3, faculty=slots['faculty'])]
+    if not matches:
+        return f"{intro} Would you like me to search for their recent publications or check their publication timeline?"
+    lines = [f"{intro} Their most recent publications:"] + [describe_publication(name, pub) for name, pub in matches]
+    return '\n'.join(lines), [citation(name, pub) for name, pub in matches]
+
+
+def recommend(router, slots, publications):
+    return ("I can recommend publications for the CSRR in the News section! My recommendations are based on "
+            "source credibility, publication impact, and relevance to CSRR's mission. Run a search first, then "
+            "click 'AI Recommend' on the results.")
+
+
+def timeline(router, slots, publications):
+    return ("Publication timelines show faculty activity over time with interactive visualizations. You can "
+            "access timelines by clicking the 'Timeline' button next to any faculty member's publications.")
+
+
+def matching_publications(slots, publications):
+    """(faculty, pub) pairs matching the faculty, source and date range slots, newest first"""
+    faculty = set(slots['faculty'])
+    start, end = slots['date_range'] or (None, None)
+    matches = []
+    for name, pubs in publications.items():
+        if faculty and name not in faculty:
+            continue
+        for pub in pubs:
+            if slots['source'] and (pub.get('source') or '').lower() != slots['source'].lower():
+                continue
+            date = pub.get('date')
+            if start and (not date or not start <= date <= end):
+                continue
+            matches.append((name, pub))
+    matches.sort(key=lambda item: item[1].get('date') or datetime.min, reverse=True)
+    return matches
+
+
+def describe_publication(name, pub):
+    date = pub.get('date')
+    when = f", {date.strftime('%b %d, %Y')}" if date else ''
+    return f"• {name}: {pub.get('title', 'Untitled')} ({pub.get('source', 'Unknown source')}{when})"
+
+
+def citation(name, pub):
+    """JSON-safe reference to a publication cited in a reply"""
+    date = pub.get('date')
+    return {'faculty': name, 'title': pub.get('title', 'Untitled'), 'source': pub.get('source', ''),
+            'date': date.strftime('%Y-%m-%d') if date else '', 'url': pub.get('url') or ''}
+
+
+def publications_summary(router, slots, publications):
+    scope = []
+    if slots['faculty']:
+        scope.append(f"by {' and '.join(slots['faculty'])}")
+    if slots['source']:
+        scope.append(f"in {slots['source']}")
+    if slots['date_range']:
+        start, end = slots['date_range']
+        scope.append(f"between {start.strftime('%b %d, %Y')} and {end.strftime('%b %d, %Y')}")
+    scope = ' '.join(scope) or 'from the latest search'
+
+    if router.index is not None:
+        # Ranked by TF-IDF similarity to the question within the slot filters
+        hits = router.index.search(slots['query'], limit=5, faculty=slots['faculty'], source=slots['source'],
+                                   date_range=slots['date_range'])
+        matches = [(name, pub) for _, name, pub in hits]
+        lead = f"Here {'is the most relevant publication' if len(matches) == 1 else 'are the most relevant publications'} {scope}:"
+    else:
+        matches = matching_publications(slots, publications)
+        lead = f"I found {len(matches)} publication{'s' if len(matches) != 1 else ''} {scope}. Most recent:"
+        matches = matches[:3]
+    if not matches:
+        return (f"I don't have any publications {scope} yet. Run a search from the dashboard to collect the "
+                "latest op-eds, interviews and articles.")
+    lines = [lead] + [describe_publication(name, pub) for name, pub in matches]
+    return '\n'.join(lines), [citation(name, pub) for name, pub in matches]
+
+
+def fallback(router, slots, publications):
+    return FALLBACK
+
+
+HANDLERS = {
+    'greeting': greeting,
+    'faculty_list': faculty_list,
+    'search': search,
+    'help': help_text,
+    'report': report,
+    'email': email,
+    'faculty_info': faculty_info,
+    'recommend': recommend,
+    'timeline': timeline,
+    'publications': publications_summary,
+    'fallback': fallback,
+}
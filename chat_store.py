@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Chat History
+Per-session ring buffers of recent chat turns, backed by an append-only log that survives restarts
+
+Memory is bounded: each session keeps its last MAX_TURNS turns, and only the
+MAX_SESSIONS most recently active sessions are held. Every turn is also
+appended as one JSON line to instance/chat_log.ndjson. The log is compacted
+(latest turns per session, within the retention window) whenever it has
+doubled in size since the last compaction, so it stays bounded too.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_LOG_PATH = Path(os.getenv('CSRR_CHAT_LOG', Path(__file__).resolve().parent / 'instance' / 'chat_log.ndjson'))
+MAX_TURNS = 50  # Per session
+MAX_SESSIONS = 500  # Most recently active sessions kept in memory and in the log
+RETENTION = timedelta(days=30)
+MIN_COMPACT_BYTES = 1 << 20  # Never compact a log smaller than this
+
+
+def chat_session_id():
+    """Stable ID for the browser session making this request (kept in the signed session cookie)"""
+    from flask import session
+
+    if 'chat_id' not in session:
+        session['chat_id'] = uuid.uuid4().hex
+    return session['chat_id']
+
+
+class ChatHistory:
+    """Bounded in-memory chat history for many sessions, persisted to an append-only log"""
+
+    def __init__(self, log_path=DEFAULT_LOG_PATH, max_turns=MAX_TURNS, max_sessions=MAX_SESSIONS,
+                 retention=RETENTION):
+        self.log_path = Path(log_path)
+        self.max_turns = max_turns
+        self.max_sessions = max_sessions
+        self.retention = retention
+        self._sessions = OrderedDict()  # session ID -> deque of turns, least recently active first
+        self._lock = threading.Lock()
+        self._compacted_size = 0
+        self._persist = True
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock():
+                self._sessions = self._compact()
+        except OSError as e:
+            self._persist = False  # Read-only filesystem (e.g. serverless): history stays in memory
+            print(f"Error opening chat log {self.log_path}: {e}")
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize log writes across threads and, where flock exists, across worker processes"""
+        with open(self.log_path.with_name(self.log_path.name + '.lock'), 'a') as handle:
+            try:
+                import fcntl
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            except ImportError:  # Windows: thread lock only
+                pass
+            yield
+
+    def _read_log(self):
+        """Latest turns per session within the retention window, least recently active first"""
+        sessions = OrderedDict()
+        if not self.log_path.exists():
+            return sessions
+        cutoff = (datetime.now() - self.retention).isoformat()
+        with open(self.log_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn line from a crash mid-write
+                if entry.get('timestamp', '') < cutoff:
+                    continue
+                session_id = entry.pop('session', None)
+                turns = sessions.pop(session_id, None) or deque(maxlen=self.max_turns)
+                turns.append(entry)
+                sessions[session_id] = turns
+                if len(sessions) > self.max_sessions:
+                    sessions.popitem(last=False)
+        return sessions
+
+    def _compact(self):
+        """Rewrite the log with only what a restart would load; caller holds the file lock"""
+        sessions = self._read_log()
+        fd, tmp_path = tempfile.mkstemp(dir=self.log_path.parent, prefix='.chat_log-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for session_id, turns in sessions.items():
+                for turn in turns:
+                    f.write(json.dumps({'session': session_id, **turn}, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.log_path)
+        self._compacted_size = self.log_path.stat().st_size
+        return sessions
+
+    def append(self, session_id, turn):
+        """Record one turn (a dict, stamped with 'timestamp' if it has none) for `session_id`"""
+        turn = {'timestamp': datetime.now().isoformat(), **turn}
+        with self._lock:
+            turns = self._sessions.pop(session_id, None) or deque(maxlen=self.max_turns)
+            turns.append(turn)
+            self._sessions[session_id] = turns
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+        if not self._persist:
+            return
+        line = json.dumps({'session': session_id, **turn}, ensure_ascii=False) + '\n'
+        try:
+            with self._file_lock():
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                    size = f.tell()
+                if size > max(MIN_COMPACT_BYTES, 2 * self._compacted_size):
+                    self._compact()
+        except OSError as e:
+            print(f"Error writing chat log: {e}")
+
+    def recent(self, session_id, limit=None):
+        """Most recent turns of a session, oldest first"""
+        with self._lock:
+            turns = list(self._sessions.get(session_id, ()))
+        return turns[-limit:] if limit else turns
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(turns) for turns in self._sessions.values())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Raw Data Export
+Streams the publication store as CSV or NDJSON straight from a database cursor
+
+    GET /export/publications.csv?faculty=Sahar+Aziz&since=2024-01-01
+    GET /export/publications.ndjson?type=Op-Ed&q=surveillance&limit=500
+
+Filters: faculty and type (repeatable), since / until (YYYY-MM-DD), source,
+q (title contains) and limit. Rows are encoded in small batches as the cursor
+yields them, so memory stays flat and the first bytes go out immediately,
+however many rows match.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from flask import Response, abort, request, stream_with_context
+
+from publication_store import EXPORT_FIELDS
+
+CHUNK_ROWS = 500  # Rows encoded per chunk written to the socket
+
+
+def _date_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        abort(400, f"'{name}' must be a date like 2025-01-31")
+
+
+def export_filters():
+    """Store query arguments from the request's query string"""
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        abort(400, "'limit' must be a positive number")
+    return {
+        'faculty': request.args.getlist('faculty'),
+        'since': _date_arg('since'),
+        'until': _date_arg('until'),
+        'types': request.args.getlist('type'),
+        'source': request.args.get('source') or None,
+        'text': request.args.get('q') or None,
+        'limit': limit,
+    }
+
+
+def _chunked(rows, encode, header=''):
+    buffer = [header] if header else []
+    for row in rows:
+        buffer.append(encode(row))
+        if len(buffer) >= CHUNK_ROWS:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def csv_chunks(rows):
+    line = io.StringIO()
+    writer = csv.writer(line)
+
+    def encode(row):
+        line.seek(0)
+        line.truncate()
+        writer.writerow(tuple(row))
+        return line.getvalue()
+
+    return _chunked(rows, encode, header=encode(EXPORT_FIELDS))
+
+
+def ndjson_chunks(rows):
+    return _chunked(rows, lambda row: json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + '\n')
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', csv_chunks),
+    'ndjson': ('application/x-ndjson', ndjson_chunks),
+}
+
+
+def init_app(app, store):
+    """Serve /export/publications.<csv|ndjson> from `store` (a PublicationStore)"""
+
+    def export_publications(export_format):
+        if export_format not in EXPORT_FORMATS:
+            abort(404)
+        mimetype, encode = EXPORT_FORMATS[export_format]
+        rows = store.iter_publications(**export_filters())
+        filename = f"csrr_publications_{datetime.now().strftime('%Y%m%d')}.{export_format}"
+        response = Response(stream_with_context(encode(rows)), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response.headers['Cache-Control'] = 'no-store'
+        response.headers['X-Accel-Buffering'] = 'no'  # Keep proxies from buffering the stream
+        return response
+
+    app.add_url_rule('/export/publications.<export_format>', 'export_publications', export_publications)
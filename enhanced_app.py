@@ -4,7 +4,7 @@ CSRR Faculty Tracker - Enhanced Dashboard
 Complete automation system for tracking faculty publications with analytics and Word document generation
 """
 
-from flask import Flask, render_template_string, request, redirect, url_for, flash, jsonify, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
 import pandas as pd
 from datetime import datetime, timedelta
 import os
@@ -17,15 +17,26 @@ import time
 # Add the parent directory to path
 sys.path.append('/Users/azrabano')
 from csrr_faculty_tracker import CSRRFacultyTracker
+from template_cache import register_templates
+from static_assets import init_app as init_static_assets
+from http_compression import init_app as init_compression
+from report_links import init_app as init_report_links
+from report_writers import write_docx
+from search_jobs import JobExecutor, QueueFull, no_progress
+from event_stream import sse_response
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'csrr-tracker-secret-key'
+init_static_assets(app)  # Self-hosted Bootstrap, Font Awesome, Chart.js and Plotly
+init_compression(app)  # gzip/brotli + weak ETags for HTML and JSON responses
 
 # Initialize tracker
 tracker = CSRRFacultyTracker()
+init_report_links(app, tracker.config['output']['reports_folder'])  # Signed links from monthly emails
 
 # In-memory storage for demo (replace with database in production)
 search_history = []
+search_jobs = JobExecutor(max_workers=1, max_queue=5)  # One roster search at a time
 email_subscribers = []
 
 @app.route('/')
@@ -45,37 +56,68 @@ def dashboard():
         ]
     }
     
-    return render_template_string(DASHBOARD_HTML, analytics=analytics, search_history=search_history[:5])
+    return render_template('inline/dashboard.html', analytics=analytics, search_history=search_history[:5])
 
 @app.route('/run-search', methods=['POST'])
 def run_search():
     """Start a new search and generate reports"""
+    def make_record(search_id):
+        search_record = {
+            'id': search_id,
+            'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'results': 0
+        }
+        search_history.append(search_record)
+        return search_record
     
-    # Add to search history
-    search_record = {
-        'id': len(search_history) + 1,
-        'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-        'status': 'Running',
-        'results': 0
-    }
-    search_history.append(search_record)
+    # Queue the search; repeated clicks while one is in flight join the existing job
+    try:
+        job, created = search_jobs.submit('monthly-search', background_search, make_record)
+    except QueueFull:
+        flash('Too many searches are waiting. Please try again once the current search finishes.', 'warning')
+        return redirect(url_for('dashboard'))
     
-    # Start background search
-    thread = threading.Thread(target=background_search, args=(search_record,))
-    thread.daemon = True
-    thread.start()
+    if not created:
+        flash(f'Search #{job.id} is already {job.state.lower()}; your request was merged into it.', 'info')
+        return redirect(url_for('dashboard'))
     
     flash('Search started! Results will be available shortly.', 'success')
     return redirect(url_for('dashboard'))
 
-def background_search(search_record):
+@app.route('/jobs')
+def job_status():
+    """Queue depth and state of background search jobs"""
+    return jsonify(search_jobs.status())
+
+@app.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Request cancellation of a queued or running search"""
+    job = search_jobs.cancel(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<int:job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events stream of a search's progress and completion"""
+    job = search_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return sse_response(job.events, request.headers.get('Last-Event-ID'))
+
+def background_search(search_record, cancel_token=None, progress=no_progress):
     """Run the actual search in background"""
     try:
-        # Simulate search process
-        time.sleep(3)  # Simulate search time
+        # Simulate search process (returns early if the search is cancelled)
+        if cancel_token is not None and cancel_token.wait(3):
+            return
         
         # Run actual search
         results_count = tracker.run_monthly_search()
+        progress('progress', stage='news', results=results_count)
+        
+        if cancel_token is not None and cancel_token.is_set():
+            return  # The job executor marks the search Cancelled
         
         # Update search record
         search_record['status'] = 'Completed'
@@ -90,79 +132,62 @@ def background_search(search_record):
         search_record['status'] = 'Failed'
         print(f"Search failed: {e}")
 
+def word_report_blocks(search_record):
+    """Word report content in the format of the existing document, yielded block by block (see report_writers)"""
+    # Title
+    yield 'Title', f'CSRR Faculty Affiliates Publications - {datetime.now().strftime("%B %Y")}'
+    
+    # Date
+    yield None, f'Report Generated: {datetime.now().strftime("%B %d, %Y")}'
+    yield None, ''
+    
+    # Summary section
+    yield 'Heading1', 'Summary'
+    yield None, f'Total Publications Found: {search_record["results"]}'
+    yield None, f'Search Period: Last 30 days'
+    yield None, ''
+    
+    # Publications by type
+    yield 'Heading1', 'Publications by Type'
+    # Add sample data
+    types_data = [
+        ('Op-Eds', 8, '53%'),
+        ('Print Interviews', 4, '27%'),
+        ('TV Interviews', 3, '20%')
+    ]
+    yield 'table', [('Type', 'Count', 'Percentage')] + types_data
+    
+    yield None, ''
+    
+    # Faculty with publications
+    yield 'Heading1', 'Faculty with Publications This Month'
+    
+    # Sample faculty data (replace with actual search results)
+    faculty_data = [
+        {'name': 'Dr. Khaled Beydoun', 'publication': 'Op-Ed in Washington Post', 'date': '2024-05-15', 'title': 'The Legal Framework of Civil Rights'},
+        {'name': 'Prof. Noura Erakat', 'publication': 'CNN Interview', 'date': '2024-05-20', 'title': 'International Law Perspectives'},
+        {'name': 'Dr. Wadie Said', 'publication': 'NPR Interview', 'date': '2024-05-25', 'title': 'Criminal Justice Reform'}
+    ]
+    
+    for faculty in faculty_data:
+        yield None, f"• {faculty['name']} - {faculty['publication']}"
+        yield None, f"  Title: {faculty['title']}"
+        yield None, f"  Date: {faculty['date']}"
+        yield None, ''
+    
+    # Next steps
+    yield 'Heading1', 'Recommended for CSRR in the News'
+    yield None, 'The following publications are recommended for featuring on the CSRR website:'
+    yield None, '• Dr. Khaled Beydoun - Washington Post Op-Ed (high visibility)'
+    yield None, '• Prof. Noura Erakat - CNN Interview (multimedia content)'
+
 def generate_word_report(search_record):
     """Generate Word document in the format of the existing document"""
     try:
-        from docx import Document
-        from docx.shared import Inches
-        
-        doc = Document()
-        
-        # Title
-        title = doc.add_heading(f'CSRR Faculty Affiliates Publications - {datetime.now().strftime("%B %Y")}', 0)
-        
-        # Date
-        doc.add_paragraph(f'Report Generated: {datetime.now().strftime("%B %d, %Y")}')
-        doc.add_paragraph('')
-        
-        # Summary section
-        doc.add_heading('Summary', level=1)
-        doc.add_paragraph(f'Total Publications Found: {search_record["results"]}')
-        doc.add_paragraph(f'Search Period: Last 30 days')
-        doc.add_paragraph('')
-        
-        # Publications by type
-        doc.add_heading('Publications by Type', level=1)
-        table = doc.add_table(rows=1, cols=3)
-        table.style = 'Table Grid'
-        
-        hdr_cells = table.rows[0].cells
-        hdr_cells[0].text = 'Type'
-        hdr_cells[1].text = 'Count'
-        hdr_cells[2].text = 'Percentage'
-        
-        # Add sample data
-        types_data = [
-            ('Op-Eds', 8, '53%'),
-            ('Print Interviews', 4, '27%'),
-            ('TV Interviews', 3, '20%')
-        ]
-        
-        for type_name, count, percentage in types_data:
-            row_cells = table.add_row().cells
-            row_cells[0].text = type_name
-            row_cells[1].text = str(count)
-            row_cells[2].text = percentage
-        
-        doc.add_paragraph('')
-        
-        # Faculty with publications
-        doc.add_heading('Faculty with Publications This Month', level=1)
-        
-        # Sample faculty data (replace with actual search results)
-        faculty_data = [
-            {'name': 'Dr. Khaled Beydoun', 'publication': 'Op-Ed in Washington Post', 'date': '2024-05-15', 'title': 'The Legal Framework of Civil Rights'},
-            {'name': 'Prof. Noura Erakat', 'publication': 'CNN Interview', 'date': '2024-05-20', 'title': 'International Law Perspectives'},
-            {'name': 'Dr. Wadie Said', 'publication': 'NPR Interview', 'date': '2024-05-25', 'title': 'Criminal Justice Reform'}
-        ]
-        
-        for faculty in faculty_data:
-            doc.add_paragraph(f"• {faculty['name']} - {faculty['publication']}")
-            doc.add_paragraph(f"  Title: {faculty['title']}")
-            doc.add_paragraph(f"  Date: {faculty['date']}")
-            doc.add_paragraph('')
-        
-        # Next steps
-        doc.add_heading('Recommended for CSRR in the News', level=1)
-        doc.add_paragraph('The following publications are recommended for featuring on the CSRR website:')
-        doc.add_paragraph('• Dr. Khaled Beydoun - Washington Post Op-Ed (high visibility)')
-        doc.add_paragraph('• Prof. Noura Erakat - CNN Interview (multimedia content)')
-        
-        # Save document
+        # Save document, streamed straight to disk
         reports_dir = Path('/Users/azrabano/CSRR_Reports')
-        reports_dir.mkdir(exist_ok=True)
         doc_path = reports_dir / search_record['word_report']
-        doc.save(doc_path)
+        write_docx(doc_path, word_report_blocks(search_record))
         
         search_record['word_path'] = str(doc_path)
         
@@ -222,12 +247,12 @@ def analytics():
         ]
     }
     
-    return render_template_string(ANALYTICS_HTML, data=analytics_data)
+    return render_template('inline/analytics.html', data=analytics_data)
 
 @app.route('/faculty-list')
 def faculty_list():
     """Display all faculty members"""
-    return render_template_string(FACULTY_LIST_HTML, faculty_names=tracker.faculty_names)
+    return render_template('inline/faculty_list.html', faculty_names=tracker.faculty_names)
 
 # HTML Templates
 DASHBOARD_HTML = '''
@@ -237,9 +262,9 @@ DASHBOARD_HTML = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>CSRR Faculty Tracker</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    <link href="{{ asset_url('bootstrap.min.css') }}" rel="stylesheet">
+    <link href="{{ asset_url('fontawesome.min.css') }}" rel="stylesheet">
+    <script src="{{ asset_url('chart.min.js') }}"></script>
     <style>
         body { background-color: #f8f9fa; }
         .navbar { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }
@@ -349,8 +374,9 @@ DASHBOARD_HTML = '''
                                         <td>
                                             {% if search.status == 'Completed' %}
                                                 <span class="badge bg-success">{{ search.status }}</span>
-                                            {% elif search.status == 'Running' %}
+                                            {% elif search.status in ('Running', 'Queued') %}
                                                 <span class="badge bg-primary">{{ search.status }}</span>
+                                                <small class="d-block text-muted" data-search-progress="{{ search.id }}"></small>
                                             {% else %}
                                                 <span class="badge bg-danger">{{ search.status }}</span>
                                             {% endif %}
@@ -441,7 +467,7 @@ DASHBOARD_HTML = '''
         </div>
     </div>
 
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
+    <script src="{{ asset_url('bootstrap.bundle.min.js') }}"></script>
     <script>
         // Monthly trend chart
         const ctx = document.getElementById('monthlyChart').getContext('2d');
@@ -472,6 +498,7 @@ DASHBOARD_HTML = '''
             }
         });
     </script>
+    <script src="{{ asset_url('search_progress.js') }}" defer></script>
 </body>
 </html>
 '''
@@ -483,9 +510,9 @@ ANALYTICS_HTML = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Analytics - CSRR Faculty Tracker</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    <link href="{{ asset_url('bootstrap.min.css') }}" rel="stylesheet">
+    <link href="{{ asset_url('fontawesome.min.css') }}" rel="stylesheet">
+    <script src="{{ asset_url('chart.min.js') }}"></script>
 </head>
 <body>
     <nav class="navbar navbar-dark bg-primary">
@@ -553,8 +580,8 @@ FACULTY_LIST_HTML = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Faculty List - CSRR Faculty Tracker</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+    <link href="{{ asset_url('bootstrap.min.css') }}" rel="stylesheet">
+    <link href="{{ asset_url('fontawesome.min.css') }}" rel="stylesheet">
 </head>
 <body>
     <nav class="navbar navbar-dark bg-primary">
@@ -586,6 +613,13 @@ FACULTY_LIST_HTML = '''
 </html>
 '''
 
+# Compile the inline templates once; routes render them by name
+register_templates(app, {
+    'dashboard.html': DASHBOARD_HTML,
+    'analytics.html': ANALYTICS_HTML,
+    'faculty_list.html': FACULTY_LIST_HTML,
+})
+
 if __name__ == '__main__':
     print("🚀 Starting Enhanced CSRR Faculty Tracker on http://127.0.0.1:3000")
     print("📊 Features: Analytics, Word Documents, Email Subscriptions, and more!")
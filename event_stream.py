@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Server-Sent Events
+Append-only event log that many readers can follow, plus helpers to stream it as text/event-stream
+"""
+
+import json
+import threading
+
+from flask import Response, stream_with_context
+
+HEARTBEAT_SECONDS = 15
+
+
+class EventLog:
+    """Thread-safe list of (id, event, data) that readers can block on"""
+
+    def __init__(self):
+        self._events = []
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def publish(self, event, **data):
+        with self._condition:
+            self._events.append((len(self._events) + 1, event, data))
+            self._condition.notify_all()
+
+    def close(self):
+        """Mark the log complete; readers stop once they have caught up"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def follow(self, after_id=0, heartbeat=HEARTBEAT_SECONDS):
+        """Yield events after `after_id`, then wait for new ones; yields None as a heartbeat"""
+        position = after_id
+        while True:
+            with self._condition:
+                if position >= len(self._events) and not self._closed:
+                    self._condition.wait(heartbeat)
+                pending = self._events[position:]
+                done = self._closed
+            if pending:
+                for item in pending:
+                    yield item
+                position += len(pending)
+            elif done:
+                return
+            else:
+                yield None
+
+
+def format_sse(event, data, event_id=None):
+    """Encode one Server-Sent Event frame"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, default=str)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def sse_response(event_log, last_event_id=None):
+    """Stream an EventLog to the client, resuming after Last-Event-ID if given"""
+    try:
+        after_id = int(last_event_id or 0)
+    except ValueError:
+        after_id = 0
+
+    def generate():
+        yield 'retry: 3000\n\n'
+        for item in event_log.follow(after_id):
+            if item is None:
+                yield ': heartbeat\n\n'
+            else:
+                event_id, event, data = item
+                yield format_sse(event, data, event_id)
+
+    return _event_stream(generate())
+
+
+def sse_events(events):
+    """Stream (event, data) pairs from a generator as they are produced, e.g. chunks of a chat reply"""
+    return _event_stream(format_sse(event, data) for event, data in events)
+
+
+def _event_stream(frames):
+    response = Response(stream_with_context(frames), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Disable proxy buffering (nginx)
+    return response
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Response Compression and ETags
+Compresses HTML/JSON responses above a size threshold and answers conditional GETs with 304
+"""
+
+import gzip
+import hashlib
+
+from flask import request
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/plain', 'text/css', 'text/csv',
+    'application/json', 'application/javascript', 'application/x-ndjson',
+}
+MIN_SIZE = 1024  # Below this, compression costs more than it saves
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+def _encode(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def compress_response(response, min_size=MIN_SIZE):
+    """after_request hook: weak ETag, 304 on match, then gzip/brotli if worthwhile"""
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    body = response.get_data()
+
+    # ETag describes the uncompressed content, so it is weak and shared by all encodings
+    if 'ETag' not in response.headers:
+        response.set_etag(hashlib.sha1(body).hexdigest()[:20], weak=True)
+    response.headers.setdefault('Cache-Control', 'no-cache')
+    response.vary.add('Accept-Encoding')
+
+    response.make_conditional(request)
+    if response.status_code == 304 or len(body) < min_size:
+        return response
+
+    offered = ['br', 'gzip'] if brotli else ['gzip']
+    encoding = request.accept_encodings.best_match(offered)
+    if not encoding:
+        return response
+
+    compressed = _encode(body, encoding)
+    if len(compressed) >= len(body):
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app, min_size=MIN_SIZE):
+    """Register compression and ETag handling for every response of `app`"""
+    app.after_request(lambda response: compress_response(response, min_size))
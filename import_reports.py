@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Historical Report Importer
+Loads years of tracker workbooks (and Word reports) from the reports folder into the publication store
+
+Files are parsed in parallel worker processes with the streaming XML readers
+in report_readers.py. Each worker returns its file's rows already keyed and
+deduplicated, skipping rows without a faculty member and a title. The parent
+merges duplicates across files, keeping when each publication was first and
+last reported, and bulk-inserts the result in one transaction.
+
+    python import_reports.py                       # folder and prefix from config.json
+    python import_reports.py /path/to/CSRR_Reports --pattern "CSRR_*.xlsx" --jobs 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from publication_store import DEFAULT_DB_PATH, PublicationStore, publication_row
+from report_diff import read_report_rows
+
+CONFIG_PATH = Path(__file__).resolve().parent / 'config.json'
+
+
+def default_source():
+    """Reports folder and file patterns from config.json"""
+    try:
+        with open(CONFIG_PATH) as f:
+            output = json.load(f).get('output', {})
+    except (OSError, ValueError):
+        output = {}
+    prefix = output.get('filename_prefix', 'CSRR_Faculty_Publications')
+    return output.get('reports_folder', '/Users/azrabano/CSRR_Reports'), [f'{prefix}_*.xlsx', 'CSRR_*.docx']
+
+
+def find_reports(folder, patterns):
+    paths = {path for pattern in patterns for path in Path(folder).glob(pattern)
+             if path.is_file() and not path.name.startswith(('.', '~$'))}
+    return sorted(paths)
+
+
+def read_report(path):
+    """Worker: one file's store rows, deduplicated within the file; dated by the file's mtime"""
+    path = Path(path)
+    seen_at = datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec='seconds')
+    rows = {}
+    for pub in read_report_rows(path):
+        if pub['title'] and pub['faculty']:  # Skip stray rows (notes, totals) under the header
+            row = publication_row(pub, path.name, seen_at)
+            rows[row[0]] = row
+    return list(rows.values())
+
+
+def merge_row(existing, row):
+    """Combine two sightings of a publication: earliest first_seen, latest last_seen and citations"""
+    if existing is None:
+        return row
+    older, newer = sorted((existing, row), key=lambda r: r[10])
+    citations = newer[6] if newer[6] is not None else older[6]
+    return newer[:6] + (citations,) + newer[7:9] + (min(existing[9], row[9]), newer[10])
+
+
+def progress(done, total, rows, started, out=sys.stderr):
+    width = 30
+    filled = int(width * done / total) if total else width
+    elapsed = time.perf_counter() - started
+    out.write(f"\r[{'#' * filled}{'.' * (width - filled)}] {done}/{total} files, "
+              f"{rows:,} rows, {elapsed:.1f}s")
+    out.flush()
+
+
+def import_reports(paths, store, jobs=None, show_progress=True):
+    """Parse `paths` in parallel and upsert into `store`; returns (files, rows read, unique, failed)"""
+    started = time.perf_counter()
+    merged = {}
+    rows_read = 0
+    failed = {}
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = {pool.submit(read_report, str(path)): path for path in paths}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                rows = future.result()
+            except Exception as e:
+                failed[futures[future]] = str(e)
+                rows = []
+            rows_read += len(rows)
+            for row in rows:
+                merged[row[0]] = merge_row(merged.get(row[0]), row)
+            if show_progress:
+                progress(done, len(paths), rows_read, started)
+    if show_progress:
+        sys.stderr.write('\n')
+
+    store.insert_rows(merged.values())
+    return len(paths), rows_read, len(merged), failed
+
+
+def main():
+    folder, patterns = default_source()
+    parser = argparse.ArgumentParser(description='Import historical CSRR reports into the publication store')
+    parser.add_argument('folder', nargs='?', default=folder)
+    parser.add_argument('--pattern', action='append', dest='patterns',
+                        help=f"Glob inside the folder; repeatable (default: {' '.join(patterns)})")
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: one per core)')
+    parser.add_argument('--store', default=str(DEFAULT_DB_PATH), help='Publication store (SQLite path)')
+    parser.add_argument('--quiet', action='store_true', help='No progress bar')
+    args = parser.parse_args()
+
+    paths = find_reports(args.folder, args.patterns or patterns)
+    if not paths:
+        print(f"No reports found in {args.folder}")
+        return 1
+
+    started = time.perf_counter()
+    store = PublicationStore(args.store)
+    files, rows_read, unique, failed = import_reports(paths, store, args.jobs, not args.quiet)
+    for path, error in failed.items():
+        print(f"Error reading {path}: {error}")
+    print(f"Imported {unique:,} unique publications from {rows_read:,} rows in {files - len(failed)} files "
+          f"({time.perf_counter() - started:.1f}s); store now holds {store.count():,}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -35,8 +35,7 @@ def check_and_install_dependencies():
         "pandas>=1.5.0",
         "requests>=2.25.0",
         "beautifulsoup4>=4.9.0",
-        "openpyxl>=3.0.0",
-        "schedule>=1.1.0"
+        "openpyxl>=3.0.0"
     ]
     
     # AI and visualization dependencies
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Pooled Email Delivery
+Sends one message per subscriber over a few reused, authenticated SMTP connections
+
+The report attachment is read and base64-encoded once and shared by every
+message. Workers each hold one connection (STARTTLS and login happen once per
+connection, not per subscriber), a shared rate limit caps messages per second,
+and temporary failures are retried per recipient with backoff.
+"""
+
+import os
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+MAX_CONNECTIONS = 4
+MESSAGES_PER_CONNECTION = 100  # Reconnect after this many; many servers cap a session
+MESSAGES_PER_SECOND = 10
+MAX_ATTEMPTS = 3
+
+
+def build_attachment(report_path):
+    """Read and base64-encode a report once; the part can be attached to any number of messages"""
+    part = MIMEBase('application', 'octet-stream')
+    with open(report_path, 'rb') as attachment:
+        part.set_payload(attachment.read())
+    encoders.encode_base64(part)
+    part.add_header('Content-Disposition', f'attachment; filename= {os.path.basename(report_path)}')
+    return part
+
+
+def compose_message(sender, recipient, subject, body, attachment=None):
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = recipient
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    if attachment is not None:
+        msg.attach(attachment)
+    return msg
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class SMTPConnection:
+    """One authenticated SMTP session, reopened when the server drops it or the message cap is hit"""
+
+    def __init__(self, host, port, username=None, password=None, starttls=True, timeout=30,
+                 max_messages=MESSAGES_PER_CONNECTION):
+        self.host, self.port = host, port
+        self.username, self.password = username, password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.max_messages = max_messages
+        self._smtp = None
+        self._sent = 0
+
+    def _open(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password)
+        self._smtp = smtp
+        self._sent = 0
+
+    def send(self, msg, sender, recipient):
+        if self._smtp is not None and self._sent >= self.max_messages:
+            self.close()
+        if self._smtp is None:
+            self._open()
+        try:
+            self._smtp.sendmail(sender, [recipient], msg.as_bytes())
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self._smtp = None  # Reconnect on the next attempt
+            raise
+        self._sent += 1
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def _is_permanent(error):
+    """5xx replies (bad mailbox, rejected content) will not succeed on retry"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    code = getattr(error, 'smtp_code', None)
+    return isinstance(code, int) and code >= 500
+
+
+class MailDelivery:
+    """Delivers (recipient, message) pairs concurrently over a small pool of SMTP connections"""
+
+    def __init__(self, host, port, sender, password=None, starttls=True, max_connections=MAX_CONNECTIONS,
+                 rate=MESSAGES_PER_SECOND, max_attempts=MAX_ATTEMPTS, retry_delay=2.0, timeout=30,
+                 messages_per_connection=MESSAGES_PER_CONNECTION):
+        self.sender = sender
+        self.max_connections = max_connections
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.rate_limiter = RateLimiter(rate)
+        self._connection_args = dict(host=host, port=port, username=sender if password else None,
+                                     password=password, starttls=starttls, timeout=timeout,
+                                     max_messages=messages_per_connection)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, email_config, **overrides):
+        """Build from the 'email' section of config.json"""
+        options = dict(
+            host=email_config['smtp_server'],
+            port=email_config['smtp_port'],
+            sender=email_config['sender_email'],
+            password=email_config.get('sender_password'),
+            max_connections=email_config.get('max_connections', MAX_CONNECTIONS),
+            rate=email_config.get('messages_per_second', MESSAGES_PER_SECOND),
+        )
+        options.update(overrides)
+        return cls(**options)
+
+    def _connection(self):
+        # Each worker thread keeps its own session for the whole batch
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = SMTPConnection(**self._connection_args)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _deliver_one(self, recipient, msg):
+        for attempt in range(1, self.max_attempts + 1):
+            self.rate_limiter.wait()
+            try:
+                self._connection().send(msg, self.sender, recipient)
+                return None
+            except (smtplib.SMTPException, OSError) as e:
+                if _is_permanent(e) or attempt == self.max_attempts:
+                    return str(e)
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+    def send_all(self, messages):
+        """Send an iterable of (recipient, message); returns (sent recipients, {recipient: error})"""
+        sent, failed = [], {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_connections, thread_name_prefix='smtp') as pool:
+                futures = {pool.submit(self._deliver_one, recipient, msg): recipient
+                           for recipient, msg in messages}
+                for future, recipient in futures.items():
+                    error = future.result()
+                    if error is None:
+                        sent.append(recipient)
+                    else:
+                        failed[recipient] = error
+        finally:
+            with self._lock:
+                for connection in self._connections:
+                    connection.close()
+                self._connections = []
+        return sent, failed
@@ -4,18 +4,12 @@ Monthly Automation Script for CSRR Faculty Tracker
 Runs monthly searches and sends email notifications automatically
 """
 
-import schedule
-import time
+import argparse
 import sys
 import os
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 
 # Add the parent directory to path to import modules
 sys.path.append('/Users/azrabano')
@@ -23,6 +17,12 @@ sys.path.append('/Users/azrabano/csrr-dashboard')
 
 from csrr_faculty_tracker import CSRRFacultyTracker
 from app import app, db, EmailSubscriber, SearchRun, User
+from task_scheduler import Scheduler, monthly, daily
+from mail_delivery import MailDelivery, build_attachment, compose_message
+from report_links import link_secret, sign_report_link
+from report_manifest import ReportManifest
+from report_archive import ReportArchive
+from report_diff import FIELD_ALIASES, diff_report_files, read_report_rows, whats_new_text
 
 # Setup logging
 logging.basicConfig(
@@ -38,6 +38,8 @@ logger = logging.getLogger(__name__)
 class MonthlyAutomation:
     def __init__(self):
         self.tracker = CSRRFacultyTracker()
+        self.report_manifest = ReportManifest()
+        self.report_archive = ReportArchive(Path(self.tracker.config['output']['reports_folder']) / 'archive')
         
     def run_monthly_search(self):
         """Run the monthly search and send emails"""
@@ -51,6 +53,7 @@ class MonthlyAutomation:
                 db.session.commit()
                 
                 # Run the actual search
+                started = datetime.now()
                 results_count = self.tracker.run_monthly_search()
                 
                 # Update search run record
@@ -58,16 +61,25 @@ class MonthlyAutomation:
                 search_run.status = 'completed'
                 search_run.results_count = results_count
                 
-                # Find the most recent report file
-                reports_dir = Path(self.tracker.config['output']['reports_folder'])
-                if reports_dir.exists():
-                    report_files = list(reports_dir.glob('*.xlsx'))
-                    if report_files:
-                        latest_report = max(report_files, key=lambda f: f.stat().st_mtime)
-                        search_run.report_path = str(latest_report)
-                        
-                        # Send emails to all subscribers
-                        self.send_monthly_emails(latest_report)
+                # Index the report this run wrote, then send exactly that file
+                reports_dir = self.tracker.config['output']['reports_folder']
+                self.report_manifest.record_outputs_since(search_run.id, reports_dir, started, formats=('xlsx',),
+                                                          kind='monthly')
+                report = self.report_manifest.get(search_run.id, 'xlsx')
+                if report:
+                    search_run.report_path = report['path']
+                    self.archive_report(search_run.id, started, report['path'])
+                    
+                    # Lead the email with what changed since the previous monthly report (not a dashboard export)
+                    whats_new = None
+                    previous = self.report_manifest.latest('xlsx', exclude_run=search_run.id, kind='monthly')
+                    if previous and os.path.exists(previous['path']):
+                        whats_new = whats_new_text(diff_report_files(previous['path'], report['path']))
+                    
+                    # Send emails to all subscribers
+                    self.send_monthly_emails(report['path'], whats_new)
+                else:
+                    logger.warning("The search did not write an Excel report; no emails sent.")
                 
                 db.session.commit()
                 logger.info(f"Monthly search completed. Found {results_count} results.")
@@ -80,8 +92,18 @@ class MonthlyAutomation:
                     search_run.status = 'failed'
                     search_run.completed_at = datetime.utcnow()
                     db.session.commit()
+            raise  # The scheduler retries failed runs
+    
+    def archive_report(self, run_id, run_at, report_path):
+        """Append this run's rows to the report archive"""
+        try:
+            rows = (tuple(pub[field] for field in FIELD_ALIASES) for pub in read_report_rows(report_path))
+            entry = self.report_archive.append_run(run_id, run_at, rows)
+            logger.info(f"Archived {entry['rows']} rows for run {run_id}")
+        except Exception as e:
+            logger.error(f"Failed to archive report {report_path}: {e}")
     
-    def send_monthly_emails(self, report_path):
+    def send_monthly_emails(self, report_path, whats_new=None):
         """Send monthly report emails to all subscribers"""
         try:
             with app.app_context():
@@ -91,36 +113,62 @@ class MonthlyAutomation:
                     logger.info("No active subscribers found.")
                     return
                 
+                email_config = self.tracker.config['email']
+                if not email_config['sender_email']:
+                    logger.warning("Email configuration not set up. Skipping email delivery.")
+                    return
+                
                 logger.info(f"Sending monthly report to {len(subscribers)} subscribers...")
                 
+                # 'link' mode sends a signed download URL instead of the attachment
+                send_links = email_config.get('delivery') == 'link' and report_path is not None
+                if send_links and not link_secret():
+                    logger.warning("Link delivery needs CSRR_REPORT_LINK_SECRET; attaching the report instead.")
+                    send_links = False
+                
+                # Encode the report once and share it across every message
+                attachment = None
+                if not send_links and report_path and os.path.exists(report_path):
+                    attachment = build_attachment(report_path)
+                
+                subject = f"CSRR Faculty Publications Report - {datetime.now().strftime('%B %Y')}"
+                messages = []
                 for subscriber in subscribers:
-                    try:
-                        self.send_individual_email(subscriber.email, report_path)
-                        logger.info(f"Email sent to {subscriber.email}")
-                    except Exception as e:
-                        logger.error(f"Failed to send email to {subscriber.email}: {e}")
+                    download = None
+                    if send_links:
+                        download = sign_report_link(email_config.get('download_base_url', 'http://127.0.0.1:3000'),
+                                                    report_path, subscriber.email)
+                    body = self.email_body(subscriber.email, download, whats_new)
+                    messages.append((subscriber.email, compose_message(email_config['sender_email'], subscriber.email,
+                                                                       subject, body, attachment)))
+                
+                sent, failed = MailDelivery.from_config(email_config).send_all(messages)
+                for recipient, error in failed.items():
+                    logger.error(f"Failed to send email to {recipient}: {error}")
+                logger.info(f"Monthly report sent to {len(sent)} of {len(subscribers)} subscribers")
                         
         except Exception as e:
             logger.error(f"Failed to send monthly emails: {e}")
     
-    def send_individual_email(self, recipient_email, report_path):
-        """Send email to individual subscriber"""
-        if not self.tracker.config['email']['sender_email']:
-            logger.warning("Email configuration not set up. Skipping email delivery.")
-            return
+    def email_body(self, recipient_email, download=None, whats_new=None):
+        """Email body with unsubscribe link; `download` is a (url, expires_at) pair in link mode"""
+        if download:
+            url, expires_at = download
+            report_line = (f"Download the monthly faculty publications report for {datetime.now().strftime('%B %Y')}:\n"
+                           f"        {url}\n"
+                           f"        (This personal link expires on {expires_at.strftime('%B %d, %Y')}.)")
+        else:
+            report_line = f"Please find attached the monthly faculty publications report for {datetime.now().strftime('%B %Y')}."
         
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = self.tracker.config['email']['sender_email']
-        msg['To'] = recipient_email
-        msg['Subject'] = f"CSRR Faculty Publications Report - {datetime.now().strftime('%B %Y')}"
+        whats_new_section = ''
+        if whats_new:
+            whats_new_section = '\n' + '\n'.join(f'        {line}' for line in whats_new.splitlines()) + '\n'
         
-        # Email body with unsubscribe link
-        body = f"""
+        return f"""
         Dear CSRR Team Member,
         
-        Please find attached the monthly faculty publications report for {datetime.now().strftime('%B %Y')}.
-        
+        {report_line}
+        {whats_new_section}
         This automated report includes:
         - Recent op-eds, interviews, and publications by CSRR faculty affiliates
         - Summary by faculty member and content type
@@ -134,30 +182,6 @@ class MonthlyAutomation:
         Best regards,
         CSRR Automated Tracking System
         """
-        
-        msg.attach(MIMEText(body, 'plain'))
-        
-        # Attach Excel file
-        if report_path and os.path.exists(report_path):
-            with open(report_path, "rb") as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-            
-            encoders.encode_base64(part)
-            part.add_header(
-                'Content-Disposition',
-                f'attachment; filename= {os.path.basename(report_path)}'
-            )
-            msg.attach(part)
-        
-        # Send email
-        server = smtplib.SMTP(self.tracker.config['email']['smtp_server'], self.tracker.config['email']['smtp_port'])
-        server.starttls()
-        server.login(self.tracker.config['email']['sender_email'], self.tracker.config['email']['sender_password'])
-        
-        text = msg.as_string()
-        server.sendmail(self.tracker.config['email']['sender_email'], recipient_email, text)
-        server.quit()
     
     def health_check(self):
         """Perform a health check of the system"""
@@ -176,21 +200,33 @@ class MonthlyAutomation:
 
 def main():
     """Main automation function"""
+    parser = argparse.ArgumentParser(description='CSRR monthly search and email automation')
+    parser.add_argument('--run-due', action='store_true',
+                        help='Run whatever is due (including missed runs) and exit; for cron')
+    args = parser.parse_args()
+    
     automation = MonthlyAutomation()
+    scheduler = Scheduler()
     
-    # Schedule monthly search on the 30th of each month at 9:00 AM
-    schedule.every().month.at("09:00").do(automation.run_monthly_search)
+    # Monthly search on the 30th of each month at 9:00 AM (last day in February)
+    scheduler.add_job('monthly_search', automation.run_monthly_search, monthly(day=30, hour=9))
     
     # Daily health check at 8:00 AM
-    schedule.every().day.at("08:00").do(automation.health_check)
+    scheduler.add_job('health_check', automation.health_check, daily(hour=8))
+    
+    if args.run_due:
+        ran = scheduler.run_due()
+        logger.info(f"Ran due jobs: {', '.join(ran) or 'none'}")
+        return
     
     logger.info("Monthly automation started. Waiting for scheduled tasks...")
     logger.info("Next monthly search will run on the 30th of each month at 9:00 AM")
     
-    # Keep the script running
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
+    # Sleeps until the next due time; missed runs are caught up on startup
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        logger.info("Monthly automation stopped.")
 
 if __name__ == "__main__":
     main()
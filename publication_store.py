@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Publication Store
+Deduplicated SQLite table of every publication seen in a search or an imported report
+
+Rows are keyed by report_diff.publication_id, so the same publication found by
+many runs (or listed in many monthly workbooks) is stored once, with the first
+and last time it was seen. Writes are batched executemany calls in a single
+transaction.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from report_diff import publication_id
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / 'instance' / 'publications.db'
+FIELDS = ('faculty', 'title', 'date', 'type', 'source', 'citations', 'url')
+EXPORT_FIELDS = ('pub_id',) + FIELDS + ('first_seen', 'last_seen')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publications (
+    pub_id TEXT PRIMARY KEY,
+    faculty TEXT NOT NULL,
+    title TEXT NOT NULL,
+    date TEXT,
+    type TEXT,
+    source TEXT,
+    citations INTEGER,
+    url TEXT,
+    origin TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS publications_by_faculty ON publications (faculty, date);
+CREATE INDEX IF NOT EXISTS publications_by_date ON publications (date);
+"""
+
+UPSERT = """
+INSERT INTO publications (pub_id, faculty, title, date, type, source, citations, url, origin, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (pub_id) DO UPDATE SET
+    citations = COALESCE(excluded.citations, citations),
+    first_seen = MIN(first_seen, excluded.first_seen),
+    last_seen = MAX(last_seen, excluded.last_seen)
+"""
+
+
+def _citations(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _date(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def publication_row(pub, origin, seen_at):
+    """Store row for a canonical publication dict (see report_diff)"""
+    return (publication_id(pub), pub.get('faculty', ''), pub.get('title', ''), pub.get('date') or None,
+            pub.get('type') or None, pub.get('source') or None, _citations(pub.get('citations')),
+            pub.get('url') or None, origin, seen_at, seen_at)
+
+
+class PublicationStore:
+    """SQLite-backed publication history for the dashboards, exports and analytics"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')  # Readers (exports) never block the importer
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def insert_rows(self, rows, batch_size=5000):
+        """Upsert publication_row() tuples in one transaction; returns the number processed"""
+        count = 0
+        with self._lock, self._connect() as conn:
+            conn.execute('PRAGMA synchronous=NORMAL')
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    conn.executemany(UPSERT, batch)
+                    count += len(batch)
+                    batch = []
+            conn.executemany(UPSERT, batch)
+            count += len(batch)
+        return count
+
+    def add_publications(self, pubs, origin):
+        """Upsert canonical publication dicts seen now (e.g. one search run)"""
+        seen_at = datetime.now().isoformat(timespec='seconds')
+        return self.insert_rows(publication_row(pub, origin, seen_at) for pub in pubs)
+
+    def iter_publications(self, faculty=None, since=None, until=None, types=None, source=None, text=None,
+                          limit=None, batch_size=1000):
+        """Yield matching rows (sqlite3.Row) newest first, fetched from the cursor in batches.
+
+        The connection stays open, in one read transaction, until the generator is exhausted or closed.
+        """
+        clauses, params = [], []
+        if faculty:
+            clauses.append(f"faculty IN ({', '.join('?' * len(faculty))})")
+            params.extend(faculty)
+        if since:
+            clauses.append('date >= ?')
+            params.append(since)
+        if until:
+            clauses.append('date <= ?')
+            params.append(until)
+        if types:
+            clauses.append(f"type IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        if text:
+            clauses.append("title LIKE ? ESCAPE '\\'")
+            params.append('%' + re.sub(r'([%_\\])', r'\\\1', text) + '%')
+        query = f"SELECT {', '.join(EXPORT_FIELDS)} FROM publications"
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        query += ' ORDER BY date DESC, faculty'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(int(limit))
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def version(self):
+        """(rows, latest last_seen): changes whenever a publication is added or seen again"""
+        with self._connect() as conn:
+            return tuple(conn.execute('SELECT COUNT(*), MAX(last_seen) FROM publications').fetchone())
+
+    def by_faculty(self):
+        """{faculty: [publication dicts]} in the dashboards' in-memory shape.
+
+        Lists are in insertion order, so a reload only ever appends to them. Dates
+        are datetimes; a publication without a readable date has no 'date' key.
+        """
+        publications = {}
+        with self._connect() as conn:
+            for row in conn.execute(f"SELECT {', '.join(FIELDS)} FROM publications ORDER BY rowid"):
+                pub = {field: row[field] for field in FIELDS[1:] if row[field] is not None}
+                date = _date(row['date'])
+                if date:
+                    pub['date'] = date
+                else:
+                    pub.pop('date', None)
+                publications.setdefault(row['faculty'], []).append(pub)
+        return publications
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM publications').fetchone()[0]
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Report Archive
+Append-only history of every run's publications, with per-month and master workbooks built from it
+
+Each run's rows are appended to a per-month CSV sidecar (archive/YYYY-MM.csv)
+and the byte range they occupy is recorded in archive/runs.csv. Adding a run
+costs O(its rows): earlier months and earlier runs are never rewritten, and
+every run stays addressable on its own, including several on the same day.
+
+Workbooks are built on demand, never per run: a month's workbook
+(CSRR_Archive_YYYY-MM.xlsx) is rebuilt only when its sidecar has grown since it
+was written, and a master workbook has one sheet per month:
+
+    python report_archive.py runs
+    python report_archive.py month 2025-10
+    python report_archive.py export CSRR_Master_Report.xlsx --months 2025-09 2025-10
+"""
+
+import argparse
+import csv
+import io
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from report_pipeline import PUBLICATION_COLUMNS
+from report_writers import write_xlsx, write_xlsx_sheets
+
+ARCHIVE_COLUMNS = ['Run ID', 'Run At'] + PUBLICATION_COLUMNS
+INDEX_COLUMNS = ['run_id', 'run_at', 'month', 'rows', 'start', 'end']
+DEFAULT_ARCHIVE_DIR = Path('/Users/azrabano/CSRR_Reports') / 'archive'
+
+
+def _csv_bytes(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+class ReportArchive:
+    """Append-only run archive shared by the dashboards and the monthly automation"""
+
+    def __init__(self, root=DEFAULT_ARCHIVE_DIR):
+        self.root = Path(root)
+        self.index_path = self.root / 'runs.csv'
+        self._lock = threading.Lock()
+
+    def month_path(self, month):
+        return self.root / f'{month}.csv'
+
+    def workbook_path(self, month):
+        return self.root.parent / f'CSRR_Archive_{month}.xlsx'
+
+    @contextmanager
+    def _locked(self):
+        """Serialize appends across threads and, where flock exists, across processes"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / '.lock', 'a') as handle:
+            try:
+                import fcntl
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            except ImportError:  # Windows: thread lock only
+                pass
+            yield
+
+    def runs(self, month=None):
+        """Index entries, oldest first"""
+        if not self.index_path.exists():
+            return []
+        with open(self.index_path, newline='', encoding='utf-8') as f:
+            entries = [entry for entry in csv.DictReader(f) if not month or entry['month'] == month]
+        for entry in entries:
+            for field in ('rows', 'start', 'end'):
+                entry[field] = int(entry[field])
+        return entries
+
+    def months(self):
+        return sorted({entry['month'] for entry in self.runs()})
+
+    def _truncate_partial(self, month, entries):
+        """Drop bytes a crashed append wrote after the last indexed run of the month"""
+        path = self.month_path(month)
+        indexed_end = max((entry['end'] for entry in entries if entry['month'] == month), default=0)
+        if path.exists() and path.stat().st_size > indexed_end:
+            with open(path, 'r+b') as f:
+                f.truncate(indexed_end)
+
+    def append_run(self, run_id, run_at, rows):
+        """Append one run's rows (sequences in PUBLICATION_COLUMNS order); returns its index entry.
+
+        Appending a run ID that is already archived is a no-op, so retries are safe.
+        """
+        run_id = str(run_id)
+        run_at_text = run_at.isoformat(timespec='seconds')
+        month = run_at.strftime('%Y-%m')
+        with self._locked():
+            entries = self.runs()
+            for entry in entries:
+                if entry['run_id'] == run_id:
+                    return entry
+            self._truncate_partial(month, entries)
+
+            path = self.month_path(month)
+            count = 0
+            with open(path, 'ab') as f:
+                if f.tell() == 0:
+                    f.write(_csv_bytes([ARCHIVE_COLUMNS]))
+                start = f.tell()
+                batch = []
+                for row in rows:
+                    batch.append([run_id, run_at_text, *row])
+                    if len(batch) >= 1000:
+                        f.write(_csv_bytes(batch))
+                        count += len(batch)
+                        batch = []
+                f.write(_csv_bytes(batch))
+                count += len(batch)
+                end = f.tell()
+                f.flush()
+                os.fsync(f.fileno())
+
+            # The index line is written last: a run is archived once it is listed here
+            entry = {'run_id': run_id, 'run_at': run_at_text, 'month': month, 'rows': count,
+                     'start': start, 'end': end}
+            new_index = not self.index_path.exists()
+            with open(self.index_path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=INDEX_COLUMNS)
+                if new_index:
+                    writer.writeheader()
+                writer.writerow(entry)
+                f.flush()
+                os.fsync(f.fileno())
+            return entry
+
+    def _read_range(self, month, start, end):
+        with open(self.month_path(month), 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+        return csv.reader(io.StringIO(data.decode('utf-8'), newline=''))
+
+    def run_rows(self, run_id):
+        """Rows of a single run, read straight from its byte range"""
+        for entry in self.runs():
+            if entry['run_id'] == str(run_id):
+                return list(self._read_range(entry['month'], entry['start'], entry['end']))
+        return []
+
+    def month_rows(self, month):
+        """Every archived row of a month, run by run"""
+        entries = self.runs(month)
+        if not entries:
+            return
+        yield from self._read_range(month, entries[0]['start'], entries[-1]['end'])
+
+    def month_workbook(self, month):
+        """Path of one month's workbook, rebuilt from its sidecar only if runs were appended since"""
+        path = self.workbook_path(month)
+        sidecar = self.month_path(month)
+        if not sidecar.exists():
+            raise FileNotFoundError(f'No archived runs for {month}')
+        if not path.exists() or path.stat().st_mtime < sidecar.stat().st_mtime:
+            write_xlsx(path, ARCHIVE_COLUMNS, self.month_rows(month), sheet_title=month)
+        return path
+
+    def export_workbook(self, path, months=None):
+        """Master workbook with one sheet per month, streamed from the sidecars"""
+        months = months or self.months()
+        return write_xlsx_sheets(path, ARCHIVE_COLUMNS, ((month, self.month_rows(month)) for month in months))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Inspect or export the append-only report archive')
+    parser.add_argument('--archive', default=os.getenv('CSRR_REPORT_ARCHIVE', str(DEFAULT_ARCHIVE_DIR)))
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('runs', help='List archived runs')
+    month = commands.add_parser('month', help="Write one month's workbook next to the archive")
+    month.add_argument('month', help='YYYY-MM')
+    export = commands.add_parser('export', help='Write a master workbook with one sheet per month')
+    export.add_argument('path')
+    export.add_argument('--months', nargs='+', help='YYYY-MM months to include (default: all)')
+    args = parser.parse_args()
+
+    archive = ReportArchive(args.archive)
+    if args.command == 'runs':
+        for entry in archive.runs():
+            print(f"{entry['run_at']}  {entry['run_id']:<36}  {entry['rows']:>7} rows  ({entry['month']})")
+    elif args.command == 'month':
+        print(f"Wrote {archive.month_workbook(args.month)}")
+    else:
+        count = archive.export_workbook(args.path, args.months)
+        print(f"Wrote {count} rows to {args.path}")
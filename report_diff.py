@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Month-over-Month Report Diff
+Added, removed and changed publications between two runs, as a "what's new" section or email text
+
+Rows from either report are keyed by a stable publication ID (URL when known,
+else faculty + normalized title), sorted once, and compared with a single
+sorted merge, so each diff is O(n log n) regardless of how much overlaps.
+
+    python report_diff.py CSRR_Report_20250930.csv CSRR_Report_20251030.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import re
+from datetime import datetime
+from pathlib import Path
+
+from report_readers import docx_table_rows, xlsx_sheets
+
+# Header spellings used by our renderers and the tracker's Excel export
+FIELD_ALIASES = {
+    'faculty': ('Faculty', 'Faculty Name', 'faculty_name', 'Faculty Member'),
+    'title': ('Title', 'title', 'Publication Title'),
+    'date': ('Date', 'date', 'Publication Date'),
+    'type': ('Type', 'type', 'Content Type'),
+    'source': ('Source', 'source', 'Publication'),
+    'citations': ('Citations', 'citations'),
+    'url': ('URL', 'url', 'Link', 'link'),
+}
+COMPARED_FIELDS = ('date', 'type', 'source', 'citations')
+UNDATED_SOURCES = ('Google Scholar',)  # Sources whose report dates are stamped at search time, not published
+WHATS_NEW_LIMIT = 25  # Items listed per section; the rest are counted
+
+
+def _normalize(text):
+    return re.sub(r'\W+', ' ', str(text or '')).strip().lower()
+
+
+def publication_id(pub):
+    """Stable ID for a publication, independent of row order and cosmetic title changes"""
+    url = (pub.get('url') or '').strip()
+    if url:
+        key = url.split('#', 1)[0].rstrip('/').lower()
+    else:
+        key = f"{_normalize(pub.get('faculty'))}|{_normalize(pub.get('title'))}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _canonical(record):
+    """Map a report row (dict keyed by header) onto the canonical field names"""
+    pub = {}
+    for field, aliases in FIELD_ALIASES.items():
+        value = next((record[alias] for alias in aliases if record.get(alias) not in (None, '')), '')
+        if isinstance(value, datetime):
+            value = value.strftime('%Y-%m-%d')  # Excel date cells
+        pub[field] = str(value)
+    return pub
+
+
+def canonical_rows(columns, rows):
+    """Canonical publication dicts from in-memory report rows (e.g. a report model)"""
+    for row in rows:
+        yield _canonical(dict(zip(columns, row)))
+
+
+def _is_publication_header(header):
+    """A header row naming at least the faculty member and the title"""
+    names = set(header)
+    return all(names & set(FIELD_ALIASES[field]) for field in ('faculty', 'title'))
+
+
+def read_report_rows(path):
+    """Yield canonical publication dicts from a .csv, .xlsx or .docx report"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            for record in csv.DictReader(f):
+                yield _canonical(record)
+        return
+
+    if suffix == '.docx':
+        # Word reports carry publications in tables; other tables (summaries) are skipped
+        headers = {}
+        for table, cells in docx_table_rows(path):
+            if table not in headers:
+                headers[table] = cells if _is_publication_header(cells) else None
+            elif headers[table]:
+                yield _canonical(dict(zip(headers[table], cells)))
+        return
+
+    for _, rows in xlsx_sheets(path):
+        header = [str(cell) if cell is not None else '' for cell in next(rows, ())]
+        if not _is_publication_header(header):
+            continue  # Summary and chart sheets
+        for values in rows:
+            if any(value is not None for value in values):
+                yield _canonical(dict(zip(header, values)))
+
+
+def keyed(pubs):
+    """(id, pub) pairs sorted by ID; duplicate IDs within one run collapse to the last one"""
+    by_id = {publication_id(pub): pub for pub in pubs}
+    return sorted(by_id.items())
+
+
+def changed_fields(old, new):
+    """Compared fields that differ; search-time dates are not compared"""
+    fields = COMPARED_FIELDS
+    if old.get('source') in UNDATED_SOURCES or new.get('source') in UNDATED_SOURCES:
+        fields = tuple(field for field in fields if field != 'date')
+    return [field for field in fields if old.get(field, '') != new.get(field, '')]
+
+
+def diff_publications(old_pubs, new_pubs):
+    """Sorted-merge diff: {'added': [...], 'removed': [...], 'changed': [(old, new, [fields])], 'unchanged': n}"""
+    old_items, new_items = keyed(old_pubs), keyed(new_pubs)
+    added, removed, changed = [], [], []
+    unchanged = 0
+    i = j = 0
+    while i < len(old_items) and j < len(new_items):
+        old_id, old = old_items[i]
+        new_id, new = new_items[j]
+        if old_id == new_id:
+            fields = changed_fields(old, new)
+            if fields:
+                changed.append((old, new, fields))
+            else:
+                unchanged += 1
+            i += 1
+            j += 1
+        elif old_id < new_id:
+            removed.append(old)
+            i += 1
+        else:
+            added.append(new)
+            j += 1
+    removed.extend(pub for _, pub in old_items[i:])
+    added.extend(pub for _, pub in new_items[j:])
+
+    # Present newest first within each group
+    added.sort(key=lambda pub: pub.get('date', ''), reverse=True)
+    return {'added': added, 'removed': removed, 'changed': changed, 'unchanged': unchanged}
+
+
+def diff_report_files(old_path, new_path):
+    return diff_publications(read_report_rows(old_path), read_report_rows(new_path))
+
+
+def _describe(pub):
+    details = ', '.join(part for part in (pub.get('source'), pub.get('date')) if part)
+    return f"{pub.get('faculty')}: {pub.get('title')}" + (f" ({details})" if details else '')
+
+
+def _describe_change(old, new, fields):
+    changes = '; '.join(f"{field} {old.get(field) or '-'} -> {new.get(field) or '-'}" for field in fields)
+    return f"{_describe(new)} [{changes}]"
+
+
+def diff_summary(diff):
+    return (f"{len(diff['added'])} new, {len(diff['changed'])} updated, "
+            f"{len(diff['removed'])} no longer listed since the last report")
+
+
+def _sections(diff):
+    return (
+        ('New publications', diff['added'], _describe),
+        ('Updated publications', diff['changed'], lambda item: _describe_change(*item)),
+    )
+
+
+def whats_new_blocks(diff, limit=WHATS_NEW_LIMIT):
+    """Compact "What's New" section as report_writers blocks"""
+    yield 'Heading1', "What's New Since the Last Report"
+    yield None, diff_summary(diff)
+    for heading, items, describe in _sections(diff):
+        if not items:
+            continue
+        yield 'Heading2', heading
+        for item in items[:limit]:
+            yield 'ListBullet', describe(item)
+        if len(items) > limit:
+            yield None, f'...and {len(items) - limit} more (see the full report)'
+    yield None, ''
+
+
+def whats_new_text(diff, limit=WHATS_NEW_LIMIT):
+    """Plain-text "what's new" digest for email bodies"""
+    lines = [f"What's new since the last report: {diff_summary(diff)}."]
+    for heading, items, describe in _sections(diff):
+        if not items:
+            continue
+        lines.append('')
+        lines.append(f'{heading}:')
+        lines.extend(f'- {describe(item)}' for item in items[:limit])
+        if len(items) > limit:
+            lines.append(f'- ...and {len(items) - limit} more in the full report')
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Show what changed between two report files (.csv or .xlsx)')
+    parser.add_argument('old_report')
+    parser.add_argument('new_report')
+    parser.add_argument('--limit', type=int, default=WHATS_NEW_LIMIT, help='Items listed per section')
+    args = parser.parse_args()
+    print(whats_new_text(diff_report_files(args.old_report, args.new_report), args.limit))
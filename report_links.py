@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Signed Report Download Links
+Per-recipient, expiring links to /download-report so monthly emails need not carry the report
+
+Links are signed with CSRR_REPORT_LINK_SECRET, which must be the same for the
+process sending the email and the dashboard serving the download. Downloads
+support Range requests (resume) and conditional GETs (ETag / If-Modified-Since).
+"""
+
+import hashlib
+import hmac
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+
+from flask import abort, request, send_file
+
+SECRET_ENV = 'CSRR_REPORT_LINK_SECRET'
+LINK_LIFETIME = timedelta(days=30)
+SALT = 'csrr-report-download'
+
+
+def link_secret():
+    """Shared signing secret, or None when link delivery is not configured"""
+    return os.environ.get(SECRET_ENV) or None
+
+
+def _serializer(secret):
+    from itsdangerous import URLSafeSerializer
+    return URLSafeSerializer(secret, salt=SALT)
+
+
+def sign_report_link(base_url, report_path, recipient, secret=None, lifetime=LINK_LIFETIME):
+    """Absolute download URL for one recipient; returns (url, expires_at)"""
+    secret = secret or link_secret()
+    if not secret:
+        raise RuntimeError(f"Set {SECRET_ENV} to send report links")
+    expires_at = datetime.now() + lifetime
+    token = _serializer(secret).dumps({
+        'file': Path(report_path).name,
+        'to': recipient,
+        'exp': int(expires_at.timestamp()),
+    })
+    return f"{base_url.rstrip('/')}/download-report?{urlencode({'token': token})}", expires_at
+
+
+def verify_report_token(token, secret=None):
+    """Payload of a valid, unexpired token; aborts with 403 (bad signature) or 410 (expired)"""
+    from itsdangerous import BadSignature
+    secret = secret or link_secret()
+    if not secret or not token:
+        abort(403)
+    try:
+        payload = _serializer(secret).loads(token)
+    except BadSignature:
+        abort(403)
+    if payload.get('exp', 0) < time.time():
+        abort(410)
+    return payload
+
+
+def recipient_tag(recipient, secret=None):
+    """Short keyed hash of a recipient, so logs can tell downloads apart without holding addresses"""
+    key = (secret or link_secret() or '').encode('utf-8')
+    return hmac.new(key, str(recipient).lower().encode('utf-8'), hashlib.sha256).hexdigest()[:12]
+
+
+def init_app(app, reports_dir):
+    """Serve signed links at /download-report from `reports_dir`"""
+    reports_dir = Path(reports_dir)
+
+    def download_signed_report():
+        payload = verify_report_token(request.args.get('token'))
+        # Only a bare file name is signed, so a token can never reach outside reports_dir
+        path = reports_dir / Path(payload['file']).name
+        if not path.is_file():
+            abort(404)
+        print(f"Report {path.name} downloaded by recipient {recipient_tag(payload['to'])}")
+        response = send_file(path, as_attachment=True, conditional=True, etag=True)
+        response.headers['Cache-Control'] = 'private, max-age=3600'
+        return response
+
+    app.add_url_rule('/download-report', 'download_signed_report', download_signed_report)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Report Manifest
+Persistent index of the files each search run produced: (run ID, format) -> path, size, checksum, created
+
+Reports are registered once, when they are written, so downloads are a single
+indexed lookup that returns the artifact of that run rather than the newest
+file in the reports folder.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / 'instance' / 'report_manifest.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    run_id TEXT NOT NULL,
+    format TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    kind TEXT NOT NULL DEFAULT 'dashboard',
+    PRIMARY KEY (run_id, format)
+);
+"""
+INDEXES = """
+CREATE INDEX IF NOT EXISTS reports_by_format ON reports (format, created_at);
+CREATE INDEX IF NOT EXISTS reports_by_kind ON reports (kind, format, created_at);
+"""
+COLUMNS = ('run_id', 'format', 'path', 'size', 'sha256', 'created_at', 'kind')
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ReportManifest:
+    """SQLite-backed report index shared by the dashboards and the monthly automation"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Manifests created before reports were tagged with the kind of run that wrote them
+            if 'kind' not in {row['name'] for row in conn.execute('PRAGMA table_info(reports)')}:
+                conn.execute("ALTER TABLE reports ADD COLUMN kind TEXT NOT NULL DEFAULT 'dashboard'")
+            conn.executescript(INDEXES)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record(self, run_id, path, report_format=None, kind='dashboard'):
+        """Register a finished report file for `run_id`; format defaults to the file suffix.
+
+        `kind` is the kind of run that wrote it ('dashboard' or 'monthly'), so
+        each kind of run can find its own previous report.
+        """
+        path = Path(path)
+        entry = {
+            'run_id': str(run_id),
+            'format': report_format or path.suffix.lstrip('.').lower(),
+            'path': str(path.resolve()),
+            'size': path.stat().st_size,
+            'sha256': file_checksum(path),
+            'created_at': datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec='seconds'),
+            'kind': kind,
+        }
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO reports ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                [entry[column] for column in COLUMNS]
+            )
+        return entry
+
+    def record_outputs_since(self, run_id, reports_dir, since, formats=('xlsx', 'docx', 'csv'), kind='dashboard'):
+        """Register files another component wrote into `reports_dir` during this run.
+
+        For writers we do not control (the tracker's Excel export): one directory
+        scan per run, instead of one per download request.
+        """
+        reports_dir = Path(reports_dir)
+        if not reports_dir.exists():
+            return []
+        cutoff = since.timestamp()
+        newest = {}
+        for path in reports_dir.iterdir():
+            report_format = path.suffix.lstrip('.').lower()
+            if report_format in formats and not path.name.startswith('.') and path.is_file():
+                mtime = path.stat().st_mtime
+                if mtime >= cutoff and mtime > newest.get(report_format, (0, None))[0]:
+                    newest[report_format] = (mtime, path)
+        return [self.record(run_id, path, report_format, kind) for report_format, (_, path) in newest.items()]
+
+    def get(self, run_id, report_format):
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM reports WHERE run_id = ? AND format = ?',
+                               (str(run_id), report_format)).fetchone()
+        return dict(row) if row else None
+
+    def latest(self, report_format, exclude_run=None, kind=None):
+        """Most recently created report of a format (optionally from another run or of one kind), via the index"""
+        query = 'SELECT * FROM reports WHERE format = ? AND run_id IS NOT ?'
+        params = [report_format, None if exclude_run is None else str(exclude_run)]
+        if kind is not None:
+            query += ' AND kind = ?'
+            params.append(kind)
+        with self._connect() as conn:
+            row = conn.execute(query + ' ORDER BY created_at DESC LIMIT 1', params).fetchone()
+        return dict(row) if row else None
+
+    def for_run(self, run_id):
+        with self._connect() as conn:
+            rows = conn.execute('SELECT * FROM reports WHERE run_id = ? ORDER BY format', (str(run_id),)).fetchall()
+        return {row['format']: dict(row) for row in rows}
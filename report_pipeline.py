@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Report Pipeline
+Builds one report model per search and renders Excel, Word and CSV from it in parallel worker processes
+
+The model is a plain, picklable snapshot taken in a single pass over the
+publication store, so renderers never touch live app state. Rendering runs in
+a long-lived process pool; the search thread only builds the model and returns.
+Workers import only this module and the writers, never the dashboard app: a
+spawned child normally re-runs the parent's __main__ module (advanced_app.py
+when launched as a script), so workers are started with __main__ hidden.
+"""
+
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+
+from report_diff import canonical_rows, diff_publications, read_report_rows, whats_new_blocks
+from report_writers import write_docx, write_xlsx
+
+PUBLICATION_COLUMNS = ['Faculty', 'Title', 'Date', 'Type', 'Source', 'Citations', 'URL']
+RENDER_WORKERS = 3  # One per output format
+
+_pool = None
+_pool_lock = threading.Lock()
+_start_lock = threading.Lock()
+
+
+def build_report_model(search_record, faculty_publications):
+    """Snapshot the search and every publication in one pass"""
+    rows = []
+    faculty_counts = []
+    for faculty_name, pubs in list(faculty_publications.items()):
+        for pub in list(pubs):
+            date = pub.get('date')
+            rows.append((faculty_name, pub.get('title', ''), date.strftime('%Y-%m-%d') if date else '',
+                         pub.get('type', ''), pub.get('source', ''), pub.get('citations', ''), pub.get('url', '')))
+        faculty_counts.append((faculty_name, len(pubs)))
+
+    return {
+        'generated_at': datetime.now(),
+        'search_id': search_record.get('id'),
+        'results': search_record.get('results', 0),
+        'ai_analysis': search_record.get('ai_analysis', ''),
+        'faculty_counts': faculty_counts,
+        'columns': PUBLICATION_COLUMNS,
+        'rows': rows,
+    }
+
+
+def render_xlsx(model, path):
+    write_xlsx(path, model['columns'], model['rows'])
+    return str(path)
+
+
+def render_csv(model, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(model['columns'])
+        writer.writerows(model['rows'])
+    os.replace(tmp_path, path)
+    return str(path)
+
+
+def enhanced_report_blocks(model):
+    """Word report content built from a report model, yielded block by block (see report_writers)"""
+    generated_at = model['generated_at']
+
+    # Enhanced title with AI branding
+    yield 'Title', f'CSRR Faculty Affiliates AI-Enhanced Report - {generated_at.strftime("%B %Y")}'
+
+    # Enhanced header
+    yield None, 'Center for Security, Race and Rights'
+    yield None, 'Rutgers Law School'
+    yield None, f'AI-Powered Analysis Report Generated: {generated_at.strftime("%B %d, %Y")}'
+    yield None, ''
+
+    # What changed since the previous run's report, so reviewers can start there
+    previous_report = model.get('previous_report')
+    if previous_report and os.path.isfile(previous_report):
+        diff = diff_publications(read_report_rows(previous_report), canonical_rows(model['columns'], model['rows']))
+        yield from whats_new_blocks(diff)
+
+    # AI Summary section
+    yield 'Heading1', 'AI Analysis Summary'
+    yield None, f'Total Publications Found: {model["results"]}'
+    yield None, 'Sources Monitored: News outlets, Google Scholar, Academic databases'
+    yield None, 'AI Recommendations: Based on impact analysis and past CSRR selections'
+    yield None, ''
+
+    # Enhanced content sections
+    yield 'Heading1', 'High-Impact Publications Recommended'
+    yield None, 'AI has analyzed publication sources, citation counts, and media reach to recommend:'
+    yield None, '• Publications in top-tier media outlets (Washington Post, NYT, CNN)'
+    yield None, '• Academic papers with high citation potential'
+    yield None, '• Interview content with multimedia opportunities'
+    yield None, ''
+
+    # Faculty highlights
+    yield 'Heading1', 'Faculty Spotlight Analysis'
+    for faculty_name, count in model['faculty_counts'][:5]:
+        if count:
+            yield None, f'• {faculty_name}: {count} publications found'
+
+    yield None, ''
+
+    # AI recommendations
+    yield 'Heading1', 'AI Recommendations for CSRR in the News'
+    yield None, '1. Prioritize multimedia content (TV/radio interviews)'
+    yield None, '2. Feature publications from faculty with highest recent activity'
+    yield None, '3. Focus on timely topics with current relevance'
+    yield None, '4. Consider geographic diversity of publication sources'
+    yield None, '5. Update website: https://csrr.rutgers.edu/newsroom/csrr-in-the-news/'
+    yield None, ''
+
+    # Full listing, streamed row by row however many publications there are
+    yield 'Heading1', 'All Publications'
+    yield 'table', itertools.chain([model['columns'][:5]], (row[:5] for row in model['rows']))
+
+
+def render_docx(model, path):
+    write_docx(path, enhanced_report_blocks(model))
+    return str(path)
+
+
+_SpawnContext = type(multiprocessing.get_context('spawn'))
+
+
+class _WorkerProcess(_SpawnContext.Process):
+    """Spawned worker that does not re-import the parent's __main__ module"""
+
+    def start(self):
+        # The child's bootstrap data (including which main module to re-run) is captured in start()
+        with _start_lock:
+            main = sys.modules['__main__']
+            sys.modules['__main__'] = types.ModuleType('__main__')
+            try:
+                super().start()
+            finally:
+                sys.modules['__main__'] = main
+
+
+class _WorkerContext(_SpawnContext):
+    Process = _WorkerProcess
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded web server can copy held locks into the child
+            _pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=_WorkerContext())
+        return _pool
+
+
+def _reset_pool(broken):
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+
+
+def render_reports(model, jobs, on_done):
+    """Render {name: (renderer, path, *extra_args)} in parallel.
+
+    Returns immediately; `on_done(paths, errors)` is called once every renderer
+    has finished, with {name: path} and {name: error message}.
+    """
+    paths, errors = {}, {}
+    if not jobs:
+        on_done(paths, errors)
+        return
+    remaining = [len(jobs)]
+    lock = threading.Lock()
+    pool = _get_pool()
+
+    def settle():
+        with lock:
+            remaining[0] -= 1
+            done = remaining[0] == 0
+        if done:
+            on_done(paths, errors)
+
+    def finished(name, future):
+        try:
+            paths[name] = future.result()
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                _reset_pool(pool)  # A worker died; start a fresh pool next time
+            errors[name] = str(e) or e.__class__.__name__
+        settle()
+
+    for name, (renderer, path, *extra) in jobs.items():
+        try:
+            future = pool.submit(renderer, model, path, *extra)
+        except BrokenProcessPool as e:
+            _reset_pool(pool)
+            errors[name] = str(e)
+            settle()
+            continue
+        future.add_done_callback(lambda future, name=name: finished(name, future))
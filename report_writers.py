@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Streaming Report Writers
+Constant-memory Excel and Word output, whatever the number of publications
+
+Excel rows go through openpyxl's write-only mode, which flushes each row to
+disk. Word documents are assembled by streaming paragraph XML straight into
+the .docx zip, using python-docx's default template for styles. No document
+tree is ever built in memory.
+
+Word content is an iterable of blocks:
+    ('Title', text)            document title
+    ('Heading1', text)         section heading (also 'Heading2')
+    ('ListBullet', text)       bulleted item
+    (None, text)               normal paragraph ('' for a blank line)
+    ('table', rows)            grid table; rows is an iterable, first row is the header
+
+Paragraph blocks may carry a third item, the alignment: ('Title', text, 'center').
+"""
+
+import itertools
+import os
+import re
+import tempfile
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+DOCUMENT_PART = 'word/document.xml'
+# Characters XML 1.0 cannot contain (scraped titles occasionally carry them)
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _atomic_target(path):
+    """Temp file next to `path`, so readers never see a half-written report"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.stem}-', suffix=path.suffix)
+    os.close(fd)
+    os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; reports are shared
+    return Path(tmp_path)
+
+
+def write_xlsx(path, header, rows, sheet_title='Publications'):
+    """Stream `rows` (an iterable of sequences) into a single-sheet workbook; returns the row count"""
+    return write_xlsx_sheets(path, header, [(sheet_title, rows)])
+
+
+def write_xlsx_sheets(path, header, sheets):
+    """Stream several (title, rows) sheets sharing one header into a workbook; returns the row count"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+    count = 0
+    for sheet_title, rows in sheets:
+        sheet = workbook.create_sheet(sheet_title)
+        sheet.freeze_panes = 'A2'  # Write-only sheets ignore this once a row has been appended
+        header_cells = []
+        for name in header:
+            cell = WriteOnlyCell(sheet, value=name)
+            cell.font = bold
+            header_cells.append(cell)
+        sheet.append(header_cells)
+        for row in rows:
+            sheet.append([INVALID_XML_CHARS.sub('', value) if isinstance(value, str) else value for value in row])
+            count += 1
+    if not workbook.worksheets:
+        workbook.create_sheet('Publications').append(list(header))
+
+    tmp_path = _atomic_target(path)
+    try:
+        workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return count
+
+
+def _text(value):
+    return escape(INVALID_XML_CHARS.sub('', str(value)))
+
+
+def _run(text):
+    return f'<w:r><w:t xml:space="preserve">{_text(text)}</w:t></w:r>' if text != '' else ''
+
+
+def paragraph_xml(style, text, align=None):
+    properties = (f'<w:pStyle w:val="{style}"/>' if style else '') + (f'<w:jc w:val="{align}"/>' if align else '')
+    style_xml = f'<w:pPr>{properties}</w:pPr>' if properties else ''
+    return f'<w:p>{style_xml}{_run(text)}</w:p>'
+
+
+def _table_xml(rows):
+    """Yield a grid table one row at a time"""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+    grid = ''.join('<w:gridCol/>' for _ in header)
+    yield ('<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="0" w:type="auto"/>'
+           f'<w:tblLook w:val="04A0"/></w:tblPr><w:tblGrid>{grid}</w:tblGrid>')
+    for row in itertools.chain([header], rows):
+        cells = ''.join(f'<w:tc><w:p>{_run(value)}</w:p></w:tc>' for value in row)
+        yield f'<w:tr>{cells}</w:tr>'
+    yield '</w:tbl>'
+
+
+def _default_template():
+    import docx
+    return Path(docx.__file__).resolve().parent / 'templates' / 'default.docx'
+
+
+def write_docx(path, blocks, template=None):
+    """Stream `blocks` into a .docx built on python-docx's default template; returns the block count"""
+    template = Path(template or _default_template())
+    tmp_path = _atomic_target(path)
+    count = 0
+    try:
+        with zipfile.ZipFile(template) as source, \
+                zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                if item.filename != DOCUMENT_PART:
+                    target.writestr(item, source.read(item.filename))
+
+            # The template body holds only the section properties; stream our content in front of them
+            skeleton = source.read(DOCUMENT_PART).decode('utf-8')
+            body_start = skeleton.index('<w:body>') + len('<w:body>')
+            section_start = skeleton.index('<w:sectPr', body_start)
+
+            with target.open(DOCUMENT_PART, 'w') as document:
+                document.write(skeleton[:body_start].encode('utf-8'))
+                for style, content, *align in blocks:
+                    if style == 'table':
+                        for chunk in _table_xml(content):
+                            document.write(chunk.encode('utf-8'))
+                    else:
+                        document.write(paragraph_xml(style, content, *align).encode('utf-8'))
+                    count += 1
+                document.write(skeleton[section_start:].encode('utf-8'))
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return count
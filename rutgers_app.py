@@ -4,7 +4,7 @@ CSRR Faculty Tracker - Rutgers Law Themed Dashboard
 Real automation system for tracking faculty publications
 """
 
-from flask import Flask, render_template_string, request, redirect, url_for, flash, jsonify, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
 import pandas as pd
 from datetime import datetime, timedelta
 import os
@@ -13,20 +13,34 @@ import json
 from pathlib import Path
 import threading
 import time
+import uuid
 
 # Add the parent directory to path
 sys.path.append('/Users/azrabano')
 from csrr_faculty_tracker import CSRRFacultyTracker
+from template_cache import register_templates
+from static_assets import init_app as init_static_assets
+from http_compression import init_app as init_compression
+from report_links import init_app as init_report_links
+from report_writers import write_docx
+from report_manifest import ReportManifest
+from search_jobs import JobExecutor, QueueFull, no_progress
+from event_stream import sse_response
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'csrr-tracker-secret-key'
+init_static_assets(app)  # Self-hosted Bootstrap, Font Awesome, Chart.js and Plotly
+init_compression(app)  # gzip/brotli + weak ETags for HTML and JSON responses
 
 # Initialize tracker
 tracker = CSRRFacultyTracker()
+init_report_links(app, tracker.config['output']['reports_folder'])  # Signed links from monthly emails
 
 # In-memory storage for demo (replace with database in production)
 search_history = []
+search_jobs = JobExecutor(max_workers=1, max_queue=5)  # One roster search at a time
 email_subscribers = []
+report_manifest = ReportManifest()  # (run ID, format) -> report file, recorded when written
 
 @app.route('/')
 def dashboard():
@@ -40,34 +54,70 @@ def dashboard():
         'last_search': search_history[-1]['date'] if search_history else 'Never'
     }
     
-    return render_template_string(DASHBOARD_HTML, analytics=analytics, search_history=search_history[:5])
+    return render_template('inline/dashboard.html', analytics=analytics, search_history=search_history[:5])
 
 @app.route('/run-search', methods=['POST'])
 def run_search():
     """Start a new search and generate reports - REAL SEARCH"""
+    def make_record(search_id):
+        search_record = {
+            'id': search_id,
+            'run_id': uuid.uuid4().hex,  # Stable across restarts, unlike the in-memory id
+            'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'results': 0
+        }
+        search_history.append(search_record)
+        return search_record
     
-    # Add to search history
-    search_record = {
-        'id': len(search_history) + 1,
-        'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-        'status': 'Running',
-        'results': 0
-    }
-    search_history.append(search_record)
+    # Queue the search; repeated clicks while one is in flight join the existing job
+    try:
+        job, created = search_jobs.submit('monthly-search', background_search, make_record)
+    except QueueFull:
+        flash('Too many searches are waiting. Please try again once the current search finishes.', 'warning')
+        return redirect(url_for('dashboard'))
     
-    # Start background search with REAL faculty tracker
-    thread = threading.Thread(target=background_search, args=(search_record,))
-    thread.daemon = True
-    thread.start()
+    if not created:
+        flash(f'Search #{job.id} is already {job.state.lower()}; your request was merged into it.', 'info')
+        return redirect(url_for('dashboard'))
     
     flash('Faculty search started! This will search for publications by all 70+ CSRR faculty affiliates over the last 30 days.', 'success')
     return redirect(url_for('dashboard'))
 
-def background_search(search_record):
+@app.route('/jobs')
+def job_status():
+    """Queue depth and state of background search jobs"""
+    return jsonify(search_jobs.status())
+
+@app.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Request cancellation of a queued or running search"""
+    job = search_jobs.cancel(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<int:job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events stream of a search's progress and completion"""
+    job = search_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return sse_response(job.events, request.headers.get('Last-Event-ID'))
+
+def background_search(search_record, cancel_token=None, progress=no_progress):
     """Run the ACTUAL search in background"""
     try:
         # Run the real search using the faculty tracker
+        started = datetime.now()
         results_count = tracker.run_monthly_search()
+        progress('progress', stage='news', results=results_count)
+        
+        if cancel_token is not None and cancel_token.is_set():
+            return  # The job executor marks the search Cancelled
+        
+        # Index the Excel file the tracker wrote for this run
+        report_manifest.record_outputs_since(search_record['run_id'], tracker.config['output']['reports_folder'],
+                                             started, formats=('xlsx',))
         
         # Update search record with real results
         search_record['status'] = 'Completed'
@@ -83,71 +133,66 @@ def background_search(search_record):
         search_record['error'] = str(e)
         print(f"Search failed: {e}")
 
+def word_report_blocks(results_count):
+    """Word report content in CSRR format, yielded block by block (see report_writers)"""
+    # Title with CSRR branding
+    yield 'Title', f'CSRR Faculty Affiliates Publications - {datetime.now().strftime("%B %Y")}', 'center'
+    
+    # Header info
+    yield None, f'Center for Security, Race and Rights'
+    yield None, f'Rutgers Law School'
+    yield None, f'Report Generated: {datetime.now().strftime("%B %d, %Y")}'
+    yield None, ''
+    
+    # Summary section
+    yield 'Heading1', 'Executive Summary'
+    yield None, f'Total Publications Found: {results_count}'
+    yield None, f'Search Period: {(datetime.now() - timedelta(days=30)).strftime("%B %d")} - {datetime.now().strftime("%B %d, %Y")}'
+    yield None, f'Faculty Affiliates Monitored: {len(tracker.faculty_names)}'
+    yield None, ''
+    
+    # Content types searched
+    yield 'Heading1', 'Content Types Monitored'
+    yield None, '• Op-Eds and Opinion Pieces'
+    yield None, '• Print Media Interviews'
+    yield None, '• Television and Radio Interviews'
+    yield None, '• Podcast Appearances'
+    yield None, '• Academic Articles and Commentary'
+    yield None, ''
+    
+    # Note about real data
+    if results_count > 0:
+        yield 'Heading1', 'Publications Found'
+        yield None, 'Detailed publication data has been generated and saved in the Excel report. Please review the Excel file for complete information including:'
+        yield None, '• Faculty member names and affiliations'
+        yield None, '• Publication titles and descriptions'
+        yield None, '• Source publications and URLs'
+        yield None, '• Publication dates and search terms used'
+    else:
+        yield 'Heading1', 'No Publications Found'
+        yield None, 'No new publications were found during this search period. This could be due to:'
+        yield None, '• Limited recent activity by faculty affiliates'
+        yield None, '• Search engine limitations or rate limiting'
+        yield None, '• Changes in publication patterns or timing'
+    
+    yield None, ''
+    
+    # Recommendations for CSRR in the News
+    yield 'Heading1', 'Next Steps for CSRR in the News'
+    yield None, '1. Review the accompanying Excel report for detailed publication information'
+    yield None, '2. Select high-impact publications for featuring on the CSRR website'
+    yield None, '3. Prioritize publications from major media outlets (Washington Post, NYT, CNN, etc.)'
+    yield None, '4. Consider multimedia content (TV/radio interviews) for diverse content types'
+    yield None, '5. Update the CSRR in the News section: https://csrr.rutgers.edu/newsroom/csrr-in-the-news/'
+
 def generate_word_report(search_record, results_count):
     """Generate Word document in CSRR format for website review"""
     try:
-        from docx import Document
-        from docx.shared import Inches
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        
-        doc = Document()
-        
-        # Title with CSRR branding
-        title = doc.add_heading(f'CSRR Faculty Affiliates Publications - {datetime.now().strftime("%B %Y")}', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Header info
-        doc.add_paragraph(f'Center for Security, Race and Rights')
-        doc.add_paragraph(f'Rutgers Law School')
-        doc.add_paragraph(f'Report Generated: {datetime.now().strftime("%B %d, %Y")}')
-        doc.add_paragraph('')
-        
-        # Summary section
-        doc.add_heading('Executive Summary', level=1)
-        doc.add_paragraph(f'Total Publications Found: {results_count}')
-        doc.add_paragraph(f'Search Period: {(datetime.now() - timedelta(days=30)).strftime("%B %d")} - {datetime.now().strftime("%B %d, %Y")}')
-        doc.add_paragraph(f'Faculty Affiliates Monitored: {len(tracker.faculty_names)}')
-        doc.add_paragraph('')
-        
-        # Content types searched
-        doc.add_heading('Content Types Monitored', level=1)
-        doc.add_paragraph('• Op-Eds and Opinion Pieces')
-        doc.add_paragraph('• Print Media Interviews')
-        doc.add_paragraph('• Television and Radio Interviews')
-        doc.add_paragraph('• Podcast Appearances')
-        doc.add_paragraph('• Academic Articles and Commentary')
-        doc.add_paragraph('')
-        
-        # Note about real data
-        if results_count > 0:
-            doc.add_heading('Publications Found', level=1)
-            doc.add_paragraph('Detailed publication data has been generated and saved in the Excel report. Please review the Excel file for complete information including:')
-            doc.add_paragraph('• Faculty member names and affiliations')
-            doc.add_paragraph('• Publication titles and descriptions')
-            doc.add_paragraph('• Source publications and URLs')
-            doc.add_paragraph('• Publication dates and search terms used')
-        else:
-            doc.add_heading('No Publications Found', level=1)
-            doc.add_paragraph('No new publications were found during this search period. This could be due to:')
-            doc.add_paragraph('• Limited recent activity by faculty affiliates')
-            doc.add_paragraph('• Search engine limitations or rate limiting')
-            doc.add_paragraph('• Changes in publication patterns or timing')
-        
-        doc.add_paragraph('')
-        
-        # Recommendations for CSRR in the News
-        doc.add_heading('Next Steps for CSRR in the News', level=1)
-        doc.add_paragraph('1. Review the accompanying Excel report for detailed publication information')
-        doc.add_paragraph('2. Select high-impact publications for featuring on the CSRR website')
-        doc.add_paragraph('3. Prioritize publications from major media outlets (Washington Post, NYT, CNN, etc.)')
-        doc.add_paragraph('4. Consider multimedia content (TV/radio interviews) for diverse content types')
-        doc.add_paragraph('5. Update the CSRR in the News section: https://csrr.rutgers.edu/newsroom/csrr-in-the-news/')
-        
-        # Save document
+        # Save document, streamed straight to disk
         reports_dir = Path('/Users/azrabano/CSRR_Reports')
-        reports_dir.mkdir(exist_ok=True)
         doc_path = reports_dir / search_record['word_report']
-        doc.save(doc_path)
+        write_docx(doc_path, word_report_blocks(results_count))
+        report_manifest.record(search_record['run_id'], doc_path)
         
         search_record['word_path'] = str(doc_path)
         
@@ -171,20 +216,16 @@ def subscribe():
 
 @app.route('/download-report/<int:search_id>/<report_type>')
 def download_report(search_id, report_type):
-    """Download Excel or Word report"""
-    if search_id <= len(search_history):
+    """Download the Excel or Word report produced by this search"""
+    report_format = {'excel': 'xlsx', 'word': 'docx'}.get(report_type)
+    if report_format and 0 < search_id <= len(search_history):
         search = search_history[search_id - 1]
-        if report_type == 'excel':
-            # Find the most recent Excel report
-            reports_dir = Path('/Users/azrabano/CSRR_Reports')
-            if reports_dir.exists():
-                excel_files = list(reports_dir.glob('*.xlsx'))
-                if excel_files:
-                    latest_excel = max(excel_files, key=lambda f: f.stat().st_mtime)
-                    return send_file(latest_excel, as_attachment=True)
-            flash('Excel report not found', 'error')
-        elif report_type == 'word' and 'word_path' in search:
-            return send_file(search['word_path'], as_attachment=True)
+        entry = report_manifest.get(search.get('run_id'), report_format)
+        # A later run on the same day may have overwritten the file
+        if entry and os.path.isfile(entry['path']) and os.path.getsize(entry['path']) == entry['size']:
+            return send_file(entry['path'], as_attachment=True)
+        flash(f'{report_type.title()} report not found for this search', 'error')
+        return redirect(url_for('dashboard'))
     
     flash('Report not found', 'error')
     return redirect(url_for('dashboard'))
@@ -192,7 +233,7 @@ def download_report(search_id, report_type):
 @app.route('/faculty-list')
 def faculty_list():
     """Display all CSRR faculty members"""
-    return render_template_string(FACULTY_LIST_HTML, faculty_names=tracker.faculty_names)
+    return render_template('inline/faculty_list.html', faculty_names=tracker.faculty_names)
 
 # Rutgers Law themed HTML Templates
 DASHBOARD_HTML = '''
@@ -202,8 +243,8 @@ DASHBOARD_HTML = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>CSRR Faculty Tracker | Rutgers Law</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+    <link href="{{ asset_url('bootstrap.min.css') }}" rel="stylesheet">
+    <link href="{{ asset_url('fontawesome.min.css') }}" rel="stylesheet">
     <style>
         :root {
             --rutgers-red: #CC0033;
@@ -392,8 +433,9 @@ DASHBOARD_HTML = '''
                                         <td>
                                             {% if search.status == 'Completed' %}
                                                 <span class="badge bg-success">{{ search.status }}</span>
-                                            {% elif search.status == 'Running' %}
+                                            {% elif search.status in ('Running', 'Queued') %}
                                                 <span class="badge bg-primary">{{ search.status }}</span>
+                                                <small class="d-block text-muted" data-search-progress="{{ search.id }}"></small>
                                             {% else %}
                                                 <span class="badge bg-danger">{{ search.status }}</span>
                                             {% endif %}
@@ -507,7 +549,8 @@ DASHBOARD_HTML = '''
         </div>
     </footer>
 
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
+    <script src="{{ asset_url('bootstrap.bundle.min.js') }}"></script>
+    <script src="{{ asset_url('search_progress.js') }}" defer></script>
 </body>
 </html>
 '''
@@ -519,8 +562,8 @@ FACULTY_LIST_HTML = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>CSRR Faculty Affiliates | Rutgers Law</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+    <link href="{{ asset_url('bootstrap.min.css') }}" rel="stylesheet">
+    <link href="{{ asset_url('fontawesome.min.css') }}" rel="stylesheet">
     <style>
         :root {
             --rutgers-red: #CC0033;
@@ -580,6 +623,12 @@ FACULTY_LIST_HTML = '''
 </html>
 '''
 
+# Compile the inline templates once; routes render them by name
+register_templates(app, {
+    'dashboard.html': DASHBOARD_HTML,
+    'faculty_list.html': FACULTY_LIST_HTML,
+})
+
 if __name__ == '__main__':
     print("🚀 Starting Rutgers CSRR Faculty Tracker on http://127.0.0.1:3000")
     print("🏛️  Rutgers Law School themed dashboard with real faculty search functionality")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Sample Data Snapshots
+Pre-generates demo publications once so every worker and serverless instance loads identical data
+
+Dates are stored as ages in days and rebased on today when a snapshot is
+loaded, so a shipped snapshot keeps showing recent publications.
+
+Usage (at build/deploy time):
+    python sample_snapshot.py app working_app
+"""
+
+import importlib
+import os
+import pickle
+import random
+import sys
+import tempfile
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+SNAPSHOT_DIR = Path(__file__).resolve().parent / 'snapshots'
+SNAPSHOT_SEED = 2024
+SNAPSHOT_FORMAT = 2  # 2: dates stored as 'age_days' offsets
+
+
+def snapshot_path(name):
+    """Location of the snapshot file for an app module"""
+    return SNAPSHOT_DIR / f'{name}.pickle'
+
+
+def snapshot_anchor():
+    """Midnight today, so fallback builds on the same day produce the same dates"""
+    return datetime.combine(datetime.now().date(), time())
+
+
+def to_offsets(data, anchor):
+    """Copy of the publications dict with each datetime 'date' replaced by its age in days before `anchor`"""
+    offsets = {}
+    for faculty, pubs in data.items():
+        offsets[faculty] = []
+        for pub in pubs:
+            pub = dict(pub)
+            if isinstance(pub.get('date'), datetime):
+                pub['age_days'] = (anchor - pub.pop('date')) / timedelta(days=1)
+            offsets[faculty].append(pub)
+    return offsets
+
+
+def rebase(offsets, anchor):
+    """Publications dict with dates `age_days` before `anchor` (inverse of to_offsets)"""
+    data = {}
+    for faculty, pubs in offsets.items():
+        data[faculty] = []
+        for pub in pubs:
+            pub = dict(pub)
+            if 'age_days' in pub:
+                pub['date'] = anchor - timedelta(days=pub.pop('age_days'))
+            data[faculty].append(pub)
+    return data
+
+
+def write_snapshot(name, data, anchor):
+    """Atomically write a snapshot so concurrent workers never read a partial file"""
+    SNAPSHOT_DIR.mkdir(exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix='.tmp')
+    snapshot = {'format': SNAPSHOT_FORMAT, 'publications': to_offsets(data, anchor)}
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, snapshot_path(name))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_snapshot(name, builder):
+    """Load the snapshot for `name`, building it from a seeded RNG if it is missing.
+
+    `builder(rng, anchor)` must return the publications dict. Dates are rebased on
+    midnight today. The fixed seed keeps fallback builds identical across workers
+    when no snapshot file was shipped.
+    """
+    path = snapshot_path(name)
+    anchor = snapshot_anchor()
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+        if isinstance(snapshot, dict) and snapshot.get('format') == SNAPSHOT_FORMAT:
+            return rebase(snapshot['publications'], anchor)
+        print(f"Rebuilding snapshot {path} from an older format")
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        print(f"Ignoring unreadable snapshot {path}: {e}")
+
+    data = builder(random.Random(SNAPSHOT_SEED), anchor)
+    try:
+        write_snapshot(name, data, anchor)
+    except OSError as e:
+        # Read-only filesystems (e.g. serverless) still get deterministic data
+        print(f"Could not write snapshot {path}: {e}")
+    return data
+
+
+def build_snapshots(module_names):
+    """Regenerate snapshots for the given app modules"""
+    for name in module_names:
+        module = importlib.import_module(name)
+        anchor = snapshot_anchor()
+        data = module.build_sample_publications(random.Random(SNAPSHOT_SEED), anchor)
+        write_snapshot(name, data, anchor)
+        total = sum(len(pubs) for pubs in data.values())
+        print(f"Wrote {snapshot_path(name)} ({total} publications, {snapshot_path(name).stat().st_size} bytes)")
+
+
+if __name__ == '__main__':
+    build_snapshots(sys.argv[1:] or ['app'])
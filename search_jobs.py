@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Background Search Jobs
+Bounded worker pool for /run-search with coalescing, cancellation and queryable job state
+"""
+
+import itertools
+import queue
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from event_stream import EventLog
+
+QUEUED = 'Queued'
+RUNNING = 'Running'
+COMPLETED = 'Completed'
+FAILED = 'Failed'
+CANCELLED = 'Cancelled'
+FINISHED_STATES = {COMPLETED, FAILED, CANCELLED}
+
+
+def no_progress(event, **data):
+    """Default progress callback for searches run outside the executor"""
+
+
+class QueueFull(Exception):
+    """Raised when the executor already has max_queue jobs waiting"""
+
+
+class SearchJob:
+    def __init__(self, job_id, key, record, target):
+        self.id = job_id
+        self.key = key
+        self.record = record  # The search_history entry shown on the dashboard
+        self.target = target
+        self.cancel_token = threading.Event()
+        self.events = EventLog()  # Progress stream for /jobs/<id>/events
+        self.submitted_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def state(self):
+        return self.record.get('status', QUEUED)
+
+    @property
+    def finished(self):
+        return self.state in FINISHED_STATES
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'key': self.key,
+            'state': self.state,
+            'results': self.record.get('results', 0),
+            'cancel_requested': self.cancel_token.is_set(),
+            'submitted_at': self.submitted_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobExecutor:
+    """Runs search jobs on a fixed number of daemon workers fed by a bounded queue.
+
+    Submitting a key that is already queued or running returns the existing job
+    instead of starting another roster-wide search.
+    """
+
+    def __init__(self, max_workers=1, max_queue=5, history_size=100):
+        self.max_workers = max_workers
+        self.history_size = history_size
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = OrderedDict()  # id -> job, oldest first
+        self._active = {}  # coalescing key -> unfinished job
+        self._workers = []
+
+    def submit(self, key, target, make_record):
+        """Queue `target(record, cancel_token, progress)` unless a job with `key` is in flight.
+
+        `progress(event, **data)` publishes to the job's SSE stream.
+        `make_record(job_id)` builds (and stores) the search record; it runs
+        under the executor lock so IDs and search_history order always agree.
+        Returns (job, created).
+        """
+        with self._lock:
+            active = self._active.get(key)
+            if active and not active.finished:
+                return active, False
+            if self._queue.full():
+                raise QueueFull(f"{self._queue.qsize()} searches already waiting")
+
+            job_id = next(self._ids)
+            record = make_record(job_id)
+            record['status'] = QUEUED
+            job = SearchJob(job_id, key, record, target)
+            self._jobs[job_id] = job
+            self._active[key] = job
+            self._trim_history()
+            job.events.publish('queued', id=job_id, queue_depth=self._queue.qsize() + 1)
+            self._queue.put_nowait(job)
+            self._ensure_workers()
+        return job, True
+
+    def cancel(self, job_id):
+        """Request cancellation; queued jobs are dropped before they start"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job.finished:
+                return job
+            job.cancel_token.set()
+            if job.state == QUEUED:
+                self._finish(job, CANCELLED)
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def status(self):
+        """Snapshot of queue depth and every tracked job"""
+        with self._lock:
+            jobs = [job.to_dict() for job in self._jobs.values()]
+        return {
+            'queue_depth': self._queue.qsize(),
+            'max_queue': self._queue.maxsize,
+            'workers': self.max_workers,
+            'running': sum(1 for job in jobs if job['state'] == RUNNING),
+            'jobs': jobs,
+        }
+
+    def _ensure_workers(self):
+        # Started lazily so importing an app (or forking workers) never spawns threads
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name=f'search-worker-{len(self._workers) + 1}')
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job):
+        with self._lock:
+            if job.finished:  # Cancelled while queued
+                return
+            job.started_at = datetime.now()
+            job.record['status'] = RUNNING
+        job.events.publish('running', id=job.id)
+
+        try:
+            job.target(job.record, job.cancel_token, job.events.publish)
+        except Exception as e:
+            job.record['error'] = str(e)
+            job.record['status'] = FAILED
+            print(f"Search job {job.id} failed: {e}")
+
+        with self._lock:
+            if job.cancel_token.is_set() and job.state == RUNNING:
+                self._finish(job, CANCELLED)
+            elif job.state not in FINISHED_STATES:
+                # Targets set Completed/Failed themselves; anything else counts as done
+                self._finish(job, COMPLETED)
+            else:
+                self._finish(job, job.state)
+
+    def _finish(self, job, state):
+        job.record['status'] = state
+        job.finished_at = datetime.now()
+        job.events.publish(state.lower(), id=job.id, results=job.record.get('results', 0),
+                           error=job.record.get('error'))
+        job.events.close()
+        if self._active.get(job.key) is job:
+            del self._active[job.key]
+
+    def _trim_history(self):
+        while len(self._jobs) > self.history_size:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if not oldest.finished:
+                break
+            del self._jobs[oldest_id]
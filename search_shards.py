@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Checkpointed Search Shards
+Splits a roster search into per-faculty shards with durable completion records so restarts resume
+
+A run is a list of shard names (e.g. '__news__' plus one per faculty member).
+Shards are leased for a limited time by whichever process executes them: the
+app that started the run, or any shard_worker.py pointed at the same store.
+Leases are renewed while a shard runs; an expired lease (crashed worker) makes
+the shard available again. Each finished shard stores its JSON result, and the
+app merges everything once no shard is left.
+
+The store is chosen with CSRR_SHARD_STORE: a SQLite path (or sqlite:///path),
+or 'module:factory' for another backend implementing the ShardStore methods.
+The SQLite store runs in WAL mode, which needs every process on one machine
+(WAL does not work over network filesystems); workers on other machines need
+a server-backed store. Lease and heartbeat times are UTC, so hosts in other
+time zones, or a DST change, never make a live lease look expired.
+"""
+
+import importlib
+import json
+import os
+import re
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / 'instance' / 'search_shards.db'
+STALE_AFTER = timedelta(minutes=10)  # Runs on other hosts with no checkpoint for this long are abandoned
+LEASE_SECONDS = 120  # Renewed every third of this while a shard runs
+MAX_ATTEMPTS = 3  # Leases per shard before the run gives up on it
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_runs (
+    run_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    record TEXT NOT NULL,
+    owner TEXT,
+    heartbeat_at TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS search_shards (
+    run_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    shard TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_token TEXT,
+    lease_owner TEXT,
+    lease_expires_at TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, shard)
+);
+"""
+LEASE_COLUMNS = ('lease_token', 'lease_owner', 'lease_expires_at')
+
+ShardLease = namedtuple('ShardLease', 'run_id kind shard token')
+
+
+def _now(offset_seconds=0):
+    """UTC timestamp; ISO strings with the same offset compare correctly as text in SQL"""
+    return (datetime.now(timezone.utc) + timedelta(seconds=offset_seconds)).isoformat(timespec='seconds')
+
+
+def process_owner():
+    """Identifies the process holding a run, e.g. 'hostname:1234'"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_gone(owner):
+    """True when `owner` is a process on this host that no longer exists"""
+    host, _, pid = owner.rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+class ShardStore:
+    """SQLite-backed completion records for search shards"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Stores created before leases existed
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(search_shards)')}
+            for column in LEASE_COLUMNS:
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE search_shards ADD COLUMN {column} TEXT')
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def start_run(self, kind, shards, record):
+        """Persist a new run and its shards; returns the run ID"""
+        run_id = uuid.uuid4().hex
+        now = _now()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'INSERT INTO search_runs (run_id, kind, status, record, owner, heartbeat_at, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (run_id, kind, PENDING, json.dumps(record, default=str), process_owner(), now, now)
+            )
+            conn.executemany(
+                'INSERT INTO search_shards (run_id, position, shard, status, updated_at) VALUES (?, ?, ?, ?, ?)',
+                [(run_id, position, shard, PENDING, now) for position, shard in enumerate(shards)]
+            )
+        return run_id
+
+    def claim_abandoned_runs(self, kind):
+        """Take over unfinished runs whose owner died or stopped checkpointing; returns [(run_id, record)]"""
+        stale_before = _now(-STALE_AFTER.total_seconds())
+        owner = process_owner()
+        claimed = []
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                'SELECT run_id, record, owner, heartbeat_at FROM search_runs '
+                'WHERE kind = ? AND status = ? ORDER BY created_at',
+                (kind, PENDING)
+            ).fetchall()
+            for run_id, record, previous_owner, heartbeat_at in rows:
+                abandoned = previous_owner is None or heartbeat_at < stale_before or _owner_gone(previous_owner)
+                if not abandoned or previous_owner == owner:
+                    continue
+                # Compare-and-swap on what we read so only one process wins each run
+                updated = conn.execute(
+                    'UPDATE search_runs SET owner = ?, heartbeat_at = ? '
+                    'WHERE run_id = ? AND status = ? AND owner IS ? AND heartbeat_at = ?',
+                    (owner, _now(), run_id, PENDING, previous_owner, heartbeat_at)
+                ).rowcount
+                if updated:
+                    claimed.append((run_id, json.loads(record)))
+        return claimed
+
+    def pending_shards(self, run_id):
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT shard FROM search_shards WHERE run_id = ? AND status != ? ORDER BY position',
+                (run_id, DONE)
+            ).fetchall()
+        return [shard for (shard,) in rows]
+
+    def results(self, run_id):
+        """Results of every completed shard, in shard order"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT shard, result FROM search_shards WHERE run_id = ? AND status = ? ORDER BY position',
+                (run_id, DONE)
+            ).fetchall()
+        return {shard: json.loads(result) for shard, result in rows}
+
+    def lease_shard(self, worker, kind=None, run_id=None, lease_for=LEASE_SECONDS):
+        """Atomically lease the next runnable shard of an active run; returns a ShardLease or None"""
+        token = uuid.uuid4().hex
+        now = _now()
+        filters, params = '', []
+        if kind is not None:
+            filters += ' AND r.kind = ?'
+            params.append(kind)
+        if run_id is not None:
+            filters += ' AND s.run_id = ?'
+            params.append(run_id)
+        # A single UPDATE is atomic in SQLite, so two workers can never win the same shard
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'UPDATE search_shards SET lease_token = ?, lease_owner = ?, lease_expires_at = ?, '
+                'attempts = attempts + 1, updated_at = ? '
+                'WHERE rowid = (SELECT s.rowid FROM search_shards s JOIN search_runs r ON r.run_id = s.run_id '
+                '    WHERE r.status = ? AND s.status != ? AND s.attempts < ? '
+                '    AND (s.lease_expires_at IS NULL OR s.lease_expires_at < ?)' + filters +
+                '    ORDER BY r.created_at, s.position LIMIT 1)',
+                [token, worker, _now(lease_for), now, PENDING, DONE, MAX_ATTEMPTS, now] + params
+            )
+            row = conn.execute(
+                'SELECT s.run_id, r.kind, s.shard FROM search_shards s JOIN search_runs r ON r.run_id = s.run_id '
+                'WHERE s.lease_token = ?', (token,)
+            ).fetchone()
+        return ShardLease(*row, token) if row else None
+
+    def renew_lease(self, lease, lease_for=LEASE_SECONDS):
+        """Extend a lease; False if it expired and another worker took the shard.
+
+        When the worker also owns the run, the run's heartbeat moves too, so a long
+        shard does not make a live run look abandoned to claim_abandoned_runs.
+        """
+        now = _now()
+        with self._lock, self._connect() as conn:
+            renewed = conn.execute(
+                'UPDATE search_shards SET lease_expires_at = ? WHERE lease_token = ? AND status != ?',
+                (_now(lease_for), lease.token, DONE)
+            ).rowcount == 1
+            if renewed:
+                conn.execute(
+                    'UPDATE search_runs SET heartbeat_at = ? WHERE run_id = ? '
+                    'AND owner = (SELECT lease_owner FROM search_shards WHERE lease_token = ?)',
+                    (now, lease.run_id, lease.token)
+                )
+        return renewed
+
+    def reset_attempts(self, run_id):
+        """Give shards that used up their attempts a fresh budget (when a run is resumed)"""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'UPDATE search_shards SET attempts = 0 WHERE run_id = ? AND status != ? '
+                'AND (lease_expires_at IS NULL OR lease_expires_at < ?)',
+                (run_id, DONE, _now())
+            )
+
+    def exhausted_shards(self, run_id):
+        """Unfinished shards that will not be leased again"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT shard FROM search_shards WHERE run_id = ? AND status != ? AND attempts >= ? '
+                'AND (lease_expires_at IS NULL OR lease_expires_at < ?) ORDER BY position',
+                (run_id, DONE, MAX_ATTEMPTS, _now())
+            ).fetchall()
+        return [shard for (shard,) in rows]
+
+    def shard_count(self, run_id):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM search_shards WHERE run_id = ?', (run_id,)).fetchone()[0]
+
+    def complete_shard(self, lease, result, record=None):
+        """Durably record a shard result; False if the lease was lost and the result discarded"""
+        now = _now()
+        with self._lock, self._connect() as conn:
+            updated = conn.execute(
+                'UPDATE search_shards SET status = ?, result = ?, error = NULL, lease_token = NULL, '
+                'lease_owner = NULL, lease_expires_at = NULL, updated_at = ? WHERE lease_token = ?',
+                (DONE, json.dumps(result, default=str), now, lease.token)
+            ).rowcount == 1
+            if updated and record is not None:
+                self.touch_run(lease.run_id, record, conn)
+        return updated
+
+    def fail_shard(self, lease, error, record=None):
+        """Release a shard after an error so it can be retried right away"""
+        now = _now()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'UPDATE search_shards SET status = ?, error = ?, lease_token = NULL, lease_owner = NULL, '
+                'lease_expires_at = NULL, updated_at = ? WHERE lease_token = ?',
+                (FAILED, str(error), now, lease.token)
+            )
+            if record is not None:
+                self.touch_run(lease.run_id, record, conn)
+
+    def finish_run(self, run_id, status, record):
+        now = _now()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'UPDATE search_runs SET status = ?, record = ?, owner = NULL, heartbeat_at = ?, finished_at = ? '
+                'WHERE run_id = ?',
+                (status, json.dumps(record, default=str), now, now, run_id)
+            )
+
+    def touch_run(self, run_id, record, conn=None):
+        """Heartbeat from the process that owns the run, saving its latest search record"""
+        if conn is None:
+            with self._lock, self._connect() as conn:
+                return self.touch_run(run_id, record, conn)
+        conn.execute('UPDATE search_runs SET heartbeat_at = ?, record = ? WHERE run_id = ?',
+                     (_now(), json.dumps(record, default=str), run_id))
+
+
+def open_store(spec=None):
+    """ShardStore for `spec` (default: CSRR_SHARD_STORE, else instance/search_shards.db)"""
+    spec = spec or os.environ.get('CSRR_SHARD_STORE') or str(DEFAULT_DB_PATH)
+    if re.fullmatch(r'[\w.]+:\w+', spec):
+        module_name, factory = spec.split(':')
+        return getattr(importlib.import_module(module_name), factory)()
+    if spec.startswith('sqlite:///'):
+        spec = spec[len('sqlite:///'):]
+    return ShardStore(spec)
+
+
+def execute_lease(store, lease, handle_shard, lease_for=LEASE_SECONDS, record=None):
+    """Run one leased shard, renewing the lease meanwhile; returns (completed, result)"""
+    stop = threading.Event()
+
+    def keep_leased():
+        while not stop.wait(lease_for / 3):
+            if not store.renew_lease(lease, lease_for):
+                print(f"Lease on shard {lease.shard} of run {lease.run_id} was lost")
+                return
+
+    renewer = threading.Thread(target=keep_leased, name=f'lease-{lease.shard}', daemon=True)
+    renewer.start()
+    try:
+        result = handle_shard(lease.shard)
+    except Exception as e:
+        store.fail_shard(lease, e, record)
+        print(f"Shard {lease.shard} of run {lease.run_id} failed: {e}")
+        return False, None
+    finally:
+        stop.set()
+    return store.complete_shard(lease, result, record), result
+
+
+def run_shards(store, run_id, handle_shard, record, cancel_token=None, progress=None,
+               lease_for=LEASE_SECONDS, poll_interval=2):
+    """Work through the shards of `run_id`, alongside any shard workers, until none are left.
+
+    `handle_shard(shard)` returns a JSON-serializable result. Returns True when all
+    shards are done; False if cancelled or if a shard used up its attempts.
+    """
+    store.reset_attempts(run_id)
+    worker = process_owner()
+    total = store.shard_count(run_id)
+    done = total - len(store.pending_shards(run_id))
+
+    while True:
+        if cancel_token is not None and cancel_token.is_set():
+            return False
+
+        lease = store.lease_shard(worker, run_id=run_id, lease_for=lease_for)
+        if lease is not None:
+            completed, result = execute_lease(store, lease, handle_shard, lease_for, record)
+            if completed and progress:
+                done += 1
+                # Internal shards are named like '__news__'; everything else is a faculty member
+                label = {'stage': lease.shard.strip('_')} if lease.shard.startswith('__') else {'faculty': lease.shard}
+                results = len(result) if isinstance(result, (list, dict)) else result
+                progress('progress', index=done, total=total, results=results, **label)
+            continue
+
+        # Nothing leasable: the rest is leased by other workers, exhausted, or finished
+        remaining = len(store.pending_shards(run_id))
+        if not remaining:
+            return True
+        if store.exhausted_shards(run_id):
+            return False
+        if progress and total - remaining != done:
+            done = total - remaining
+            progress('progress', index=done, total=total)
+        store.touch_run(run_id, record)
+        if cancel_token is not None:
+            cancel_token.wait(poll_interval)
+        else:
+            time.sleep(poll_interval)
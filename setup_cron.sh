@@ -3,8 +3,9 @@
 
 echo "Setting up cron job for monthly CSRR automation..."
 
-# Create a cron job that runs on the 30th of each month at 9:00 AM
-CRON_JOB="0 9 30 * * cd /Users/azrabano/csrr-dashboard && python monthly_automation.py"
+# Check hourly for due jobs; the scheduler state decides when the monthly search
+# (30th at 9:00 AM) actually runs, and catches up after the machine was off
+CRON_JOB="0 * * * * cd /Users/azrabano/csrr-dashboard && python monthly_automation.py --run-due"
 
 # Add to crontab
 (crontab -l 2>/dev/null; echo "$CRON_JOB") | crontab -
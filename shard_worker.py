@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Search Shard Worker
+Leases faculty search shards from the shared shard store and executes them
+
+Start any number of these next to the app (the SQLite store is local to one
+machine; workers elsewhere need a server-backed store given as module:factory):
+    python shard_worker.py
+    python shard_worker.py --threads 4 --store instance/search_shards.db
+    python shard_worker.py --once   # exit when nothing is left to lease
+"""
+
+import argparse
+import importlib
+import threading
+
+from search_shards import LEASE_SECONDS, execute_lease, open_store, process_owner
+
+# Run kind -> 'module:function' executing one shard of that kind
+SHARD_HANDLERS = {
+    'enhanced-search': 'advanced_app:search_shard',
+}
+
+
+def load_handler(spec):
+    """Import a 'module:function' shard handler"""
+    module_name, function_name = spec.split(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def work(store, kind, handle_shard, worker_id, stop, lease_for=LEASE_SECONDS, idle_seconds=5, once=False):
+    """Lease and execute shards until `stop` is set (or, with once, until none are available)"""
+    completed = 0
+    while not stop.is_set():
+        lease = store.lease_shard(worker_id, kind=kind, lease_for=lease_for)
+        if lease is None:
+            if once:
+                break
+            stop.wait(idle_seconds)
+            continue
+
+        print(f"[{worker_id}] {lease.shard} (run {lease.run_id[:8]})")
+        done, _ = execute_lease(store, lease, handle_shard, lease_for)
+        completed += done
+    return completed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Execute search shards leased from the shard store')
+    parser.add_argument('--kind', default='enhanced-search', choices=sorted(SHARD_HANDLERS))
+    parser.add_argument('--handler', help="Override the shard handler, as 'module:function'")
+    parser.add_argument('--store', help='SQLite path or module:factory (default: CSRR_SHARD_STORE)')
+    parser.add_argument('--threads', type=int, default=1, help='Shards executed concurrently by this process')
+    parser.add_argument('--lease', type=int, default=LEASE_SECONDS, help='Lease length in seconds')
+    parser.add_argument('--idle', type=float, default=5, help='Seconds to wait when no shard is available')
+    parser.add_argument('--once', action='store_true', help='Exit when no shard is available')
+    args = parser.parse_args()
+
+    store = open_store(args.store)
+    handle_shard = load_handler(args.handler or SHARD_HANDLERS[args.kind])
+    stop = threading.Event()
+    owner = process_owner()
+
+    threads = []
+    for number in range(1, args.threads + 1):
+        thread = threading.Thread(
+            target=work, name=f'shard-worker-{number}', daemon=True,
+            args=(store, args.kind, handle_shard, f'{owner}/{number}', stop, args.lease, args.idle, args.once)
+        )
+        thread.start()
+        threads.append(thread)
+
+    print(f"🔧 Shard worker {owner} running {args.threads} thread(s) for '{args.kind}' shards")
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(1)
+    except KeyboardInterrupt:
+        # Unfinished leases simply expire and are picked up by another worker
+        print("Stopping shard worker")
+        stop.set()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+// CSRR Faculty Tracker - search progress
+// Follows running searches over SSE instead of reloading the whole dashboard.
+// Each <el data-search-progress="JOB_ID" data-progress-unit="faculty"> shows its job's progress.
+document.querySelectorAll('[data-search-progress]').forEach(function (el) {
+    const unit = el.dataset.progressUnit || 'faculty';
+    const source = new EventSource('/jobs/' + el.dataset.searchProgress + '/events');
+    source.addEventListener('running', function () { el.textContent = 'Searching...'; });
+    source.addEventListener('progress', function (e) {
+        const d = JSON.parse(e.data);
+        const parts = [];
+        if (d.total) parts.push(d.index + '/' + d.total + ' ' + unit);
+        if (d.faculty) parts.push(d.faculty);
+        if (d.results !== undefined) parts.push(d.results + ' results');
+        el.textContent = parts.join(' · ');
+    });
+    ['completed', 'failed', 'cancelled'].forEach(function (type) {
+        source.addEventListener(type, function () {
+            source.close();
+            window.location.reload();
+        });
+    });
+});
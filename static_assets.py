@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Self-Hosted Static Asset Bundle
+Vendors pinned front-end libraries with content-hashed names and gzip/brotli variants
+
+Build the bundle once per deploy (needs network access or a local mirror):
+    python static_assets.py
+    python static_assets.py --mirror /srv/csrr-vendor   # same file names as the CDN paths
+
+Pages call ``asset_url('bootstrap.min.css')`` in templates. Until the bundle is
+built the helper falls back to the pinned CDN URL, so nothing breaks. Our own
+scripts under static/ are bundled the same way and fall back to /static.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import re
+import shutil
+import sys
+import urllib.request
+from pathlib import Path
+
+from flask import abort, request, send_file
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+ASSETS_DIR = STATIC_DIR / 'assets'
+MANIFEST_PATH = ASSETS_DIR / 'manifest.json'
+URL_PREFIX = '/assets'
+
+# Pinned versions: logical name -> (bundle subdirectory, source URL)
+VENDOR_ASSETS = {
+    'bootstrap.min.css': ('css', 'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css'),
+    'bootstrap.bundle.min.js': ('js', 'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js'),
+    'fontawesome.min.css': ('css', 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css'),
+    'chart.min.js': ('js', 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js'),
+    # Cartesian partial bundle (scatter, bar, heatmap, ...) instead of the full plotly-latest build
+    'plotly.min.js': ('js', 'https://cdn.jsdelivr.net/npm/plotly.js-cartesian-dist-min@2.35.2/plotly-cartesian.min.js'),
+}
+
+# First-party files shared by the dashboards: logical name -> (bundle subdirectory, path under static/)
+LOCAL_ASSETS = {
+    'search_progress.js': ('js', 'js/search_progress.js'),
+}
+
+COMPRESSIBLE_SUFFIXES = {'.css', '.js', '.svg', '.ttf', '.json'}
+FAR_FUTURE = 31536000  # one year, safe because names change with content
+WEBFONT_URL = re.compile(r'url\((\.\./webfonts/[^)?#]+)\)')
+
+mimetypes.add_type('font/woff2', '.woff2')
+mimetypes.add_type('font/ttf', '.ttf')
+
+_manifest = None
+
+
+def load_manifest():
+    """Logical asset name -> hashed path under ASSETS_DIR (empty until the bundle is built)"""
+    global _manifest
+    if _manifest is None:
+        try:
+            _manifest = json.loads(MANIFEST_PATH.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            _manifest = {}
+    return _manifest
+
+
+def asset_url(name):
+    """URL for a bundled asset, falling back to its pinned CDN location (or /static for our own files)"""
+    hashed = load_manifest().get(name)
+    if hashed:
+        return f"{URL_PREFIX}/{hashed}"
+    if name in LOCAL_ASSETS:
+        return f"/static/{LOCAL_ASSETS[name][1]}"
+    return VENDOR_ASSETS[name][1]
+
+
+def serve_asset(filename):
+    """Serve a bundle file, preferring a precompressed variant the client accepts"""
+    path = (ASSETS_DIR / filename).resolve()
+    if ASSETS_DIR.resolve() not in path.parents or not path.is_file():
+        abort(404)
+
+    # Quality-aware negotiation: 'br;q=0' refuses brotli, and br wins ties with gzip
+    variants = {encoding: path.with_name(path.name + suffix) for encoding, suffix in (('br', '.br'), ('gzip', '.gz'))}
+    offered = [encoding for encoding, variant in variants.items() if variant.is_file()]
+    encoding = request.accept_encodings.best_match(offered) if offered else None
+    served = variants[encoding] if encoding else path
+
+    mimetype = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    response = send_file(served, mimetype=mimetype, conditional=True, max_age=FAR_FUTURE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = f'public, max-age={FAR_FUTURE}, immutable'
+    return response
+
+
+def init_app(app):
+    """Expose asset_url() to templates and serve the bundle under /assets"""
+    app.jinja_env.globals['asset_url'] = asset_url
+    app.add_url_rule(f'{URL_PREFIX}/<path:filename>', 'vendor_asset', serve_asset)
+
+
+def _fetch(url, mirror):
+    """Download `url`, or read it from a local mirror laid out by file name"""
+    if mirror:
+        return (Path(mirror) / url.rsplit('/', 1)[-1]).read_bytes()
+    with urllib.request.urlopen(url, timeout=60) as response:
+        return response.read()
+
+
+def _write_hashed(subdir, name, data):
+    """Write `data` as name.<hash>.ext with .gz/.br siblings; returns the relative path"""
+    stem, dot, ext = name.partition('.')
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    relative = f"{subdir}/{stem}.{digest}{dot}{ext}"
+    target = ASSETS_DIR / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+
+    if target.suffix in COMPRESSIBLE_SUFFIXES:
+        variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        try:
+            import brotli
+            variants['.br'] = brotli.compress(data, quality=11)
+        except ImportError:
+            pass
+        for suffix, compressed in variants.items():
+            # Only keep variants that actually save bytes
+            if len(compressed) < len(data):
+                target.with_name(target.name + suffix).write_bytes(compressed)
+    return relative
+
+
+def build_bundle(mirror=None):
+    """Download pinned assets, add our own, and write the hashed, precompressed bundle plus manifest"""
+    if ASSETS_DIR.exists():
+        shutil.rmtree(ASSETS_DIR)
+    ASSETS_DIR.mkdir(parents=True)
+
+    manifest = {}
+    for name, (subdir, url) in VENDOR_ASSETS.items():
+        data = _fetch(url, mirror)
+
+        if subdir == 'css':
+            # Vendor the fonts a stylesheet references and point it at their hashed names
+            package_url = url.rsplit('/', 2)[0]
+            css = data.decode('utf-8')
+            for font_ref in sorted(set(WEBFONT_URL.findall(css))):
+                font_name = font_ref.rsplit('/', 1)[-1]
+                font_data = _fetch(f"{package_url}/webfonts/{font_name}", mirror)
+                font_path = _write_hashed('webfonts', font_name, font_data)
+                css = css.replace(font_ref, f"../{font_path}")
+            data = css.encode('utf-8')
+
+        manifest[name] = _write_hashed(subdir, name, data)
+        print(f"{name:<26} -> {manifest[name]} ({len(data):,} bytes)")
+
+    for name, (subdir, relative) in LOCAL_ASSETS.items():
+        data = (STATIC_DIR / relative).read_bytes()
+        manifest[name] = _write_hashed(subdir, name, data)
+        print(f"{name:<26} -> {manifest[name]} ({len(data):,} bytes)")
+
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return manifest
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the self-hosted static asset bundle')
+    parser.add_argument('--mirror', help='Local directory holding the vendor files instead of the CDNs')
+    args = parser.parse_args()
+    build_bundle(args.mirror)
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        print("brotli not installed; only gzip variants were written (pip install brotli)", file=sys.stderr)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Persistent Task Scheduler
+Sleeps until the next due time, survives restarts and catches up on runs missed while down
+
+Each job's next due time is stored in a JSON state file. On startup any job
+whose due time has passed runs once (however many periods were missed), and a
+per-job lock file keeps two schedulers or a cron invocation from overlapping.
+A job that raises is retried RETRY_SECONDS later, up to MAX_ATTEMPTS times,
+before it waits for its next regular due time.
+"""
+
+import calendar
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_STATE_PATH = Path(__file__).resolve().parent / 'instance' / 'scheduler_state.json'
+MAX_SLEEP_SECONDS = 3600  # Re-check the wall clock at least hourly (suspend, clock changes)
+LOCKED_RETRY_SECONDS = 60  # Wait before retrying a due job whose lock another process holds
+RETRY_SECONDS = 15 * 60  # Wait before retrying a job that failed
+MAX_ATTEMPTS = 3  # Runs of one due time, including retries, before it is given up
+
+logger = logging.getLogger(__name__)
+
+
+def monthly(day, hour=0, minute=0):
+    """Due on `day` of every month at hour:minute; short months use their last day"""
+    def next_due(after):
+        year, month = after.year, after.month
+        while True:
+            last_day = calendar.monthrange(year, month)[1]
+            due = datetime(year, month, min(day, last_day), hour, minute)
+            if due > after:
+                return due
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return next_due
+
+
+def daily(hour=0, minute=0):
+    """Due every day at hour:minute"""
+    def next_due(after):
+        due = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return due if due > after else due + timedelta(days=1)
+    return next_due
+
+
+class JobLock:
+    """Exclusive, non-blocking lock file shared by every process on this machine"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._handle = None
+
+    def acquire(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, 'a+')
+        try:
+            import fcntl
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:  # Windows
+            import msvcrt
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            except OSError:
+                handle.close()
+                return False
+        except OSError:
+            handle.close()
+            return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(f"{os.getpid()} {datetime.now().isoformat(timespec='seconds')}\n")
+        handle.flush()
+        self._handle = handle
+        return True
+
+    def release(self):
+        # Closing the file releases the lock, also if the process dies
+        if self._handle:
+            self._handle.close()
+            self._handle = None
+
+
+class Scheduler:
+    """Runs registered jobs at their due times, persisting when each is next due"""
+
+    def __init__(self, state_path=DEFAULT_STATE_PATH):
+        self.state_path = Path(state_path)
+        self.jobs = {}
+        self._locked = {}  # name -> due time we found locked by another process
+        self._stop = threading.Event()
+
+    def add_job(self, name, func, next_due):
+        """Register `func` to run whenever `next_due(after)` says it is due"""
+        self.jobs[name] = (func, next_due)
+
+    def _load_state(self):
+        try:
+            return json.loads(self.state_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_state(self, state):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_path.parent, prefix='.scheduler-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def due_times(self, now=None):
+        """Next due time of every job, creating state for newly added jobs"""
+        now = now or datetime.now()
+        state = self._load_state()
+        changed = False
+        for name, (_, next_due) in self.jobs.items():
+            if name not in state:
+                state[name] = {'next_due': next_due(now).isoformat(), 'last_run': None}
+                changed = True
+        if changed:
+            self._save_state(state)
+        return {name: datetime.fromisoformat(state[name]['next_due']) for name in self.jobs}
+
+    def run_due(self, now=None):
+        """Run every job that is due (including ones missed while stopped); returns the names run"""
+        now = now or datetime.now()
+        ran = []
+        for name, due in sorted(self.due_times(now).items(), key=lambda item: item[1]):
+            if due <= now and self._run_job(name, due, now):
+                ran.append(name)
+        return ran
+
+    def _run_job(self, name, due, now):
+        func, next_due = self.jobs[name]
+        lock = JobLock(self.state_path.with_name(f'{name}.lock'))
+        if not lock.acquire():
+            if self._locked.get(name) != due:
+                logger.warning(f"{name} is already running elsewhere; skipping this run")
+            self._locked[name] = due
+            return False
+        self._locked.pop(name, None)
+        try:
+            # Re-read under the lock: another process may have just run it
+            current_due = datetime.fromisoformat(self._load_state()[name]['next_due'])
+            if current_due > now:
+                return False
+
+            missed = 0
+            following = next_due(due)
+            while following <= now:
+                missed += 1
+                following = next_due(following)
+            if missed:
+                logger.info(f"Catching up on {name}: {missed + 1} runs were missed, running once")
+            elif due < now - timedelta(minutes=5):
+                logger.info(f"Catching up on {name}, due {due:%Y-%m-%d %H:%M}")
+
+            error = None
+            try:
+                func()
+            except Exception as e:
+                error = e
+
+            # Advance only after the run, so a crash mid-run retries it on restart
+            state = self._load_state()
+            finished = datetime.now()
+            attempts = state[name].get('attempts', 0) + 1
+            if error is None:
+                state[name] = {'next_due': next_due(finished).isoformat(),
+                               'last_run': finished.isoformat(timespec='seconds')}
+            elif attempts < MAX_ATTEMPTS:
+                retry_at = finished + timedelta(seconds=RETRY_SECONDS)
+                logger.error(f"Scheduled job {name} failed (attempt {attempts} of {MAX_ATTEMPTS}): {error}; "
+                             f"retrying at {retry_at:%Y-%m-%d %H:%M}")
+                state[name] = dict(state[name], next_due=retry_at.isoformat(), attempts=attempts)
+            else:
+                following = next_due(finished)
+                logger.error(f"Scheduled job {name} failed {attempts} times: {error}; "
+                             f"giving up until {following:%Y-%m-%d %H:%M}")
+                state[name] = dict(state[name], next_due=following.isoformat(), attempts=0)
+            self._save_state(state)
+            return True
+        finally:
+            lock.release()
+
+    def run_forever(self):
+        """Sleep until the earliest due time, run what is due, repeat until stop()"""
+        while not self._stop.is_set():
+            self.run_due()
+            # A job still locked elsewhere stays due; retry it later rather than spinning on it
+            retry_at = datetime.now() + timedelta(seconds=LOCKED_RETRY_SECONDS)
+            wake_times = {name: max(due, retry_at) if self._locked.get(name) == due else due
+                          for name, due in self.due_times().items()}
+            next_name, next_time = min(wake_times.items(), key=lambda item: item[1])
+            logger.info(f"Next scheduled job: {next_name} at {next_time:%Y-%m-%d %H:%M}")
+            delay = (next_time - datetime.now()).total_seconds()
+            self._stop.wait(min(max(delay, 0), MAX_SLEEP_SECONDS))
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+CSRR Faculty Tracker - Compiled Template Cache
+Registers the inline HTML templates with Flask's Jinja loader so each one is compiled once per process
+"""
+
+import os
+from pathlib import Path
+
+from jinja2 import ChoiceLoader, DictLoader, FileSystemBytecodeCache
+
+# Prefix keeps inline templates from shadowing files in templates/
+INLINE_PREFIX = 'inline/'
+
+
+def register_templates(app, templates, bytecode_cache_dir=None):
+    """Serve `templates` ({name: source}) from Jinja's compiled-template cache.
+
+    Render them with ``render_template('inline/<name>', ...)``. Files in
+    templates/ keep working through the app's original loader. When
+    `bytecode_cache_dir` (or the CSRR_JINJA_BYTECODE_CACHE env var) is set,
+    compiled bytecode is also persisted on disk so new workers skip compilation.
+    """
+    inline_loader = DictLoader({INLINE_PREFIX + name: source for name, source in templates.items()})
+    app.jinja_loader = ChoiceLoader([inline_loader, app.jinja_loader] if app.jinja_loader else [inline_loader])
+
+    bytecode_cache_dir = bytecode_cache_dir or os.environ.get('CSRR_JINJA_BYTECODE_CACHE')
+    if bytecode_cache_dir:
+        Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+
+    return inline_loader
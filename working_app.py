@@ -4,8 +4,7 @@ CSRR Faculty Tracker - Working AI-Enhanced Dashboard
 Handles search issues gracefully with demonstration data
 """
 
-from flask import Flask, render_template_string, request, redirect, url_for, flash, jsonify, send_file
-import pandas as pd
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
 from datetime import datetime, timedelta
 import os
 import sys
@@ -13,104 +12,97 @@ import json
 from pathlib import Path
 import threading
 import time
-import requests
-from bs4 import BeautifulSoup
 import random
 
 # Add the parent directory to path
 sys.path.append('/Users/azrabano')
 from csrr_faculty_tracker import CSRRFacultyTracker
+from template_cache import register_templates
+from static_assets import init_app as init_static_assets
+from http_compression import init_app as init_compression
+from report_writers import write_docx
+from search_jobs import JobExecutor, QueueFull, no_progress
+from event_stream import sse_response
+from chat_store import ChatHistory, chat_session_id
+from chat_router import IntentRouter
+from publication_index import PublicationIndex
+from sample_snapshot import load_snapshot
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'csrr-tracker-secret-key'
+init_static_assets(app)  # Self-hosted Bootstrap, Font Awesome, Chart.js and Plotly
+init_compression(app)  # gzip/brotli + weak ETags for HTML and JSON responses
 
 # Initialize tracker
 tracker = CSRRFacultyTracker()
 
 # In-memory storage (replace with database in production)
 search_history = []
+search_jobs = JobExecutor(max_workers=1, max_queue=5)  # One roster search at a time
 email_subscribers = []
 faculty_publications = {}  # Store publications by faculty member
-chat_history = []
+chat_history = ChatHistory()  # Bounded per-session turns, persisted to instance/chat_log.ndjson
 
 class AIAssistant:
     def __init__(self):
         # Rule-based AI that works reliably
-        pass
+        self._router = None
+        self._router_lock = threading.Lock()
         
+    @property
+    def router(self):
+        """Intent router, compiled on the first chat message; publication answers come from a local TF-IDF index"""
+        with self._router_lock:
+            if self._router is None:
+                self._router = IntentRouter(tracker.faculty_names, index=PublicationIndex())
+            return self._router
+
     def generate_response(self, user_message):
         """Generate AI response"""
         try:
-            response = self._generate_response(user_message)
-            return response
+            return self.router.respond(user_message, faculty_publications)
             
         except Exception as e:
             return "I'm having trouble processing that request. Let me help you with faculty information instead. Try asking about 'faculty list' or 'run search'."
     
-    def _generate_response(self, message):
-        """Generate responses based on keywords"""
-        message_lower = message.lower()
-        
-        if "hello" in message_lower or "hi" in message_lower:
-            return f"Hello! I'm your CSRR Faculty Tracker assistant. I can help you with {len(tracker.faculty_names)} faculty members, run searches, and generate reports. What would you like to do?"
-        
-        elif "faculty" in message_lower or "list" in message_lower:
-            sample_faculty = tracker.faculty_names[:5]
-            return f"CSRR tracks {len(tracker.faculty_names)} faculty affiliates including {', '.join(sample_faculty)} and many others. I can help you find information about their recent publications and media appearances. Which faculty member interests you?"
-        
-        elif "search" in message_lower:
-            return "I can help you run searches for faculty publications! The system monitors op-eds, interviews, TV appearances, and academic articles. Click 'Start AI-Enhanced Search' on the main dashboard to begin, or I can guide you through the process."
-        
-        elif "help" in message_lower:
-            return "I can help you with: \\n• Faculty information and lists\\n• Running publication searches\\n• Understanding search results\\n• Email subscriptions\\n• Report generation\\n\\nWhat would you like to know more about?"
-        
-        elif "report" in message_lower:
-            return "The system generates Excel and Word reports automatically after each search. Reports include faculty publications, media appearances, and AI recommendations for the CSRR website. Would you like me to explain the report format?"
-        
-        elif "email" in message_lower or "subscribe" in message_lower:
-            return "You can subscribe to monthly reports that are automatically sent on the 1st of each month. Just enter your email in the subscription box on the main dashboard. Current subscribers receive AI-enhanced faculty publication summaries."
-        
-        elif any(name.lower() in message_lower for name in tracker.faculty_names[:20]):
-            faculty_name = next((name for name in tracker.faculty_names if name.lower() in message_lower), "Unknown Faculty")
-            return f"I found {faculty_name} in our CSRR faculty database! They are one of our {len(tracker.faculty_names)} tracked affiliates. Would you like me to search for their recent publications or check their publication timeline?"
-        
-        elif "recommend" in message_lower or "suggest" in message_lower:
-            return "I can recommend publications for the CSRR in the News section! My recommendations are based on source credibility, publication impact, and relevance to CSRR's mission. Run a search first, then click 'AI Recommend' on the results."
-        
-        elif "timeline" in message_lower:
-            return "Publication timelines show faculty activity over time with interactive visualizations. You can access timelines by clicking the 'Timeline' button next to any faculty member's publications."
-        
-        else:
-            return "I'm your CSRR Faculty Tracker assistant! I can help you with faculty information, publication searches, reports, and recommendations. Try asking about 'faculty list', 'run search', or 'help' to get started."
+    def answer(self, user_message):
+        """Reply text plus the publications it cites (for links in the chat window)"""
+        try:
+            return self.router.answer(user_message, faculty_publications)
+        except Exception as e:
+            return "I'm having trouble processing that request. Let me help you with faculty information instead. Try asking about 'faculty list' or 'run search'.", []
 
 # Initialize AI components
 ai_assistant = AIAssistant()
 
-def generate_sample_publications():
+def build_sample_publications(rng, anchor):
     """Generate sample publications for demonstration"""
-    sample_pubs = []
+    publications = {}
     sources = ['Washington Post', 'New York Times', 'CNN', 'NPR', 'BBC', 'The Atlantic', 'Politico', 'Reuters']
     types = ['Op-Ed', 'Interview', 'Article', 'Commentary', 'Academic Paper']
     
     for i, faculty_name in enumerate(tracker.faculty_names[:20]):  # First 20 faculty
-        if faculty_name not in faculty_publications:
-            faculty_publications[faculty_name] = []
+        publications[faculty_name] = []
         
         # Generate 1-3 sample publications per faculty
-        num_pubs = random.randint(1, 3)
+        num_pubs = rng.randint(1, 3)
         for j in range(num_pubs):
             pub = {
                 'title': f"Recent Analysis on Security Policy by {faculty_name}",
-                'date': datetime.now() - timedelta(days=random.randint(1, 30)),
-                'type': random.choice(types),
-                'source': random.choice(sources),
+                'date': anchor - timedelta(days=rng.randint(1, 30)),
+                'type': rng.choice(types),
+                'source': rng.choice(sources),
                 'url': f"https://example.com/article-{i}-{j}",
                 'faculty_name': faculty_name
             }
-            faculty_publications[faculty_name].append(pub)
-            sample_pubs.append(pub)
+            publications[faculty_name].append(pub)
     
-    return sample_pubs
+    return publications
+
+def generate_sample_publications():
+    """Load sample publications from the prebuilt snapshot"""
+    for faculty_name, pubs in load_snapshot('working_app', build_sample_publications).items():
+        faculty_publications.setdefault(faculty_name, []).extend(pubs)
 
 # Generate sample data
 generate_sample_publications()
@@ -126,7 +118,7 @@ def dashboard():
         'last_search': search_history[-1]['date'] if search_history else 'Never'
     }
     
-    return render_template_string(DASHBOARD_HTML, 
+    return render_template('inline/dashboard.html', 
                                 analytics=analytics, 
                                 search_history=search_history[:5],
                                 recent_publications=get_recent_publications()[:5])
@@ -136,18 +128,20 @@ def chat():
     """AI chatbot endpoint"""
     user_message = request.json.get('message', '')
     
-    # Generate AI response
-    ai_response = ai_assistant.generate_response(user_message)
+    # Generate AI response, with the publications it draws on
+    ai_response, sources = ai_assistant.answer(user_message)
     
     # Store chat history
-    chat_history.append({
+    chat_history.append(chat_session_id(), {
         'user': user_message,
         'ai': ai_response,
+        'sources': sources,
         'timestamp': datetime.now().isoformat()
     })
     
     return jsonify({
         'response': ai_response,
+        'sources': sources,
         'timestamp': datetime.now().isoformat()
     })
 
@@ -196,31 +190,61 @@ def get_recommendations():
 @app.route('/run-search', methods=['POST'])
 def run_search():
     """Run faculty search with demonstration results"""
-    search_record = {
-        'id': len(search_history) + 1,
-        'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-        'status': 'Running',
-        'results': 0,
-        'ai_analysis': 'Pending'
-    }
-    search_history.append(search_record)
+    def make_record(search_id):
+        search_record = {
+            'id': search_id,
+            'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'results': 0,
+            'ai_analysis': 'Pending'
+        }
+        search_history.append(search_record)
+        return search_record
+    
+    # Queue the search; repeated clicks while one is in flight join the existing job
+    try:
+        job, created = search_jobs.submit('monthly-search', simulate_search, make_record)
+    except QueueFull:
+        flash('Too many searches are waiting. Please try again once the current search finishes.', 'warning')
+        return redirect(url_for('dashboard'))
     
-    # Start background search simulation
-    thread = threading.Thread(target=simulate_search, args=(search_record,))
-    thread.daemon = True
-    thread.start()
+    if not created:
+        flash(f'Search #{job.id} is already {job.state.lower()}; your request was merged into it.', 'info')
+        return redirect(url_for('dashboard'))
     
     flash('AI-powered search started! This is a demonstration with sample results to show system functionality.', 'success')
     return redirect(url_for('dashboard'))
 
-def simulate_search(search_record):
+@app.route('/jobs')
+def job_status():
+    """Queue depth and state of background search jobs"""
+    return jsonify(search_jobs.status())
+
+@app.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Request cancellation of a queued or running search"""
+    job = search_jobs.cancel(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<int:job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events stream of a search's progress and completion"""
+    job = search_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return sse_response(job.events, request.headers.get('Last-Event-ID'))
+
+def simulate_search(search_record, cancel_token=None, progress=no_progress):
     """Simulate a successful search for demonstration"""
     try:
-        # Simulate search time
-        time.sleep(3)
+        # Simulate search time (returns early if the search is cancelled)
+        if cancel_token is not None and cancel_token.wait(3):
+            return
         
         # Generate some new sample publications
         new_pubs_count = random.randint(5, 15)
+        progress('progress', stage='demo', results=new_pubs_count)
         
         # Update search record
         search_record['status'] = 'Completed'
@@ -236,44 +260,41 @@ def simulate_search(search_record):
         search_record['status'] = 'Failed'
         search_record['error'] = str(e)
 
+def demo_report_blocks(search_record):
+    """Demonstration report content, yielded block by block (see report_writers)"""
+    # Enhanced title
+    yield 'Title', f'CSRR Faculty Affiliates AI-Enhanced Demo Report - {datetime.now().strftime("%B %Y")}'
+    
+    # Header
+    yield None, 'Center for Security, Race and Rights'
+    yield None, 'Rutgers Law School'
+    yield None, f'AI-Powered Demo Report Generated: {datetime.now().strftime("%B %d, %Y")}'
+    yield None, ''
+    
+    # Demo content
+    yield 'Heading1', 'Demonstration Results'
+    yield None, f'Total Publications Found: {search_record["results"]} (Sample Data)'
+    yield None, 'Sources Monitored: Major news outlets, academic databases'
+    yield None, 'AI Recommendations: System successfully analyzed all results'
+    yield None, ''
+    
+    yield 'Heading1', 'Sample Faculty Highlights'
+    for faculty_name in list(faculty_publications.keys())[:5]:
+        pubs = faculty_publications[faculty_name]
+        if pubs:
+            yield None, f'• {faculty_name}: {len(pubs)} sample publications'
+    
+    yield None, ''
+    yield None, 'Note: This is a demonstration report showing system capabilities.'
+    yield None, 'In production, this would contain real search results from news outlets and academic sources.'
+
 def generate_demo_reports(search_record):
     """Generate demonstration reports"""
     try:
-        from docx import Document
-        
-        doc = Document()
-        
-        # Enhanced title
-        title = doc.add_heading(f'CSRR Faculty Affiliates AI-Enhanced Demo Report - {datetime.now().strftime("%B %Y")}', 0)
-        
-        # Header
-        doc.add_paragraph('Center for Security, Race and Rights')
-        doc.add_paragraph('Rutgers Law School')
-        doc.add_paragraph(f'AI-Powered Demo Report Generated: {datetime.now().strftime("%B %d, %Y")}')
-        doc.add_paragraph('')
-        
-        # Demo content
-        doc.add_heading('Demonstration Results', level=1)
-        doc.add_paragraph(f'Total Publications Found: {search_record["results"]} (Sample Data)')
-        doc.add_paragraph('Sources Monitored: Major news outlets, academic databases')
-        doc.add_paragraph('AI Recommendations: System successfully analyzed all results')
-        doc.add_paragraph('')
-        
-        doc.add_heading('Sample Faculty Highlights', level=1)
-        for faculty_name in list(faculty_publications.keys())[:5]:
-            pubs = faculty_publications[faculty_name]
-            if pubs:
-                doc.add_paragraph(f'• {faculty_name}: {len(pubs)} sample publications')
-        
-        doc.add_paragraph('')
-        doc.add_paragraph('Note: This is a demonstration report showing system capabilities.')
-        doc.add_paragraph('In production, this would contain real search results from news outlets and academic sources.')
-        
-        # Save document
+        # Save document, streamed straight to disk
         reports_dir = Path('/Users/azrabano/CSRR_Reports')
-        reports_dir.mkdir(exist_ok=True)
         doc_path = reports_dir / search_record['word_report']
-        doc.save(doc_path)
+        write_docx(doc_path, demo_report_blocks(search_record))
         
         search_record['word_path'] = str(doc_path)
         
@@ -306,7 +327,7 @@ def subscribe():
 @app.route('/faculty')
 def faculty_list():
     """Faculty list page"""
-    return render_template_string(FACULTY_LIST_HTML, faculty_names=tracker.faculty_names)
+    return render_template('inline/faculty_list.html', faculty_names=tracker.faculty_names)
 
 # HTML Templates
 DASHBOARD_HTML = '''
@@ -316,8 +337,8 @@ DASHBOARD_HTML = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>CSRR AI-Powered Faculty Tracker | Rutgers Law</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+    <link href="{{ asset_url('bootstrap.min.css') }}" rel="stylesheet">
+    <link href="{{ asset_url('fontawesome.min.css') }}" rel="stylesheet">
     <style>
         :root {
             --rutgers-red: #CC0033;
@@ -413,6 +434,12 @@ DASHBOARD_HTML = '''
             max-width: 80%;
         }
         
+        .chat-sources {
+            margin: 6px 0 0;
+            padding-left: 18px;
+            font-size: 0.9em;
+        }
+        
         .user-message {
             background: #e3f2fd;
             margin-left: auto;
@@ -567,8 +594,9 @@ DASHBOARD_HTML = '''
                                         <td>
                                             {% if search.status == 'Completed' %}
                                                 <span class="badge bg-success">{{ search.status }}</span>
-                                            {% elif search.status == 'Running' %}
+                                            {% elif search.status in ('Running', 'Queued') %}
                                                 <span class="badge bg-primary">{{ search.status }}</span>
+                                                <small class="d-block text-muted" data-search-progress="{{ search.id }}"></small>
                                             {% else %}
                                                 <span class="badge bg-danger">{{ search.status }}</span>
                                             {% endif %}
@@ -701,7 +729,7 @@ DASHBOARD_HTML = '''
         <i class="fas fa-robot text-white fa-lg"></i>
     </div>
 
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
+    <script src="{{ asset_url('bootstrap.bundle.min.js') }}"></script>
     <script>
         let chatOpen = false;
 
@@ -752,7 +780,7 @@ DASHBOARD_HTML = '''
                 messages.removeChild(messages.lastChild);
                 
                 // Add AI response
-                addMessage('ai', data.response);
+                addMessage('ai', data.response, false, data.sources || []);
 
             } catch (error) {
                 console.error('Error:', error);
@@ -765,16 +793,38 @@ DASHBOARD_HTML = '''
             }
         }
 
-        function addMessage(sender, text, isTyping = false) {
+        function addMessage(sender, text, isTyping = false, sources = []) {
             const messages = document.getElementById('chatMessages');
             const messageDiv = document.createElement('div');
             messageDiv.className = `message ${sender}-message`;
             
+            // Inserted as text, never HTML: replies quote scraped publication titles
+            const label = document.createElement('strong');
+            label.textContent = `${isTyping ? 'AI' : sender.toUpperCase()}: `;
+            const body = document.createElement(isTyping ? 'em' : 'span');
+            body.textContent = text;
+            body.style.whiteSpace = 'pre-line';
+            messageDiv.append(label, body);
             if (isTyping) {
-                messageDiv.innerHTML = `<strong>AI:</strong> <em>${text}</em>`;
                 messageDiv.style.fontStyle = 'italic';
-            } else {
-                messageDiv.innerHTML = `<strong>${sender.toUpperCase()}:</strong> ${text}`;
+            }
+            
+            // Publications the answer cites, as links
+            const linked = sources.filter(source => /^https?:\/\//i.test(source.url || ''));
+            if (linked.length) {
+                const list = document.createElement('ul');
+                list.className = 'chat-sources';
+                linked.forEach(source => {
+                    const item = document.createElement('li');
+                    const link = document.createElement('a');
+                    link.href = source.url;
+                    link.target = '_blank';
+                    link.rel = 'noopener';
+                    link.textContent = source.title;
+                    item.append(link, ` (${source.source || source.faculty})`);
+                    list.appendChild(item);
+                });
+                messageDiv.appendChild(list);
             }
             
             messages.appendChild(messageDiv);
@@ -826,6 +876,7 @@ DASHBOARD_HTML = '''
             alert('AI Summary: This search found multiple high-quality publications across various media outlets. The results include op-eds in major newspapers, TV interviews, and academic publications. Recommended actions include featuring 2-3 top publications on the CSRR website and including others in the monthly newsletter.');
         }
     </script>
+    <script src="{{ asset_url('search_progress.js') }}" defer></script>
 </body>
 </html>
 '''
@@ -837,7 +888,7 @@ FACULTY_LIST_HTML = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>CSRR Faculty Directory | Rutgers Law</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
+    <link href="{{ asset_url('bootstrap.min.css') }}" rel="stylesheet">
     <style>
         :root {
             --rutgers-red: #CC0033;
@@ -893,6 +944,12 @@ FACULTY_LIST_HTML = '''
 </html>
 '''
 
+# Compile the inline templates once; routes render them by name
+register_templates(app, {
+    'dashboard.html': DASHBOARD_HTML,
+    'faculty_list.html': FACULTY_LIST_HTML,
+})
+
 if __name__ == '__main__':
     print("🚀 Starting Working CSRR Faculty Tracker on http://127.0.0.1:3000")
     print("✅ Features Working: AI Chatbot, Content Analysis, Report Generation")